@@ -1,13 +1,13 @@
- ULTRA ELITE SELF-HEALING AI CORE (V3.0+ FULL REPAIR SYSTEM)
+# agent_auto_regen.py — ULTRA ELITE SELF-HEALING AI CORE (V3.0+ FULL REPAIR SYSTEM)
 
 import os
 import json
 import traceback
-import importlib.util
 from datetime import datetime
 from collections import defaultdict
-from agents.utils.llm import query_llm_with_fallback
+from utils.llm import query_llm_with_fallback
 from utils.repair_utils import detect_common_error, adjust_prompt
+from utils.strategy_registry import get_code_registry
 
 AGENT_DIR = "agents"
 BACKUP_DIR = "logs/regen_backups"
@@ -27,9 +27,7 @@ REPAIR_MODELS = [
 def run_smoke_test(agent_path):
     try:
         name = os.path.basename(agent_path).replace(".py", "")
-        spec = importlib.util.spec_from_file_location(name, agent_path)
-        mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
+        mod = get_code_registry().module(agent_path, name)
         if hasattr(mod, name.title().replace("_", "")) or hasattr(mod, "run"):
             return True
     except:
@@ -95,9 +93,7 @@ def regenerate_agent(agent_name):
         reason = "Missing file"
     else:
         try:
-            with open(path, "r") as f:
-                code = f.read()
-            compile(code, agent_name, 'exec')
+            get_code_registry().compile_file(path)
             return
         except Exception as e:
             reason = str(e)
@@ -128,7 +124,7 @@ The agent `{agent_name}` failed due to: {reason}
             prompt = adjust_prompt(prompt, error_type)
             prompt += "\nRespond with ONLY FIXED Python code."
 
-            repaired = query_llm_with_fallback(prompt, model_name=tier["model"])
+            repaired = query_llm_with_fallback(prompt, model_name=tier["model"], site="repair")
             with open(path, "w") as f:
                 f.write(repaired)
 
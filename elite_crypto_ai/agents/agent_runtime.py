@@ -0,0 +1,313 @@
+# agent_runtime.py — WARM AGENT RUNTIME (agents imported once, run in-process or in forked workers)
+
+import os
+import sys
+import json
+import time
+import select
+import argparse
+import tempfile
+import importlib
+import threading
+import traceback
+
+from agents.sequence_agent import AGENTS, PipelineRunner
+from utils.price_cache import get_price_cache
+from utils.price_quorum import get_source_stats
+from utils.ohlcv_store import get_ohlcv_store
+from utils.strategy_registry import get_strategy_registry, get_code_registry
+from utils.llm_client import save_client_stats
+
+AGENT_DIR = "agents"
+ISOLATION = "inprocess"  # "inprocess" = shared interpreter, "fork" = forked worker per agent (crash isolation)
+CYCLE_INTERVAL = 0  # seconds between cycles when looping
+
+# agent -> (class to instantiate or None for a module function, entry method)
+# Agents not listed run their script body as __main__ from the cached code object.
+ENTRY_POINTS = {
+    "price_feed_agent.py": ("PriceFeedAgent", "build_price_feed"),
+    "search_agent.py": ("SearchAgent", "scan"),
+    "intel_engine.py": (None, "analyze_macro"),
+    "forecast_agent.py": ("ForecastAgent", "run"),
+    "forecast_accuracy_tracker.py": ("ForecastAccuracyTracker", "run"),
+    "forecast_memory_logger.py": ("ForecastMemoryLogger", "run"),
+    "strategy_generator_agent.py": ("StrategyGenerator", "run"),
+    "strategy_agent.py": ("StrategyAgent", "run"),
+    "strategy_simulator.py": ("StrategySimulator", "run"),
+    "strategy_heatmap_generator.py": ("HeatmapGenerator", "run"),
+    "strategy_batch_runner.py": ("StrategyBatchRunner", "run"),
+    "strategy_tracker.py": ("StrategyTracker", "run"),
+    "rebalancer_agent.py": ("RebalancerAgent", "run"),
+    "manager_agent.py": ("ManagerAgent", "run"),
+    "email_reporter.py": ("EmailReporter", "run"),
+    "model_rank_updater.py": ("ModelRankUpdater", "run"),
+    "local_model_trainer.py": ("LocalModelTrainer", "run"),
+    "self_trainer.py": ("SelfTrainer", "run"),
+    "agent_auto_regen.py": (None, "run"),
+}
+
+
+def exit_code(e):
+    if e.code is None:
+        return 0
+    return e.code if isinstance(e.code, int) else 1
+
+
+class AgentRuntime:
+    def __init__(self, agents=AGENTS, isolation=ISOLATION):
+        if isolation == "fork" and not hasattr(os, "fork"):
+            print("⚠️ fork isolation is not available on this platform, running in-process")
+            isolation = "inprocess"
+        self.agents = list(agents)
+        self.isolation = isolation
+        self.modules = {}  # agent -> (module, file stamp at import)
+        self.cycles = 0
+        # Fork mode: parent side of the fork server
+        self.server_pid = None
+        self.request_fd = None
+        self.send_lock = threading.Lock()
+        self.pending = {}  # request id -> {"done": Event, "code": int}
+        self.next_id = 0
+
+    # --------- Warm state ---------
+
+    def warm_state(self):
+        """Singletons every cycle reuses: price cache, source stats, OHLCV store, compiled strategies."""
+        get_price_cache()
+        get_source_stats()
+        get_ohlcv_store().load_manifest()
+        get_strategy_registry().refresh()
+
+    def flush_state(self):
+        get_price_cache().flush()
+        get_source_stats().save()
+        save_client_stats()
+
+    def refresh_state(self):
+        """Fork server only: re-read what the last cycle's workers persisted, so the next cycle forks from it."""
+        get_price_cache().load()
+        get_source_stats().load()
+        self.warm_state()
+
+    def stamp(self, agent):
+        st = os.stat(os.path.join(AGENT_DIR, agent))
+        return st.st_mtime_ns, st.st_size
+
+    def load(self, agent):
+        """Imported once; re-imported only when the file changes (e.g. after agent_auto_regen rewrites it)."""
+        stamp = self.stamp(agent)
+        cached = self.modules.get(agent)
+        if cached and cached[1] == stamp:
+            return cached[0]
+        name = f"agents.{os.path.splitext(agent)[0]}"
+        module = importlib.reload(cached[0]) if cached else importlib.import_module(name)
+        self.modules[agent] = (module, stamp)
+        return module
+
+    def preload(self):
+        start = time.monotonic()
+        for agent in self.agents:
+            if agent not in ENTRY_POINTS:
+                continue
+            try:
+                self.load(agent)
+            except Exception as e:
+                print(f"⚠️ Could not preload {agent}: {e}")
+        self.warm_state()
+        print(f"🔥 Runtime warm in {time.monotonic() - start:.2f}s ({len(self.modules)} agent modules)")
+
+    # --------- Invocation ---------
+
+    def invoke(self, agent):
+        if agent in ENTRY_POINTS:
+            class_name, method = ENTRY_POINTS[agent]
+            module = self.load(agent)
+            target = getattr(module, class_name)() if class_name else module
+            getattr(target, method)()
+        else:
+            get_code_registry().namespace(os.path.join(AGENT_DIR, agent), name="__main__")
+
+    def run_inprocess(self, agent):
+        print(f"▶️ Running: {agent}")
+        try:
+            self.invoke(agent)
+            return 0, None
+        except SystemExit as e:
+            return exit_code(e), None
+        except Exception:
+            traceback.print_exc()
+            return 1, None
+
+    # --------- Fork server ---------
+    # Workers are never forked from the scheduler's threads: a child forked from a multi-threaded
+    # process can inherit a lock (stdout, an executor, the price cache timer) held mid-use and hang.
+    # One single-threaded server process owns the warm interpreter and does every fork.
+
+    def start_fork_server(self):
+        """Called from the main thread before any other thread exists."""
+        request_r, request_w = os.pipe()
+        reply_r, reply_w = os.pipe()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            os.close(request_w)
+            os.close(reply_r)
+            code = 1
+            try:
+                self.serve(request_r, reply_w)
+                code = 0
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+
+        os.close(request_r)
+        os.close(reply_w)
+        self.server_pid = pid
+        self.request_fd = request_w
+        threading.Thread(target=self.read_replies, args=(reply_r,), name="fork-server-replies", daemon=True).start()
+
+    def serve(self, request_fd, reply_fd):
+        self.preload()
+        workers = {}  # pid -> request id
+        buffer = b""
+        stopping = False
+        while not stopping or workers:
+            ready, _, _ = select.select([request_fd] if not stopping else [], [], [], 0.05)
+            if ready:
+                chunk = os.read(request_fd, 65536)
+                if not chunk:
+                    stopping = True  # runtime went away
+                buffer += chunk
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    message = json.loads(line)
+                    if message["cmd"] == "run":
+                        workers[self.spawn_worker(message["agent"], message["log"], request_fd, reply_fd)] = message["id"]
+                    elif message["cmd"] == "refresh":
+                        self.refresh_state()
+                    elif message["cmd"] == "stop":
+                        stopping = True
+            while workers:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+                if pid == 0:
+                    break
+                request_id = workers.pop(pid, None)
+                if request_id is not None:
+                    os.write(reply_fd, (json.dumps({"id": request_id, "code": os.waitstatus_to_exitcode(status)}) + "\n").encode())
+
+    def spawn_worker(self, agent, log_path, request_fd, reply_fd):
+        if agent in ENTRY_POINTS:
+            try:
+                self.load(agent)  # re-import here, so the server stays warm after agent_auto_regen rewrites a file
+            except Exception:
+                pass  # the worker hits the same error and reports it
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid:
+            return pid
+        os.close(request_fd)
+        os.close(reply_fd)
+        log_fd = os.open(log_path, os.O_WRONLY | os.O_TRUNC)
+        os.dup2(log_fd, 1)
+        os.dup2(log_fd, 2)
+        code = 1
+        try:
+            self.invoke(agent)
+            code = 0
+        except SystemExit as e:
+            code = exit_code(e)
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            try:
+                self.flush_state()
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(code)
+
+    def read_replies(self, reply_fd):
+        with os.fdopen(reply_fd, "r") as f:
+            for line in f:
+                reply = json.loads(line)
+                waiter = self.pending.get(reply["id"])
+                if waiter:
+                    waiter["code"] = reply["code"]
+                    waiter["done"].set()
+        for waiter in list(self.pending.values()):  # server died: release every waiting stage
+            waiter["done"].set()
+
+    def send(self, message):
+        with self.send_lock:
+            os.write(self.request_fd, (json.dumps(message) + "\n").encode())
+
+    def run_forked(self, agent):
+        """Launcher: the fork server runs the agent in a fresh worker; its output comes back through a temp file."""
+        fd, log_path = tempfile.mkstemp(prefix="agent-", suffix=".log")
+        os.close(fd)
+        with self.send_lock:
+            self.next_id += 1
+            request_id = self.next_id
+        waiter = {"done": threading.Event(), "code": 1}
+        self.pending[request_id] = waiter
+        try:
+            self.send({"cmd": "run", "id": request_id, "agent": agent, "log": log_path})
+            waiter["done"].wait()
+            with open(log_path, "r", errors="replace") as f:
+                output = f.read()
+        finally:
+            self.pending.pop(request_id, None)
+            os.remove(log_path)
+        return waiter["code"], output
+
+    def stop_fork_server(self):
+        if self.server_pid is None:
+            return
+        self.send({"cmd": "stop"})
+        os.waitpid(self.server_pid, 0)
+        os.close(self.request_fd)
+        self.server_pid = None
+
+    # --------- Cycles ---------
+
+    def run_cycle(self):
+        self.cycles += 1
+        print(f"♻️ Runtime cycle {self.cycles} ({self.isolation})\n")
+        if self.isolation == "fork":
+            # Forked stages can't corrupt each other, so the artifact DAG runs them in parallel
+            runner = PipelineRunner(self.agents, mode="dag", launcher=self.run_forked)
+        else:
+            runner = PipelineRunner(self.agents, mode="serial", launcher=self.run_inprocess)
+        summary = runner.run()
+        if self.isolation == "fork":
+            # Workers saved what they learned; the parent's copy is never touched, so it must not be saved over it
+            self.send({"cmd": "refresh"})
+        else:
+            self.flush_state()
+        return summary
+
+    def run(self, cycles=1, interval=CYCLE_INTERVAL):
+        if self.isolation == "fork":
+            self.start_fork_server()  # warm state lives in the server
+        else:
+            self.preload()
+        try:
+            while True:
+                self.run_cycle()
+                if cycles and self.cycles >= cycles:
+                    break
+                time.sleep(interval)
+        finally:
+            self.stop_fork_server()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the agent pipeline in a warm interpreter")
+    parser.add_argument("--fork", action="store_true", help="run each agent in a forked worker")
+    parser.add_argument("--cycles", type=int, default=1, help="0 = run until interrupted")
+    parser.add_argument("--interval", type=float, default=CYCLE_INTERVAL)
+    args = parser.parse_args()
+    AgentRuntime(isolation="fork" if args.fork else ISOLATION).run(cycles=args.cycles, interval=args.interval)
@@ -5,6 +5,7 @@ import json
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from utils.artifacts import read_artifact
 
 MODEL_PERF_FILE = "intel/llm_model_performance.json"
 PROMPT_SCORES = "data/prompt_scores.json"
@@ -22,10 +23,7 @@ st.title("🧠 Elite Intelligence + LLM Performance Dashboard")
 
 # Load files
 def safe_load(path):
-    if not os.path.exists(path):
-        return {}
-    with open(path, "r") as f:
-        return json.load(f)
+    return read_artifact(path)
 
 model_perf = safe_load(MODEL_PERF_FILE)
 prompt_scores = safe_load(PROMPT_SCORES)
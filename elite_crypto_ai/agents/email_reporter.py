@@ -3,10 +3,10 @@
 import os
 import json
 from datetime import datetime
-from agents.utils.llm import query_llm_with_fallback
+from utils.llm import query_llm_with_fallback
 from agents.utils.email_utils import send_email
-from PIL import Image
-import matplotlib.pyplot as plt
+from utils.plotting import pyplot
+from utils.artifacts import read_artifact
 
 # File paths
 FORECAST_FILE = "intel/forecast_signals.json"
@@ -35,10 +35,7 @@ class EmailReporter:
         self.attachments = []
 
     def safe_load(self, path):
-        if os.path.exists(path):
-            with open(path, "r") as f:
-                return json.load(f)
-        return {}
+        return read_artifact(path)
 
     def load_all_data(self):
         self.forecast = self.safe_load(FORECAST_FILE)
@@ -75,12 +72,14 @@ class EmailReporter:
         df = DataFrame(rows).sort_values("Accuracy", ascending=False)
         os.makedirs(VISUAL_EXPORT, exist_ok=True)
         path = os.path.join(VISUAL_EXPORT, "model_performance_table.png")
+        plt = pyplot()
         fig, ax = plt.subplots(figsize=(8, len(df) * 0.5))
         ax.axis('tight')
         ax.axis('off')
         ax.table(cellText=df.values, colLabels=df.columns, loc='center')
         plt.title("Model Performance Table")
         plt.savefig(path, bbox_inches='tight')
+        plt.close(fig)
         self.attachments.append(path)
 
     def build_prompt(self):
@@ -118,7 +117,7 @@ Keep it concise but informative.
         self.export_model_table_image()
         prompt = self.build_prompt()
         try:
-            report = query_llm_with_fallback(prompt)
+            report = query_llm_with_fallback(prompt, site="email_report")
             send_email(subject="📊 Daily AI Crypto Report",
                        body=report,
                        attachments=self.attachments)
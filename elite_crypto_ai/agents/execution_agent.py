@@ -3,15 +3,15 @@
 import json
 import os
 from datetime import datetime
-from utils.wallet import update_wallet, get_wallet
+from utils.wallet import update_wallet
 from utils.source_manager import get_price
 
 EXEC_LOG = "data/execution_log.json"
 TRADE_MODE = "paper"  # or "live"
 
 
-def execute_trade(symbol, amount_usdc, action, wallet_type="medium"):
-    price = get_price(symbol)
+def execute_trade(symbol, amount_usdc, action, wallet_type="medium", price=None):
+    price = price if price is not None else get_price(symbol)
     if price is None:
         return {"status": "error", "reason": "Price unavailable"}
 
@@ -2,25 +2,36 @@
 
 import os
 import json
-from datetime import datetime
+import pandas as pd
+from datetime import datetime, timedelta
 from utils.price_utils import get_historical_price
 from utils.memory import read_recent_forecasts, record_accuracy_score
+from utils.forecast_store import get_history_store
+from utils.forecast_aggregates import ForecastAggregates
+from utils.forecast_resolution import parse_times
 
-FORECAST_HISTORY_LOG = "logs/forecast_history.json"
+EVAL_WINDOW = 200  # Bootstrap: how many recent forecasts to evaluate on the first run
 ACCURACY_LOG = "logs/forecast_accuracy.json"
+ACCURACY_STATE_FILE = "logs/forecast_accuracy_state.json"
+RETRY_WINDOW_HOURS = 48  # a forecast that still can't be scored after this long is given up on
 
 class ForecastAccuracyTracker:
     def __init__(self):
         self.history = []
         self.scores = {}
+        self.settled = None  # timestamp of the newest entry scored (or given up on) without skipping a pending one
+        self.aggregates = ForecastAggregates(ACCURACY_STATE_FILE)
 
     def load_forecast_history(self):
-        if os.path.exists(FORECAST_HISTORY_LOG):
-            with open(FORECAST_HISTORY_LOG, "r") as f:
-                self.history = json.load(f)
+        # Only forecasts logged after the last evaluated one; the running totals live in the state file
+        watermark = self.aggregates.consumer_watermark("accuracy_tracker", "history")
+        store = get_history_store()
+        if watermark:
+            self.history = [e for e in store.query(since=watermark) if e["timestamp"] > watermark]
         else:
-            print("⚠️ No forecast history found.")
-            self.history = []
+            self.history = store.tail(EVAL_WINDOW)
+        if not self.history:
+            print("⚠️ No new forecast history found.")
 
     def evaluate_forecast(self, entry):
         token = entry["token"]
@@ -29,7 +40,7 @@ class ForecastAccuracyTracker:
         timestamp = entry.get("timestamp")
 
         try:
-            price_now = get_historical_price(token, timestamp)
+            price_now = get_historical_price(token, datetime.fromisoformat(timestamp))
             price_change = (price_now - entry_price) / entry_price
 
             correct = (
@@ -40,6 +51,8 @@ class ForecastAccuracyTracker:
 
             score = {
                 "token": token,
+                "model": (entry["forecast"].get("model_used") or "unknown").lower(),
+                "confidence": entry["forecast"].get("confidence_score", 0),
                 "forecast": forecast_label,
                 "price_change": round(price_change, 4),
                 "correct": correct,
@@ -50,32 +63,61 @@ class ForecastAccuracyTracker:
             print(f"❌ Error evaluating {token}: {e}")
             return None
 
+    def retryable(self, entry):
+        try:
+            return datetime.fromisoformat(entry["timestamp"]) > datetime.utcnow() - timedelta(hours=RETRY_WINDOW_HOURS)
+        except (KeyError, TypeError, ValueError):
+            return False
+
     def update_scores(self):
+        # Oldest first; stop at the first entry that fails but may still score, so the watermark never passes it
         self.scores = {}
-        for entry in self.history[-200:]:  # Limit to last 200
+        self.settled = None
+        for entry in self.history:
             result = self.evaluate_forecast(entry)
             if result:
                 token = result["token"]
                 if token not in self.scores:
                     self.scores[token] = []
                 self.scores[token].append(result)
+            elif self.retryable(entry):
+                print(f"⏳ {entry['token']} forecast from {entry['timestamp']} stays pending until it can be scored.")
+                break
+            else:
+                print(f"⚠️ Giving up on {entry.get('token')} forecast from {entry.get('timestamp')}.")
+            self.settled = entry["timestamp"]
 
     def save_accuracy_log(self):
         os.makedirs("logs", exist_ok=True)
         with open(ACCURACY_LOG, "w") as f:
             json.dump(self.scores, f, indent=2)
 
+    def fold_scores(self):
+        rows = [r for results in self.scores.values() for r in results]
+        if rows:
+            df = pd.DataFrame(rows)
+            df["timestamp"] = parse_times(df["timestamp"])
+            df = df.dropna(subset=["timestamp"])
+            df["score"] = df["correct"].astype(float)
+            df["hit"] = df["correct"]
+            df["roi"] = df["price_change"] * 100
+            self.aggregates.fold(df)
+        if self.settled:
+            self.aggregates.set_consumer_watermark("accuracy_tracker", "history", self.settled)
+            self.aggregates.save()
+
     def summarize_accuracy(self):
         summary = {}
-        for token, results in self.scores.items():
-            total = len(results)
-            correct = sum(1 for r in results if r["correct"])
-            avg_change = sum(r["price_change"] for r in results) / total
+        for token, acc in self.aggregates.state["tokens"].items():
+            total = acc["count"]
+            if not total:
+                continue
+            correct = acc["hit_sum"]
             summary[token] = {
                 "total_forecasts": total,
                 "correct_count": correct,
                 "accuracy_pct": round(correct / total, 3),
-                "avg_price_change": round(avg_change, 4)
+                "avg_price_change": round(acc["roi_sum"] / 100 / total, 4)
             }
         return summary
 
@@ -88,6 +130,7 @@ class ForecastAccuracyTracker:
         print("📊 Running Forecast Accuracy Tracker...")
         self.load_forecast_history()
         self.update_scores()
+        self.fold_scores()
         self.save_accuracy_log()
         self.record_scores()
         print("✅ Accuracy tracking complete.")
@@ -2,47 +2,149 @@
 
 import os
 import json
+import time
+import threading
+import concurrent.futures
 from datetime import datetime
 from utils.source_manager import get_price_change_signal
 from utils.sentiment_sources import get_google_trends_score, get_twitter_sentiment_score
 from utils.cryptoquant import get_cryptoquant_metrics
 from utils.llm import query_llm
 from utils.strategy_tracker import get_strategy_metadata_tags
+from utils.throttle import RateBudget, ProviderPools
+from utils.forecast_store import get_history_store
+from utils.artifacts import write_artifact
+from utils.forecast_gate import ForecastGate, feature_vector
+from utils.local_forecaster import get_local_forecaster, LOCAL_MODEL_NAME
 
 FORECAST_OUTPUT_PATH = "intel/forecast_signals.json"
-FORECAST_HISTORY_LOG = "logs/forecast_history.json"
 PRICE_TRACKER_FILE = "logs/prices/forecast_price_tracker.json"
 MODEL_RANK_FILE = "logs/forecast_model_rank.json"
 TOKEN_ROUTING_FILE = "intel/token_model_routing.json"
 
+# Concurrent mode: tokens fan out across a worker pool, each upstream gets its own slot cap
+CONCURRENT_MODE = True
+MAX_WORKERS = 16
+# Deadlines bound how long a token (or batch) is waited on. LLM calls are cut at the deadline and calls still
+# queued past it never start; a signal fetch already running can't be interrupted and finishes in the
+# background, bounded by its own HTTP timeout.
+TOKEN_DEADLINE_SECONDS = 45
+PROVIDER_LIMITS = {"price": 8, "trends": 4, "sentiment": 4, "cryptoquant": 2, "llm": 6}  # one pool each
+MODEL_RATE_BUDGETS = {"gpt-4": 60, "gpt-3.5-turbo": 300}  # requests per minute
+DEFAULT_MODEL_RATE = 60
+
+# Batched mode: one request carries many tokens' signal blocks and returns a JSON array
+BATCH_MODE = True
+BATCH_TUNING_FILE = "logs/forecast_batch_tuning.json"
+MAX_BATCH_SIZE = 25
+BATCH_TARGET_SECONDS = 20  # steer batch size so one request stays near this latency
+BATCH_DEADLINE_SECONDS = 90
+MODEL_CONTEXT_TOKENS = {"gpt-4": 8192, "gpt-3.5-turbo": 4096}
+DEFAULT_CONTEXT_TOKENS = 4096
+RESPONSE_TOKENS_PER_ITEM = 90  # label + confidence + one-sentence rationale
+CHARS_PER_TOKEN = 4
+FORECAST_LABELS = ("BULLISH", "BEARISH", "NEUTRAL")
+
+# Cascade: the local model answers tokens it is confident about; only its uncertain band reaches the LLM
+CASCADE_MODE = True
+
+
+class BatchSizer:
+    """Per-model batch size: bounded by the context window, steered by measured latency.
+    A failed batch halves the model's ceiling; clean batches grow it back."""
+
+    def __init__(self, path=BATCH_TUNING_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, "r") as f:
+                self.state = json.load(f)
+        except:
+            self.state = {}
+
+    def model_state(self, model):
+        return self.state.setdefault(model, {"ceiling": MAX_BATCH_SIZE, "seconds_per_token": None})
+
+    def context_cap(self, model, header_chars, block_chars):
+        context = MODEL_CONTEXT_TOKENS.get(model, DEFAULT_CONTEXT_TOKENS)
+        per_item = block_chars / CHARS_PER_TOKEN + RESPONSE_TOKENS_PER_ITEM
+        return int((context - header_chars / CHARS_PER_TOKEN) // per_item)
+
+    def size(self, model, header_chars, block_chars):
+        with self.lock:
+            state = self.model_state(model)
+            cap = min(MAX_BATCH_SIZE, state["ceiling"], self.context_cap(model, header_chars, block_chars))
+            if state["seconds_per_token"]:
+                cap = min(cap, int(BATCH_TARGET_SECONDS / state["seconds_per_token"]))
+        return max(1, cap)
+
+    def record(self, model, count, seconds, ok):
+        with self.lock:
+            state = self.model_state(model)
+            if not ok:
+                state["ceiling"] = max(1, count // 2)
+                return
+            state["ceiling"] = min(MAX_BATCH_SIZE, max(state["ceiling"], count + max(1, count // 4)))
+            per_token = seconds / max(1, count)
+            previous = state["seconds_per_token"]
+            state["seconds_per_token"] = round(per_token if previous is None else 0.7 * previous + 0.3 * per_token, 4)
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(self.state, f, indent=2)
+        except Exception as e:
+            print(f"⚠️ Could not save batch tuning: {e}")
+
+
 class ForecastAgent:
-    def __init__(self):
+    def __init__(self, concurrent=CONCURRENT_MODE, batched=BATCH_MODE, cascade=CASCADE_MODE):
+        self.concurrent = concurrent
+        self.batched = batched
+        self.cascade = cascade
         self.tokens = []
+        self.current_prices = {}
         self.forecast_data = {}
         self.tracker = {}
         self.model_rank = []
         self.token_routes = {}
         self.strategy_tags = {}
+        self.model_budgets = {}
+        self.batch_sizer = None
+        self.gate = None
+        self.gate_inputs = {}  # token -> (features, model, meta) behind its fresh forecast
 
     def load_tokens(self):
         try:
             with open("logs/prices/current_prices.json", "r") as f:
-                self.tokens = list(json.load(f).keys())
+                self.current_prices = json.load(f)
+            self.tokens = list(self.current_prices.keys())
         except Exception as e:
             print(f"❌ Failed to load token list: {e}")
             self.tokens = []
 
+    def entry_price(self, token, signals):
+        # Price signals that carry the live price win; a bare momentum number falls back to the price snapshot
+        price_signal = signals[0]
+        if isinstance(price_signal, dict):
+            return price_signal.get("price", 0)
+        price = self.current_prices.get(token)
+        return price if isinstance(price, (int, float)) else 0
+
     def load_model_rank(self):
         try:
             with open(MODEL_RANK_FILE, "r") as f:
-                self.model_rank = json.load(f)
+                # The local model is scored alongside the LLMs but is never a routing target
+                self.model_rank = [m for m in json.load(f) if m != LOCAL_MODEL_NAME] or ["gpt-4"]
         except:
             self.model_rank = ["gpt-4"]
 
     def load_token_routes(self):
         if os.path.exists(TOKEN_ROUTING_FILE):
             with open(TOKEN_ROUTING_FILE, "r") as f:
-                self.token_routes = json.load(f)
+                # A route to the local stage would send its uncertain tokens to a model the LLM can't serve
+                self.token_routes = {t: m for t, m in json.load(f).items() if m != LOCAL_MODEL_NAME}
 
     def load_strategy_tags(self):
         try:
@@ -76,6 +178,215 @@ Return JSON:
 }}
 """
 
+    # --------- Batched prompts ---------
+
+    def build_batch_header(self):
+        return """
+You are a crypto market forecaster. Forecast each coin below independently from its own signals.
+
+Return ONLY a JSON array with one object per coin, in the order given:
+[
+  {"token": "SYMBOL", "forecast_label": "BULLISH | BEARISH | NEUTRAL", "confidence_score": float (0-1), "rationale": "one sentence"}
+]
+"""
+
+    def build_batch_block(self, token, price_signal, trend_score, sentiment_score, cq, meta):
+        return f"""
+### {token}
+Price Momentum: {price_signal}
+Google Trends Score: {trend_score}
+Twitter Sentiment: {sentiment_score}
+Miner Outflows: {cq['miner_outflows']}
+Exchange Flows: {cq['exchange_flows']}
+Stablecoin Inflows: {cq['stablecoin_inflows']}
+Whale Activity: {cq['whale_activity']}
+Strategy: horizon={meta.get('time_horizon', 'medium')}, volatility={meta.get('volatility_profile', 'medium')}
+"""
+
+    def token_block(self, token, signals):
+        price_signal, trend_score, sentiment_score, cq = signals
+        return self.build_batch_block(token, price_signal, trend_score, sentiment_score, cq, self.strategy_tags.get(token, {}))
+
+    def parse_batch_response(self, response, tokens, model_used):
+        """token -> forecast for every well-formed entry; anything missing or malformed is left out."""
+        text = response.strip()
+        start, end = text.find("["), text.rfind("]")
+        if start == -1 or end < start:
+            raise ValueError("no JSON array in batch response")
+        entries = json.loads(text[start:end + 1])
+
+        wanted = {t.upper(): t for t in tokens}
+        forecasts = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            token = wanted.get(str(entry.get("token", "")).upper())
+            label = str(entry.get("forecast_label", "")).upper()
+            try:
+                confidence = float(entry.get("confidence_score"))
+            except (TypeError, ValueError):
+                continue
+            if token is None or token in forecasts or label not in FORECAST_LABELS or not 0 <= confidence <= 1:
+                continue
+            meta = self.strategy_tags.get(token, {})
+            forecasts[token] = {
+                "forecast_label": label,
+                "confidence_score": confidence,
+                "rationale": entry.get("rationale", ""),
+                "model_used": model_used.upper(),
+                "metadata": {
+                    "time_horizon": meta.get("time_horizon", "medium"),
+                    "volatility_profile": meta.get("volatility_profile", "medium"),
+                    "signal_triggers": meta.get("signal_triggers", ["RSI", "EMA"]),
+                },
+            }
+        return forecasts
+
+    def plan_batches(self, model_used, tokens, signals):
+        header = self.build_batch_header()
+        blocks = {token: self.token_block(token, signals[token]) for token in tokens}
+        widest = max(len(b) for b in blocks.values())
+        size = self.batch_sizer.size(model_used, len(header), widest)
+        return [tokens[i:i + size] for i in range(0, len(tokens), size)], header, blocks
+
+    def forecast_batch(self, model_used, batch, header, blocks, signals, ask=None, retry=None):
+        """One request for the whole batch; tokens whose entry is missing or malformed are retried alone."""
+        prompt = header + "".join(blocks[token] for token in batch)
+        started = time.monotonic()
+        try:
+            if ask:
+                response = ask(prompt, items=len(batch))
+            else:
+                response = query_llm(prompt, model_name=model_used, site="forecast", items=len(batch))
+            forecasts = self.parse_batch_response(response, batch, model_used)
+        except Exception as e:
+            print(f"⚠️ Batch of {len(batch)} on {model_used} failed ({e or type(e).__name__}) — retrying per token")
+            forecasts = {}
+        # A stray malformed entry is the model's fault, not the batch size's; a truncated or failed reply is.
+        # Below 10 tokens there is no tolerance: a small batch that lost an entry counts as failed.
+        missing = len(batch) - len(forecasts)
+        self.batch_sizer.record(model_used, len(batch), time.monotonic() - started, ok=missing <= len(batch) // 10)
+
+        results = {token: (forecast, self.entry_price(token, signals[token])) for token, forecast in forecasts.items()}
+        leftover = [token for token in batch if token not in results]
+        if leftover and retry:
+            results.update(retry(leftover))
+            return results
+        for token in leftover:
+            try:
+                results[token] = self.forecast_token(token, model_used, signals[token])
+            except Exception as e:
+                print(f"❌ Forecast error for {token} ({model_used}): {e or type(e).__name__}")
+        return results
+
+    def ask_llm(self, pools, model_used, deadline):
+        def ask(prompt, items=1):
+            future = pools.submit("llm", self.query_until, prompt, model_used, items, deadline, deadline=deadline)
+            return future.result(timeout=max(0, deadline - time.monotonic()))
+        return ask
+
+    def query_until(self, prompt, model_used, items, deadline):
+        return query_llm(prompt, model_name=model_used, site="forecast", items=items,
+                         timeout=max(0, deadline - time.monotonic()))
+
+    def forecast_batch_concurrent(self, model_used, batch, header, blocks, signals, pools):
+        deadline = time.monotonic() + BATCH_DEADLINE_SECONDS
+        if not self.get_model_budget(model_used).acquire(timeout=deadline - time.monotonic()):
+            raise TimeoutError(f"rate budget for {model_used} exhausted before deadline")
+
+        def retry(tokens):
+            return self.retry_tokens_concurrent(tokens, model_used, signals, pools)
+
+        return self.forecast_batch(model_used, batch, header, blocks, signals,
+                                   ask=self.ask_llm(pools, model_used, deadline), retry=retry)
+
+    def retry_tokens_concurrent(self, tokens, model_used, signals, pools):
+        """Per-token retries after a failed batch, all submitted to the LLM pool at once rather than one by one."""
+        deadline = time.monotonic() + TOKEN_DEADLINE_SECONDS
+        futures = {}
+        for token in tokens:
+            if not self.get_model_budget(model_used).acquire(timeout=deadline - time.monotonic()):
+                print(f"❌ Forecast error for {token} ({model_used}): rate budget exhausted before deadline")
+                continue
+            prompt = self.token_prompt(token, model_used, signals[token])
+            futures[token] = pools.submit("llm", self.query_until, prompt, model_used, 1, deadline, deadline=deadline)
+        results = {}
+        for token, future in futures.items():
+            try:
+                response = future.result(timeout=max(0, deadline - time.monotonic()))
+                results[token] = (json.loads(response), self.entry_price(token, signals[token]))
+            except Exception as e:
+                print(f"❌ Forecast error for {token} ({model_used}): {e or type(e).__name__}")
+        return results
+
+    def collect_signals(self, tokens, token_pool=None, pools=None):
+        signals = {}
+        if token_pool is None:
+            for token in tokens:
+                try:
+                    signals[token] = self.fetch_signals(token)
+                except Exception as e:
+                    print(f"❌ Signal error for {token}: {e}")
+            return signals
+
+        deadline = time.monotonic() + TOKEN_DEADLINE_SECONDS
+        futures = {token_pool.submit(self.fetch_signals_concurrent, token, pools, deadline): token for token in tokens}
+        for future in concurrent.futures.as_completed(futures):
+            token = futures[future]
+            try:
+                signals[token] = future.result()
+            except Exception as e:
+                print(f"❌ Signal error for {token}: {e or type(e).__name__}")
+        return signals
+
+    # --------- Delta gating ---------
+
+    def reuse_forecast(self, token, model_used, signals):
+        """(previous forecast, price) when the token's inputs moved less than the gate's epsilon, else None."""
+        if self.gate is None:
+            return None
+        try:
+            features = feature_vector(signals)
+        except Exception:
+            return None
+        meta = self.strategy_tags.get(token, {})
+        self.gate_inputs[token] = (features, model_used, meta)
+        forecast = self.gate.check(token, features, model_used, meta)
+        if forecast is None:
+            return None
+        return forecast, self.entry_price(token, signals)
+
+    def local_forecast(self, token):
+        """Local model forecast when it is confident about this token's features, else None (escalate)."""
+        if not self.cascade or token not in self.gate_inputs:
+            return None
+        features, _, meta = self.gate_inputs[token]
+        prediction = get_local_forecaster().confident(features)
+        if prediction is None:
+            return None
+        label, confidence, probs = prediction
+        return {
+            "forecast_label": label,
+            "confidence_score": round(confidence, 4),
+            "rationale": "Local model: " + ", ".join(f"{k.lower()} {v:.0%}" for k, v in probs.items()),
+            "model_used": LOCAL_MODEL_NAME.upper(),
+            "metadata": {
+                "time_horizon": meta.get("time_horizon", "medium"),
+                "volatility_profile": meta.get("volatility_profile", "medium"),
+                "signal_triggers": meta.get("signal_triggers", ["RSI", "EMA"]),
+            },
+        }
+
+    def screen_forecast(self, token, model_used, signals):
+        """Answers that need no LLM call: an unchanged token's last forecast, then a confident local model."""
+        reused = self.reuse_forecast(token, model_used, signals)
+        if reused:
+            return reused
+        forecast = self.local_forecast(token)
+        if forecast:
+            return forecast, self.entry_price(token, signals)
+        return None
+
     def record_forecast(self, token, forecast, current_price):
         self.forecast_data[token] = forecast
         history_entry = {
@@ -84,14 +395,13 @@ Return JSON:
             "forecast": forecast,
             "entry_price": current_price
         }
-        if os.path.exists(FORECAST_HISTORY_LOG):
-            with open(FORECAST_HISTORY_LOG, "r") as f:
-                history = json.load(f)
-        else:
-            history = []
-        history.append(history_entry)
-        with open(FORECAST_HISTORY_LOG, "w") as f:
-            json.dump(history[-300:], f, indent=2)
+        # A reused forecast is already in history from when it was made; only fresh calls are scored
+        if not forecast.get("reused"):
+            if token in self.gate_inputs:
+                history_entry["features"] = self.gate_inputs[token][0]  # training rows for the local model
+            get_history_store().append(history_entry)
+            if self.gate is not None and token in self.gate_inputs:
+                self.gate.remember(token, *self.gate_inputs[token], forecast)
 
         if token not in self.tracker:
             self.tracker[token] = []
@@ -103,43 +413,75 @@ Return JSON:
         })
 
     def save_outputs(self):
-        os.makedirs("intel", exist_ok=True)
-        with open(FORECAST_OUTPUT_PATH, "w") as f:
-            json.dump(self.forecast_data, f, indent=2)
+        write_artifact(FORECAST_OUTPUT_PATH, self.forecast_data)
+        write_artifact(PRICE_TRACKER_FILE, self.tracker)
+        if self.gate is not None:
+            self.gate.save()
 
-        os.makedirs("logs/prices", exist_ok=True)
-        with open(PRICE_TRACKER_FILE, "w") as f:
-            json.dump(self.tracker, f, indent=2)
+    def assign_model(self, token, rotation):
+        model_used = self.token_routes.get(token)
+        if not model_used:
+            model_used = self.model_rank[rotation % len(self.model_rank)]
+        return model_used
 
-    def run(self):
-        print("🔮 Running Forecast Agent (Model-Rank + Routing Mode)...")
-        self.load_tokens()
-        self.load_model_rank()
-        self.load_token_routes()
-        self.load_strategy_tags()
-        if not self.tokens:
-            print("⚠️ No tokens available.")
-            return
+    def get_model_budget(self, model):
+        if model not in self.model_budgets:
+            self.model_budgets[model] = RateBudget(MODEL_RATE_BUDGETS.get(model, DEFAULT_MODEL_RATE))
+        return self.model_budgets[model]
+
+    def token_prompt(self, token, model_used, signals):
+        price_signal, trend_score, sentiment_score, cq = signals
+        meta = self.strategy_tags.get(token, {})
+        return self.build_prompt(token, price_signal, trend_score, sentiment_score, cq, model_used, meta)
+
+    def forecast_token(self, token, model_used, signals, ask=None):
+        prompt = self.token_prompt(token, model_used, signals)
+        response = ask(prompt) if ask else query_llm(prompt, model_name=model_used, site="forecast")
+        return json.loads(response), self.entry_price(token, signals)
+
+    def fetch_signals(self, token):
+        return (
+            get_price_change_signal(token),
+            get_google_trends_score(token),
+            get_twitter_sentiment_score(token),
+            get_cryptoquant_metrics(token),
+        )
+
+    def fetch_signals_concurrent(self, token, pools, deadline):
+        calls = [
+            ("price", get_price_change_signal),
+            ("trends", get_google_trends_score),
+            ("sentiment", get_twitter_sentiment_score),
+            ("cryptoquant", get_cryptoquant_metrics),
+        ]
+        futures = [pools.submit(provider, fn, token, deadline=deadline) for provider, fn in calls]
+        return tuple(f.result(timeout=max(0, deadline - time.monotonic())) for f in futures)
+
+    def forecast_token_concurrent(self, token, model_used, pools, signals=None):
+        deadline = time.monotonic() + TOKEN_DEADLINE_SECONDS
+        if signals is None:
+            signals = self.fetch_signals_concurrent(token, pools, deadline)
+            screened = self.screen_forecast(token, model_used, signals)
+            if screened:
+                return screened
+
+        if not self.get_model_budget(model_used).acquire(timeout=deadline - time.monotonic()):
+            raise TimeoutError(f"rate budget for {model_used} exhausted before deadline")
 
+        return self.forecast_token(token, model_used, signals, ask=self.ask_llm(pools, model_used, deadline))
+
+    def run_sequential(self):
         rotation = 0
         for token in self.tokens:
             try:
-                model_used = self.token_routes.get(token)
-                if not model_used:
-                    model_used = self.model_rank[rotation % len(self.model_rank)]
-
-                print(f"📈 Forecasting {token} with {model_used}...")
-                price_signal = get_price_change_signal(token)
-                trend_score = get_google_trends_score(token)
-                sentiment_score = get_twitter_sentiment_score(token)
-                cq = get_cryptoquant_metrics(token)
-                meta = self.strategy_tags.get(token, {})
-
-                prompt = self.build_prompt(token, price_signal, trend_score, sentiment_score, cq, model_used, meta)
-                response = query_llm(prompt, model_name=model_used)
-                forecast = json.loads(response)
-
-                current_price = price_signal.get("price", 0)
+                model_used = self.assign_model(token, rotation)
+                signals = self.fetch_signals(token)
+                screened = self.screen_forecast(token, model_used, signals)
+                if screened:
+                    forecast, current_price = screened
+                else:
+                    print(f"📈 Forecasting {token} with {model_used}...")
+                    forecast, current_price = self.forecast_token(token, model_used, signals)
                 self.record_forecast(token, forecast, current_price)
                 print(f"✅ {token}: {forecast['forecast_label']} ({forecast['confidence_score']}) — {forecast['model_used']}")
 
@@ -148,8 +490,137 @@ Return JSON:
                 print(f"❌ Forecast error for {token}: {e}")
                 continue
 
+    def run_concurrent(self):
+        # Models are assigned up front (rotation by position) so workers never share a counter
+        assignments = [(token, self.assign_model(token, i)) for i, token in enumerate(self.tokens)]
+        results = {}
+
+        token_pool = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        pools = ProviderPools(PROVIDER_LIMITS)
+        try:
+            futures = {
+                token_pool.submit(self.forecast_token_concurrent, token, model_used, pools): (token, model_used)
+                for token, model_used in assignments
+            }
+            for future in concurrent.futures.as_completed(futures):
+                token, model_used = futures[future]
+                try:
+                    results[token] = future.result()
+                except Exception as e:
+                    print(f"❌ Forecast error for {token} ({model_used}): {e or type(e).__name__}")
+        finally:
+            # Calls abandoned at their deadline must not hold the cycle open
+            token_pool.shutdown(wait=False, cancel_futures=True)
+            pools.shutdown()
+
+        # Record in token order so forecast_signals.json and history match sequential output
+        for token, _ in assignments:
+            if token not in results:
+                continue
+            forecast, current_price = results[token]
+            try:
+                self.record_forecast(token, forecast, current_price)
+                print(f"✅ {token}: {forecast['forecast_label']} ({forecast['confidence_score']}) — {forecast['model_used']}")
+            except Exception as e:
+                print(f"❌ Forecast error for {token}: {e}")
+
+    def run_batched(self):
+        assignments = [(token, self.assign_model(token, i)) for i, token in enumerate(self.tokens)]
+        self.batch_sizer = BatchSizer()
+        results = {}
+
+        token_pool = pools = None
+        if self.concurrent:
+            token_pool = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
+            pools = ProviderPools(PROVIDER_LIMITS)
+        try:
+            signals = self.collect_signals(self.tokens, token_pool, pools)
+
+            by_model = {}
+            for token, model_used in assignments:
+                if token not in signals:
+                    continue
+                screened = self.screen_forecast(token, model_used, signals[token])
+                if screened:
+                    results[token] = screened
+                else:
+                    by_model.setdefault(model_used, []).append(token)
+
+            jobs = []
+            for model_used, tokens in by_model.items():
+                try:
+                    batches, header, blocks = self.plan_batches(model_used, tokens, signals)
+                except Exception as e:
+                    print(f"❌ Could not plan batches for {model_used}: {e or type(e).__name__}")
+                    continue
+                print(f"📦 {model_used}: {len(tokens)} tokens in {len(batches)} request(s)")
+                jobs += [(model_used, batch, header, blocks) for batch in batches]
+
+            if token_pool is None:
+                # One bad batch must not abort the run before save_outputs
+                for model_used, batch, header, blocks in jobs:
+                    try:
+                        results.update(self.forecast_batch(model_used, batch, header, blocks, signals))
+                    except Exception as e:
+                        print(f"❌ Forecast error for batch {batch[0]}..{batch[-1]} ({model_used}): {e or type(e).__name__}")
+            else:
+                futures = {
+                    token_pool.submit(self.forecast_batch_concurrent, model_used, batch, header, blocks, signals, pools): (model_used, batch)
+                    for model_used, batch, header, blocks in jobs
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    model_used, batch = futures[future]
+                    try:
+                        results.update(future.result())
+                    except Exception as e:
+                        print(f"❌ Forecast error for batch {batch[0]}..{batch[-1]} ({model_used}): {e or type(e).__name__}")
+        finally:
+            if token_pool is not None:
+                token_pool.shutdown(wait=False, cancel_futures=True)
+                pools.shutdown()
+            self.batch_sizer.save()
+
+        for token, _ in assignments:
+            if token not in results:
+                continue
+            forecast, current_price = results[token]
+            try:
+                self.record_forecast(token, forecast, current_price)
+                print(f"✅ {token}: {forecast['forecast_label']} ({forecast['confidence_score']}) — {forecast['model_used']}")
+            except Exception as e:
+                print(f"❌ Forecast error for {token}: {e}")
+
+    def run(self):
+        mode = "Concurrent" if self.concurrent else "Sequential"
+        if self.batched:
+            mode += ", Batched"
+        print(f"🔮 Running Forecast Agent (Model-Rank + Routing Mode, {mode})...")
+        self.load_tokens()
+        self.load_model_rank()
+        self.load_token_routes()
+        self.load_strategy_tags()
+        self.gate = ForecastGate()
+        if not self.tokens:
+            print("⚠️ No tokens available.")
+            return
+
+        started = time.monotonic()
+        if self.batched:
+            self.run_batched()
+        elif self.concurrent:
+            self.run_concurrent()
+        else:
+            self.run_sequential()
+
         self.save_outputs()
-        print("✅ Forecasting complete.")
+        if self.gate.stats["reused"]:
+            print(f"♻️ Reused {self.gate.stats['reused']} unchanged forecasts, re-forecast {self.gate.stats['moved']}")
+        # Counted from the recorded results once every worker has joined, not from inside the workers
+        local_answers = sum(1 for f in self.forecast_data.values()
+                            if f.get("model_used") == LOCAL_MODEL_NAME.upper() and not f.get("reused"))
+        if local_answers:
+            print(f"🧮 Local model answered {local_answers} tokens without an LLM call")
+        print(f"✅ Forecasting complete in {time.monotonic() - started:.1f}s.")
 
 if __name__ == "__main__":
     ForecastAgent().run()
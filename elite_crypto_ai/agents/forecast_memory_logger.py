@@ -3,10 +3,11 @@
 import os
 import json
 from datetime import datetime
+from utils.forecast_store import get_history_store
 
-FORECAST_HISTORY_LOG = "logs/forecast_history.json"
 REASON_ARCHIVE_FILE = "logs/forecast_reasons.json"
 MODEL_ROTATION_LOG = "logs/forecast_model_rotation.json"
+MEMORY_WINDOW = 300  # most recent forecasts archived per run (the old history file's cap)
 
 class ForecastMemoryLogger:
     def __init__(self):
@@ -15,12 +16,10 @@ class ForecastMemoryLogger:
         self.rotation = []
 
     def load_forecasts(self):
-        if os.path.exists(FORECAST_HISTORY_LOG):
-            with open(FORECAST_HISTORY_LOG, "r") as f:
-                self.history = json.load(f)
-        else:
+        # Only the newest entries are deserialized; older ones are never read past the index
+        self.history = get_history_store().tail(MEMORY_WINDOW)
+        if not self.history:
             print("⚠️ No forecast history found.")
-            self.history = []
 
     def extract_reasons(self):
         for entry in self.history:
@@ -3,7 +3,7 @@
 import os
 import json
 from datetime import datetime
-from utils.cryptoquant import get_all_metrics
+from utils.cryptoquant import get_all_metrics_batch
 
 MARKET_STATUS_FILE = "intel/market_status.json"
 
@@ -20,15 +20,15 @@ def analyze_macro():
     score_total = 0
     count = 0
 
-    for coin in TOP_COINS:
-        data = get_all_metrics(coin)
+    # Whole endpoints × assets matrix in one concurrent, cache-backed pass
+    for coin, data in get_all_metrics_batch(TOP_COINS).items():
         macro["assets"][coin] = data
 
         # Scoring logic
         score = 0
 
         # Exchange inflow → bearish
-        flows = data.get("exchange_flows", {}).get("result", [])
+        flows = (data.get("exchange_flows") or {}).get("result", [])
         if flows:
             latest = flows[-1]
             netflow = latest.get("value", 0)
@@ -38,12 +38,12 @@ def analyze_macro():
                 score += 1
 
         # Whale activity → large tx = bullish
-        whales = data.get("whale_tx", {}).get("result", [])
+        whales = (data.get("whale_tx") or {}).get("result", [])
         if whales:
             score += min(len(whales), 5) * 0.2
 
         # Miner reserves → decreasing = bearish
-        miners = data.get("miner_reserve", {}).get("result", [])
+        miners = (data.get("miner_reserve") or {}).get("result", [])
         if len(miners) >= 2:
             delta = miners[-1]["value"] - miners[-2]["value"]
             if delta < 0:
@@ -52,7 +52,7 @@ def analyze_macro():
                 score += 0.5
 
         # Stablecoin ratio
-        stable = data.get("stablecoin_ratio", {}).get("result", [])
+        stable = (data.get("stablecoin_ratio") or {}).get("result", [])
         if stable:
             ratio = stable[-1].get("value", 0)
             if ratio > 1:
@@ -6,102 +6,110 @@ from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 from collections import defaultdict
+from utils.forecast_aggregates import ForecastAggregates
+from utils.artifacts import read_artifact, write_artifact
+from utils.llm_client import LATENCY_FILE
+from utils.local_forecaster import LOCAL_MODEL_NAME
 
-FORECAST_LOG = "logs/forecast_history.json"
 OUTPUT_FILE = "intel/llm_model_performance.json"
 TOKEN_ROUTING_FILE = "intel/token_model_routing.json"
 MODEL_NOTES_FILE = "intel/model_notes.json"
+ROUTING_REPORT_FILE = "intel/token_routing_report.json"
 
-# Scoring weights
-FULL_HIT = 1.0
-PARTIAL_HIT = 0.5
-MISS = 0.0
 WINDOWS = [7, 30]  # Rolling accuracy windows (days)
 
+# Routing: best accuracy under a latency / cost budget; within ACCURACY_TOLERANCE of that, the fastest model wins
+ACCURACY_TOLERANCE = 0.03  # absolute hit-score difference treated as a tie
+MIN_TOKEN_FORECASTS = 5  # fewer resolved forecasts than this and a model's per-token score isn't trusted
+# Budgets are per forecast token: a batched call's latency and tokens are split across the tokens it carried
+FORECAST_SITE = "forecast"
+LATENCY_BUDGET_P95 = 10.0  # seconds per token
+COST_BUDGET_PER_TOKEN = 0.02  # USD per token
+MAX_FAILURE_RATE = 0.25
+MODEL_COST_PER_1K = {"gpt-4": 0.045, "gpt-3.5-turbo": 0.0015}  # blended prompt+completion USD per 1K tokens
+DEFAULT_COST_PER_1K = 0.03
+
 
 class ForecastAnalyzer:
     def __init__(self):
-        self.history = []
         self.now = datetime.utcnow()
-        self.df = pd.DataFrame()
-        self.token_stats = defaultdict(lambda: defaultdict(list))
+        self.aggregates = None
         self.notes = defaultdict(list)
 
     def load_forecast_log(self):
-        if not os.path.exists(FORECAST_LOG):
-            print("⚠️ No forecast history found.")
-            return
-        with open(FORECAST_LOG, "r") as f:
-            self.history = json.load(f)
-        self.df = pd.DataFrame(self.history)
-        self.df["timestamp"] = pd.to_datetime(self.df["timestamp"])
-
-    def score_forecast(self, forecast, actual_change):
-        label = forecast.lower()
-        if abs(actual_change) < 0.01:
-            return PARTIAL_HIT if label == "neutral" else MISS
-        if actual_change > 0.01:
-            return FULL_HIT if label == "bullish" else MISS
-        if actual_change < -0.01:
-            return FULL_HIT if label == "bearish" else MISS
-        return MISS
+        self.aggregates = ForecastAggregates()
+        folded = self.aggregates.refresh()
+        print(f"📥 Folded {folded} newly resolved forecasts into aggregates.")
+
+    def load_call_stats(self):
+        """model -> p50/p95 latency, failure rate, LLM tokens and cost per forecast token, from the forecast
+        call site's stats in the shared LLM client's snapshot (other agents' calls don't count)."""
+        stats = {}
+        for model, s in read_artifact(LATENCY_FILE).get("sites", {}).get(FORECAST_SITE, {}).items():
+            calls = s.get("calls", 0)
+            cost = s.get("avg_tokens", 0) / 1000 * MODEL_COST_PER_1K.get(model, DEFAULT_COST_PER_1K)
+            stats[model] = {
+                "latency_p50": s.get("p50"),
+                "latency_p95": s.get("p95"),
+                "failure_rate": round(s.get("failures", 0) / calls, 4) if calls else None,
+                "avg_tokens": s.get("avg_tokens", 0),
+                "cost_per_token": round(cost, 5),
+            }
+        return stats
+
+    def within_budget(self, calls):
+        if not calls:
+            return True  # never measured: don't rule it out on budget
+        p95, failures = calls.get("latency_p95"), calls.get("failure_rate")
+        return ((p95 is None or p95 <= LATENCY_BUDGET_P95)
+                and (failures is None or failures <= MAX_FAILURE_RATE)
+                and calls.get("cost_per_token", 0) <= COST_BUDGET_PER_TOKEN)
+
+    def expected_seconds(self, calls):
+        p95 = calls.get("latency_p95") if calls else None
+        if p95 is None:
+            return float("inf")
+        return p95 / max(0.05, 1 - (calls.get("failure_rate") or 0))
+
+    def route_token(self, avg_scores, counts, call_stats):
+        most_accurate = max(avg_scores, key=avg_scores.get)
+        scores = {m: round(s, 4) for m, s in avg_scores.items()}
+        trusted = {m: s for m, s in avg_scores.items() if counts[m] >= MIN_TOKEN_FORECASTS}
+        if not trusted:
+            return most_accurate, {"model": most_accurate, "most_accurate": most_accurate, "scores": scores,
+                                   "reason": "too few forecasts"}
+
+        affordable = {m: s for m, s in trusted.items() if self.within_budget(call_stats.get(m))} or trusted
+        best = max(affordable.values())
+        tied = [m for m, s in affordable.items() if s >= best - ACCURACY_TOLERANCE]
+        choice = min(tied, key=lambda m: (
+            self.expected_seconds(call_stats.get(m)),
+            call_stats.get(m, {}).get("cost_per_token", 0),
+            -affordable[m],
+        ))
+        if choice == most_accurate:
+            reason = "most accurate"
+        elif most_accurate not in affordable:
+            reason = "most accurate model over budget"
+        else:
+            reason = "faster within tolerance"
+        return choice, {
+            "model": choice,
+            "most_accurate": most_accurate,
+            "scores": scores,
+            "reason": reason,
+        }
 
     def analyze(self):
-        if self.df.empty:
+        if self.aggregates is None or not self.aggregates.state["models"]:
             print("❌ No data to analyze.")
             return
 
-        scored = []
-        token_model_scores = defaultdict(lambda: defaultdict(list))
-
-        for _, row in self.df.iterrows():
-            token = row["token"]
-            forecast = row["forecast"]
-            model = forecast["model_used"].lower()
-            label = forecast["forecast_label"]
-            confidence = forecast.get("confidence_score", 0)
-            rationale = forecast.get("rationale", "")
-            actual_price = row["price"]
-
-            # Find next price entry for same token
-            future = self.df[
-                (self.df.token == token) &
-                (self.df.timestamp > row.timestamp)
-            ].sort_values("timestamp")
-            if future.empty:
-                continue
-
-            future_price = future.iloc[0].price
-            pct_change = (future_price - actual_price) / actual_price
-            score = self.score_forecast(label, pct_change)
-
-            scored.append({
-                "token": token,
-                "model": model,
-                "label": label,
-                "confidence": confidence,
-                "pct_change": round(pct_change, 4),
-                "score": score,
-                "timestamp": row.timestamp.isoformat(),
-                "roi": round(pct_change * 100, 2),
-                "coherence_placeholder": 1.0,
-                "rationale": rationale
-            })
-
-            self.token_stats[token][model].append(score)
-            token_model_scores[token][model].append(score)
-
-        full = pd.DataFrame(scored)
         output = {}
-        routing = {}
-
-        for model in full.model.unique():
-            model_df = full[full.model == model]
-            accuracy = model_df.score.mean()
-            avg_conf = model_df.confidence.mean()
-            drift = avg_conf - accuracy
-            avg_roi = model_df.roi.mean()
-            count = len(model_df)
+        for model, acc in self.aggregates.state["models"].items():
+            stats = self.aggregates.summary(acc)
+            accuracy, avg_conf, drift = stats["accuracy"], stats["avg_confidence"], stats["confidence_drift"]
+            avg_roi, count = stats["avg_roi"], stats["count"]
 
             self.notes[model].append(f"{datetime.utcnow().isoformat()}: {count} forecasts, ROI={avg_roi:.2f}, ACC={accuracy:.2f}, Drift={drift:.2f}")
 
@@ -116,18 +124,27 @@ class ForecastAnalyzer:
             }
 
             for window in WINDOWS:
-                cutoff = self.now - timedelta(days=window)
-                recent_df = model_df[model_df.timestamp > cutoff]
-                if not recent_df.empty:
-                    output[model][f"acc_{window}d"] = round(recent_df.score.mean(), 4)
-                    output[model][f"roi_{window}d"] = round(recent_df.roi.mean(), 4)
-
-        # Per-token best model
-        for token, models in token_model_scores.items():
-            avg_scores = {m: sum(scores)/len(scores) for m, scores in models.items() if scores}
+                recent = self.aggregates.window(acc, window, self.now)
+                if recent["count"]:
+                    output[model][f"acc_{window}d"] = round(recent["score_sum"] / recent["count"], 4)
+                    output[model][f"roi_{window}d"] = round(recent["roi_sum"] / recent["count"], 4)
+
+        # Live call stats (utils.llm_client) next to the accuracy numbers
+        call_stats = self.load_call_stats()
+        for model, calls in call_stats.items():
+            if model in output:
+                output[model].update(calls)
+
+        # Per-token model: accuracy first, then latency / cost / reliability
+        routing, report = {}, {}
+        for token, models in self.aggregates.state["token_models"].items():
+            avg_scores = {
+                m: a["score_sum"] / a["count"] for m, a in models.items()
+                if a["count"] and m != LOCAL_MODEL_NAME  # the local stage isn't a routing target
+            }
             if avg_scores:
-                best_model = max(avg_scores, key=avg_scores.get)
-                routing[token] = best_model
+                counts = {m: models[m]["count"] for m in avg_scores}
+                routing[token], report[token] = self.route_token(avg_scores, counts, call_stats)
 
         # Rank models
         acc_sorted = sorted(output.items(), key=lambda x: x[1]["lifetime_accuracy"], reverse=True)
@@ -139,12 +156,14 @@ class ForecastAnalyzer:
             output[m]["roi_rank"] = i + 1
 
         # Save files
-        with open(OUTPUT_FILE, "w") as f:
-            json.dump(output, f, indent=2)
-        with open(TOKEN_ROUTING_FILE, "w") as f:
-            json.dump(routing, f, indent=2)
-        with open(MODEL_NOTES_FILE, "w") as f:
-            json.dump(self.notes, f, indent=2)
+        write_artifact(OUTPUT_FILE, output)
+        write_artifact(TOKEN_ROUTING_FILE, routing)
+        write_artifact(MODEL_NOTES_FILE, self.notes)
+        write_artifact(ROUTING_REPORT_FILE, report)
+
+        switched = sum(1 for r in report.values() if r["model"] != r["most_accurate"])
+        if switched:
+            print(f"⚡ {switched}/{len(report)} tokens routed to a faster or cheaper model within ±{ACCURACY_TOLERANCE} accuracy")
 
         print("✅ LLM forecast performance saved →", OUTPUT_FILE)
         print("✅ Token model routing saved →", TOKEN_ROUTING_FILE)
@@ -3,9 +3,10 @@
 import os
 import json
 from datetime import datetime
-from agents.utils.llm import query_llm_with_fallback
+from utils.llm import query_llm_with_fallback
 from utils.strategy_tracker import get_strategy_performance
 from utils.intel_loader import get_forecast_accuracy_stats
+from utils.artifacts import read_artifact, write_artifact
 
 STRATEGY_FEEDBACK_FILE = "logs/strategy_feedback.json"
 FORECAST_FILE = "intel/forecast_signals.json"
@@ -24,16 +25,10 @@ class ManagerAgent:
         self.portfolio = {"safe": {}, "medium": {}, "risky": {}}
 
     def load_inputs(self):
-        def safe_load(path):
-            if os.path.exists(path):
-                with open(path, "r") as f:
-                    return json.load(f)
-            return {}
-
-        self.forecast = safe_load(FORECAST_FILE)
-        self.feedback = safe_load(STRATEGY_FEEDBACK_FILE)
-        self.market = safe_load(MARKET_FILE)
-        self.performance = safe_load(PERFORMANCE_FILE)
+        self.forecast = read_artifact(FORECAST_FILE)
+        self.feedback = read_artifact(STRATEGY_FEEDBACK_FILE)
+        self.market = read_artifact(MARKET_FILE)
+        self.performance = read_artifact(PERFORMANCE_FILE)
         self.forecast_accuracy = get_forecast_accuracy_stats()
 
     def score_token(self, token):
@@ -91,7 +86,7 @@ Return JSON like:
     def ask_llm_for_allocations(self):
         try:
             prompt = self.build_prompt()
-            response = query_llm_with_fallback(prompt)
+            response = query_llm_with_fallback(prompt, site="manager")
             self.portfolio = json.loads(response)
         except Exception as e:
             print(f"❌ LLM fallback failed, using scoring model: {e}")
@@ -106,9 +101,7 @@ Return JSON like:
                     "amount_usd": info["amount_usd"],
                     "strategy": info.get("strategy", "")
                 }
-        os.makedirs(os.path.dirname(PORTFOLIO_FILE), exist_ok=True)
-        with open(PORTFOLIO_FILE, "w") as f:
-            json.dump(flat, f, indent=2)
+        write_artifact(PORTFOLIO_FILE, flat)
 
     def log_decisions(self):
         log_entry = {
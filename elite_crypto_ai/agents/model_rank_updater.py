@@ -4,61 +4,34 @@
 import os
 import json
 from collections import defaultdict
-from datetime import datetime, timedelta
-import pandas as pd
+from datetime import datetime
+from utils.forecast_aggregates import ForecastAggregates
 
-FORECAST_LOG = "logs/forecast_history.json"
 MODEL_RANK_FILE = "logs/forecast_model_rank.json"
 
-WINDOW = 200  # How many recent forecasts to evaluate
 ROLLOUT_DAYS = 14  # Fresh rolling score weight
 
 class ModelRankUpdater:
     def __init__(self):
-        self.history = []
         self.now = datetime.utcnow()
-        self.df = pd.DataFrame()
-        self.model_scores = defaultdict(lambda: {"wins": 0, "total": 0, "roi": []})
+        self.aggregates = None
+        self.model_scores = defaultdict(lambda: {"wins": 0, "total": 0, "roi_sum": 0.0})
 
     def load_forecast_history(self):
-        if os.path.exists(FORECAST_LOG):
-            with open(FORECAST_LOG, "r") as f:
-                self.history = json.load(f)
-            self.df = pd.DataFrame(self.history)
-            self.df["timestamp"] = pd.to_datetime(self.df["timestamp"])
-        else:
+        self.aggregates = ForecastAggregates()
+        folded = self.aggregates.refresh()
+        if not self.aggregates.state["models"]:
             print("⚠️ No forecast history found.")
+        elif folded:
+            print(f"📥 Folded {folded} newly resolved forecasts into aggregates.")
 
     def score_forecasts(self):
-        recent = self.df.sort_values("timestamp").tail(WINDOW)
-
-        for i, row in recent.iterrows():
-            try:
-                model = row["forecast"].get("model_used", "unknown").lower()
-                label = row["forecast"].get("forecast_label", "neutral").lower()
-                entry_price = row.get("entry_price", 0)
-
-                # Find next future price for same token
-                future = self.df[
-                    (self.df.token == row.token) & (self.df.timestamp > row.timestamp)
-                ].sort_values("timestamp")
-                if future.empty:
-                    continue
-                resolved_price = future.iloc[0].price
-                pct = (resolved_price - entry_price) / entry_price if entry_price else 0
-
-                hit = (
-                    label == "bullish" and pct > 0.01 or
-                    label == "bearish" and pct < -0.01 or
-                    label == "neutral" and abs(pct) <= 0.01
-                )
-
-                if hit:
-                    self.model_scores[model]["wins"] += 1
-                self.model_scores[model]["total"] += 1
-                self.model_scores[model]["roi"].append(pct)
-            except Exception as e:
-                print(f"❌ Scoring error: {e}")
+        # Rolling window straight from the daily buckets — no history re-read
+        for model, acc in self.aggregates.state["models"].items():
+            recent = self.aggregates.window(acc, ROLLOUT_DAYS, self.now)
+            self.model_scores[model]["wins"] += recent["hit_sum"]
+            self.model_scores[model]["total"] += recent["count"]
+            self.model_scores[model]["roi_sum"] += recent["roi_sum"] / 100
 
     def compute_rank(self):
         weighted = []
@@ -66,8 +39,8 @@ class ModelRankUpdater:
             if data["total"] == 0:
                 continue
             acc = data["wins"] / data["total"]
-            avg_roi = sum(data["roi"]) / len(data["roi"]) if data["roi"] else 0
-            recency_boost = self.df[self.df.forecast.apply(lambda f: f.get("model_used", "").lower() == model and self.now - pd.to_datetime(f["timestamp"]) < timedelta(days=ROLLOUT_DAYS))].shape[0]
+            avg_roi = data["roi_sum"] / data["total"]
+            recency_boost = data["total"]
             weight = round((acc + avg_roi + recency_boost * 0.001), 4)
             weighted.append((model, weight))
 
@@ -7,7 +7,7 @@ price_feed_agent.py
 
 import json
 import os
-from agents.source_manager import SourceManager
+from agents.source_manager import get_source_manager
 from datetime import datetime
 
 class PriceFeedAgent:
@@ -16,7 +16,7 @@ class PriceFeedAgent:
                  output_path="data/price_feed.json"):
         self.coin_list_path = coin_list_path
         self.output_path = output_path
-        self.source = SourceManager()
+        self.source = get_source_manager()
 
     def load_coins(self):
         if not os.path.exists(self.coin_list_path):
@@ -27,13 +27,11 @@ class PriceFeedAgent:
 
     def build_price_feed(self):
         coins = self.load_coins()
-        prices = {}
+        fetched = self.source.get_prices(coins)  # one bulk request per raced source
+        prices = {coin.lower(): round(price, 6) for coin, price in fetched.items()}
         for coin in coins:
-            try:
-                price = self.source.get_price(coin)
-                prices[coin.lower()] = round(price, 6)
-            except Exception as e:
-                print(f"[PriceFeedAgent] ❌ Failed to fetch {coin}: {e}")
+            if coin not in fetched:
+                print(f"[PriceFeedAgent] ❌ Failed to fetch {coin}")
         result = {
             "timestamp": datetime.utcnow().isoformat(),
             "prices": prices
@@ -4,7 +4,7 @@ import json
 import os
 from datetime import datetime
 from utils.wallet import get_wallet_holdings
-from utils.price_feed import get_price
+from utils.price_feed import get_prices
 from utils.memory import load_allocation_memory, save_allocation_memory
 
 PORTFOLIO_PATH = "wallets/portfolio.json"
@@ -35,7 +35,7 @@ class RebalancerAgent:
             with open(MARKET_STATUS) as f:
                 self.market = json.load(f)
         self.holdings = get_wallet_holdings()
-        self.prices = {sym: get_price(sym) for sym in self.holdings}
+        self.prices = get_prices(list(self.holdings))
 
     def normalize_alloc(self):
         all_tokens = {}
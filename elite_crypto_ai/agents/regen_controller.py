@@ -5,6 +5,7 @@ import json
 from datetime import datetime, timedelta
 from collections import defaultdict
 from pathlib import Path
+from utils.forecast_store import get_history_store
 
 REGEN_QUEUE = "logs/regen_queue.json"
 FAILURE_LOG = "logs/regen_failures.json"
@@ -12,7 +13,6 @@ METRICS_FILE = "logs/repair_metrics.json"
 HEALTH_SCORES = "logs/agent_health_scores.json"
 EVOLUTION_LOG = "logs/agent_evolution_log.json"
 MANIFEST_FILE = "agents/manifest.json"
-FORECAST_LOG = "logs/forecast_history.json"
 PERFORMANCE_LOG = "intel/performance_metrics.json"
 
 MAX_AGENTS_PER_RUN = 10
@@ -39,7 +39,6 @@ def score_agents():
     failures = safe_load(FAILURE_LOG)
     metrics = safe_load(METRICS_FILE)
     performance = safe_load(PERFORMANCE_LOG)
-    forecast = safe_load(FORECAST_LOG)
 
     fail_counts = defaultdict(int)
     for entry in failures:
@@ -68,9 +67,8 @@ def score_agents():
 
 # 🧠 Detect degradation trends
 def find_degraded_agents():
-    forecast_data = safe_load(FORECAST_LOG)
     degraded = set()
-    for row in forecast_data[-100:]:
+    for row in get_history_store().tail(100):
         try:
             model = row["forecast"]["model_used"].lower()
             score = row["forecast"].get("confidence_score", 0)
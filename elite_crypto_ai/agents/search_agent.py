@@ -1,104 +1,186 @@
 # search_agent.py — ULTRA HYBRID VERSION (Elite + CoinGecko Powered)
 
-import requests
 import time
 import json
 import os
+import math
+import heapq
+import itertools
+import concurrent.futures
 from datetime import datetime
 from utils.signal_utils import get_social_buzz, get_trend_strength, get_volume_signal
 from utils.intel_loader import load_latest_intel
+from utils.throttle import RateBudget
+from utils.http import get_json
 
 ETH_OUTPUT = "data/coin_scan_results.json"
 FULL_OUTPUT = "data/coin_scan_global.json"
 NON_ETH_ALERTS = "data/top_non_eth_alerts.json"
+SCORE_CACHE_FILE = "data/coin_score_cache.json"
+
+PER_PAGE = 250
+PAGE_WORKERS = 4
+RATE_LIMIT_PER_MIN = 120  # CoinGecko plan budget for /coins/markets
+RATE_BURST = 8
+TOP_N = 250  # entries kept per ranked list (bounded heaps)
+SCORE_TTL_HOURS = 6  # unchanged coins reuse their cached score until it is this old
 
 class SearchAgent:
-    def __init__(self, max_coins=1000):
+    def __init__(self, max_coins=1000, top_n=TOP_N):
         self.api = "https://api.coingecko.com/api/v3"
         self.max_coins = max_coins
-        self.sleep_between_pages = 1.2
+        self.top_n = top_n
+        self.budget = RateBudget(RATE_LIMIT_PER_MIN, per=60, burst=RATE_BURST)
         self.eth_tokens = []
         self.non_eth_tokens = []
         self.global_ranked = []
         self.intel = load_latest_intel()
+        self.score_cache = {}
+        self.cache_stats = {"hits": 0, "scored": 0}
 
     def fetch_market_data(self, page):
-        url = f"{self.api}/coins/markets"
         params = {
             "vs_currency": "usd",
             "order": "market_cap_desc",
-            "per_page": 250,
+            "per_page": PER_PAGE,
             "page": page,
             "sparkline": False,
             "price_change_percentage": "24h,7d"
         }
-        response = requests.get(url, params=params, timeout=15)
-        response.raise_for_status()
-        return response.json()
+        self.budget.acquire()
+        return get_json("coingecko", f"{self.api}/coins/markets", params=params, timeout=15)
 
     def is_eth_token(self, coin):
         return coin.get("platforms", {}).get("ethereum") is not None
 
-    def score_coin(self, coin):
+    def signal_flags(self, symbol):
+        # (volume, trend, buzz) flags; the score only sees the fetched signals through these thresholds
+        return [
+            get_volume_signal(symbol) > 1.5,
+            get_trend_strength(symbol) > 0.7,
+            get_social_buzz(symbol) > 0.3,
+        ]
+
+    def boosts(self, coin, signals=None):
+        symbol = coin["symbol"].lower()
+        intel_boost = self.intel.get(symbol, {}).get("intel_score", 0) >= 3
+        return [intel_boost] + (signals if signals is not None else self.signal_flags(symbol))
+
+    def score_coin(self, coin, boosts=None):
         change_7d = coin.get("price_change_percentage_7d_in_currency", 0) or 0
         vol_24h = coin.get("total_volume", 0) or 0
         base_score = (change_7d / 100) + (vol_24h / 1e9)
 
-        symbol = coin["symbol"].lower()
-        intel_score = self.intel.get(symbol, {}).get("intel_score", 0)
-        volume_signal = get_volume_signal(symbol)
-        trend_strength = get_trend_strength(symbol)
-        buzz = get_social_buzz(symbol)
-
+        intel_boost, volume_boost, trend_boost, buzz_boost = boosts or self.boosts(coin)
         multiplier = 1
-        if intel_score >= 3:
+        if intel_boost:
             multiplier += 0.3
-        if volume_signal > 1.5:
+        if volume_boost:
             multiplier += 0.3
-        if trend_strength > 0.7:
+        if trend_boost:
             multiplier += 0.2
-        if buzz > 0.3:
+        if buzz_boost:
             multiplier += 0.2
 
         score = base_score * multiplier
         return round(score, 6)
 
+    # --------- Per-coin score cache ---------
+
+    def load_score_cache(self):
+        if os.path.exists(SCORE_CACHE_FILE):
+            with open(SCORE_CACHE_FILE, "r") as f:
+                self.score_cache = json.load(f)
+
+    def save_score_cache(self):
+        cutoff = time.time() - 2 * SCORE_TTL_HOURS * 3600
+        self.score_cache = {k: v for k, v in self.score_cache.items() if v["ts"] >= cutoff}
+        os.makedirs(os.path.dirname(SCORE_CACHE_FILE), exist_ok=True)
+        tmp = SCORE_CACHE_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.score_cache, f, separators=(",", ":"))
+        os.replace(tmp, SCORE_CACHE_FILE)
+
+    def fingerprint(self, coin):
+        # Market and intel inputs that move the score; rounded so tick noise doesn't force a rescore
+        symbol = coin["symbol"].lower()
+        return [
+            round(coin.get("price_change_percentage_7d_in_currency", 0) or 0, 1),
+            round((coin.get("total_volume", 0) or 0) / 1e7),
+            self.intel.get(symbol, {}).get("intel_score", 0),
+        ]
+
+    def cached_score(self, coin, now):
+        # Signals are fetched once per SCORE_TTL_HOURS; inside that window a coin is rescored from its
+        # cached signal flags only when its market or intel fingerprint moves
+        key = coin.get("id") or coin["symbol"].lower()
+        fp = self.fingerprint(coin)
+        hit = self.score_cache.get(key)
+        if hit and "signals" in hit and now - hit["ts"] < SCORE_TTL_HOURS * 3600:
+            if hit["fp"] == fp:
+                self.cache_stats["hits"] += 1
+                return hit["score"]
+            signals, fetched = hit["signals"], hit["ts"]
+        else:
+            signals, fetched = self.signal_flags(coin["symbol"].lower()), now
+        score = self.score_coin(coin, self.boosts(coin, signals))
+        self.score_cache[key] = {"fp": fp, "score": score, "signals": signals, "ts": fetched}
+        self.cache_stats["scored"] += 1
+        return score
+
+    # --------- Streaming scan ---------
+
+    def push(self, heap, item):
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, item)
+        elif item[0] > heap[0][0]:
+            heapq.heappushpop(heap, item)
+
+    def score_page(self, data, heaps, seq, now):
+        for coin in data:
+            symbol = coin["symbol"].lower()
+            score = self.cached_score(coin, now)
+            entry = {
+                "symbol": symbol,
+                "score": score,
+                "price": coin.get("current_price", 0),
+                "intel": self.intel.get(symbol, {})
+            }
+            item = (score, next(seq), entry)
+            self.push(heaps["global"], item)
+            self.push(heaps["eth"] if self.is_eth_token(coin) else heaps["non_eth"], item)
+
     def scan(self):
-        all_entries = []
-        page = 1
-
-        while len(all_entries) < self.max_coins:
-            data = self.fetch_market_data(page)
-            if not data:
-                break
-            for coin in data:
-                symbol = coin["symbol"].lower()
-                score = self.score_coin(coin)
-                entry = {
-                    "symbol": symbol,
-                    "score": score,
-                    "price": coin.get("current_price", 0),
-                    "intel": self.intel.get(symbol, {})
-                }
-                all_entries.append(entry)
-                if self.is_eth_token(coin):
-                    self.eth_tokens.append(entry)
-                else:
-                    self.non_eth_tokens.append(entry)
-            page += 1
-            time.sleep(self.sleep_between_pages)
-
-        self.eth_tokens.sort(key=lambda x: -x["score"])
-        self.non_eth_tokens.sort(key=lambda x: -x["score"])
-        self.global_ranked = sorted(all_entries, key=lambda x: -x["score"])
+        start = time.time()
+        self.load_score_cache()
+        pages = range(1, math.ceil(self.max_coins / PER_PAGE) + 1)
+        heaps = {"global": [], "eth": [], "non_eth": []}
+        seq = itertools.count()
+        now = time.time()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+            futures = {executor.submit(self.fetch_market_data, page): page for page in pages}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    data = future.result()
+                except Exception as e:
+                    print(f"⚠️ Page {futures[future]} failed: {e}")
+                    continue
+                self.score_page(data or [], heaps, seq, now)  # Scored as each page lands
+
+        ranked = {name: [item[2] for item in sorted(heap, key=lambda x: (-x[0], x[1]))] for name, heap in heaps.items()}
+        self.eth_tokens = ranked["eth"]
+        self.non_eth_tokens = ranked["non_eth"]
+        self.global_ranked = ranked["global"]
+        self.save_score_cache()
 
         timestamp = datetime.utcnow().isoformat()
         json.dump({"timestamp": timestamp, "coins": self.eth_tokens}, open(ETH_OUTPUT, "w"), indent=2)
         json.dump({"timestamp": timestamp, "coins": self.global_ranked}, open(FULL_OUTPUT, "w"), indent=2)
         json.dump({"timestamp": timestamp, "top_non_eth": self.non_eth_tokens[:6]}, open(NON_ETH_ALERTS, "w"), indent=2)
 
-        print(f"🔍 SearchAgent Complete → ETH: {len(self.eth_tokens)} | Non-ETH: {len(self.non_eth_tokens)}")
-
+        print(f"🔍 SearchAgent Complete → ETH: {len(self.eth_tokens)} | Non-ETH: {len(self.non_eth_tokens)} "
+              f"| scored {self.cache_stats['scored']}, cached {self.cache_stats['hits']} | {time.time() - start:.1f}s")
 
 if __name__ == "__main__":
     SearchAgent().scan()
@@ -4,9 +4,12 @@ import os
 import json
 from datetime import datetime
 from collections import defaultdict
-from agents.utils.llm import query_llm_with_fallback
+from utils.llm import query_llm_with_fallback
 from utils.strategy_tracker import get_strategy_performance
 from utils.intel_loader import get_forecast_accuracy_stats
+from utils.forecast_aggregates import ForecastAggregates
+from utils.signal_contract import STRATEGY_CONTRACT_PROMPT, report_lint
+from utils.artifacts import read_artifact, write_artifact
 
 ACCURACY_LOG = "data/forecast_accuracy.json"
 PROMPT_SCORES = "data/prompt_scores.json"
@@ -26,40 +29,42 @@ class SelfTrainer:
         self.forecast_accuracy = {}
         self.model_performance = {}
         self.strategy_performance = {}
+        self.aggregates = None
 
     def load_data(self):
+        self.aggregates = ForecastAggregates()
+        self.aggregates.refresh()
         self.forecast_accuracy = get_forecast_accuracy_stats()
-        self.model_performance = self.load_llm_performance_metrics()  # pulled from llm_forecast_analyzer for dashboard integration
+        self.model_performance = self.load_model_performance()  # pulled from llm_forecast_analyzer for dashboard integration
         self.strategy_performance = get_strategy_performance()
         self.model_scores = self.load_prompt_scores()
 
     def load_prompt_scores(self):
-        if not os.path.exists(PROMPT_SCORES):
-            return defaultdict(lambda: 1.0)
-        with open(PROMPT_SCORES, "r") as f:
-            return defaultdict(lambda: 1.0, json.load(f))
+        return defaultdict(lambda: 1.0, read_artifact(PROMPT_SCORES))
 
     def load_model_performance(self):
-        if not os.path.exists(MODEL_PERF_FILE):
-            return {}
-        with open(MODEL_PERF_FILE, "r") as f:
-            return json.load(f)
+        return read_artifact(MODEL_PERF_FILE)
 
     def save_prompt_scores(self):
-        with open(PROMPT_SCORES, "w") as f:
-            json.dump(dict(self.model_scores), f, indent=2)
+        write_artifact(PROMPT_SCORES, dict(self.model_scores))
 
     def update_model_weights(self):
-        for model_key in set(list(self.forecast_accuracy.keys()) + list(self.model_performance.keys())):
-            model = model_key.split("_")[0].lower()
-            accuracy = self.forecast_accuracy.get(model_key, {}).get("accuracy", 0.5)
-            roi = self.model_performance.get(model, {}).get("avg_roi", 0)
-            drift = self.model_performance.get(model, {}).get("confidence_drift", 0)
+        # Boost/decay once per batch of newly resolved forecasts, not once per run over the same data
+        for model in self.aggregates.state["models"]:
+            mark = self.aggregates.state["model_watermarks"].get(model, "")
+            if mark <= self.aggregates.consumer_watermark("self_trainer", model):
+                continue
+            stats = self.aggregates.model_summary(model)
+            accuracy = stats["accuracy"]
+            roi = stats["avg_roi"]
+            drift = stats["confidence_drift"]
 
             if accuracy >= 0.7 or roi > 0.03:
                 self.model_scores[model] = min(MAX_WEIGHT, self.model_scores[model] * BOOST)
             elif accuracy < 0.4 or drift > 0.2:
                 self.model_scores[model] = max(MIN_WEIGHT, self.model_scores[model] * DECAY)  # log drift-based downgrade for dashboard heatmap
+            self.aggregates.set_consumer_watermark("self_trainer", model, mark)
+        self.aggregates.save()
 
     def regenerate_strategies(self):
         os.makedirs(STRATEGY_FOLDER, exist_ok=True)
@@ -78,13 +83,14 @@ Please create a new strategy in Python with:
 - Better hit rate
 - Return a Strategy class using lowercase OHLCV column names
 Only return raw code.
-"""
+{STRATEGY_CONTRACT_PROMPT}"""
                 try:
-                    raw_code = query_llm_with_fallback(prompt)
+                    raw_code = query_llm_with_fallback(prompt, site="self_trainer")
                     code = "import pandas as pd\n" + raw_code.split("import pandas")[-1].strip()
                     filename = os.path.join(STRATEGY_FOLDER, f"{token}_auto.py")
                     with open(filename, "w") as f:
                         f.write(code)
+                    report_lint(code, filename)
                     print(f"✅ Regenerated strategy for {token}")
                 except Exception as e:
                     print(f"❌ Failed to regenerate {token}: {e}")
@@ -1,7 +1,19 @@
-# sequence_agent.py — ULTRA ELITE PIPELINE RUNNER
+# sequence_agent.py — ULTRA ELITE PIPELINE RUNNER (artifact DAG, parallel stages, critical-path timing)
 
+import os
+import sys
+import json
+import time
+import threading
 import subprocess
+import concurrent.futures
 
+TIMING_LOG = "logs/pipeline_timing.json"
+PIPELINE_MODE = "dag"  # "dag" = independent stages run in parallel, "serial" = one at a time in AGENTS order
+MAX_PARALLEL = max(4, min(8, os.cpu_count() or 4))  # stages are separate processes, mostly waiting on IO
+TIMING_HISTORY = 50  # runs kept in TIMING_LOG
+
+# Canonical order: the serial run order, and the tie-breaker for artifact hazards
 AGENTS = [
     "price_feed_agent.py",
     "search_agent.py",
@@ -25,21 +37,305 @@ AGENTS = [
     "dashboard_agent.py",
     "email_reporter.py",
     "model_rank_updater.py",
+    "local_model_trainer.py",
     "self_trainer.py",
     "agent_auto_regen.py",
     "uniswap_router.py",
     "source_manager.py"
 ]
 
-def run_agents():
-    print("▶️ Initiating full ultra elite sequence pipeline...\n")
-    for agent in AGENTS:
-        print(f"▶️ Running: {agent}")
-        try:
-            subprocess.run(["python3", f"agents/{agent}"], check=True)
-        except subprocess.CalledProcessError as e:
-            print(f"❌ {agent} failed with error: {e}\n")
-        print()
+# Artifacts each agent reads / writes. A path ending in "/" covers everything under it.
+# Every stage also reads its own script, so agent_auto_regen (writes agents/) acts as a barrier.
+STAGES = {
+    "price_feed_agent.py": {
+        "reads": ["data/coins_for_strategy.json"],
+        "writes": ["data/price_feed.json", "logs/prices/price_cache.json", "logs/price_source_scores.json"],
+    },
+    "search_agent.py": {
+        "reads": ["data/intel_report.json"],
+        "writes": ["data/coin_scan_results.json", "data/coin_scan_global.json",
+                   "data/top_non_eth_alerts.json", "data/coin_score_cache.json"],
+    },
+    "coin_generator.py": {
+        "reads": ["data/ohlcv_store/"],
+        "writes": ["data/generated_coins.json"],
+    },
+    "symbol_mapper.py": {
+        "reads": ["data/symbol_map.json"],
+        "writes": [],
+    },
+    "analytics_agent.py": {
+        "reads": ["data/backtest_results.json"],
+        "writes": ["data/analytics_report.json"],
+    },
+    "intel_engine.py": {
+        "reads": [],
+        "writes": ["intel/market_status.json", "cache/cryptoquant/"],
+    },
+    "forecast_agent.py": {
+        "reads": ["logs/forecast_model_rank.json", "intel/token_model_routing.json",
+                  "logs/prices/current_prices.json", "intel/strategy_metadata.json",
+                  "logs/local_forecaster.json"],
+        "writes": ["intel/forecast_signals.json", "logs/prices/forecast_price_tracker.json",
+                   "logs/forecast_history/", "logs/forecast_batch_tuning.json",
+                   "logs/forecast_fingerprints.json"],
+    },
+    "forecast_accuracy_tracker.py": {
+        "reads": ["logs/forecast_history/"],
+        "writes": ["logs/forecast_accuracy.json", "logs/forecast_accuracy_state.json"],
+    },
+    "forecast_memory_logger.py": {
+        "reads": ["logs/forecast_history/"],
+        "writes": ["logs/forecast_reasons.json", "logs/forecast_model_rotation.json"],
+    },
+    "strategy_generator_agent.py": {
+        "reads": ["intel/performance_metrics.json", "intel/best_signals.json"],
+        "writes": ["strategies/", "intel/strategy_metadata.json"],
+    },
+    "strategy_agent.py": {
+        "reads": ["data/coin_scan_results.json", "intel/forecast_signals.json", "strategies/",
+                  "data/ohlcv_store/"],
+        "writes": ["logs/strategy_feedback.json", "intel/performance_metrics.json"],
+    },
+    "strategy_simulator.py": {
+        "reads": ["strategies/", "data/ohlcv_store/"],
+        "writes": ["intel/simulation_results.json", "logs/simulation_trade_log.json",
+                   "logs/evolution_queue.json", "results/charts/"],
+    },
+    "strategy_heatmap_generator.py": {
+        "reads": ["logs/strategy_feedback.json"],
+        "writes": ["logs/heatmaps/"],
+    },
+    "strategy_batch_runner.py": {
+        "reads": ["intel/forecast_signals.json", "strategies/", "data/ohlcv_store/"],
+        "writes": ["logs/strategy_feedback.json"],
+    },
+    "strategy_tracker.py": {
+        "reads": ["results/strategy_runs/"],
+        "writes": ["logs/strategy_feedback.json"],
+    },
+    "rebalancer_agent.py": {
+        "reads": ["wallets/portfolio.json", "data/market_status.json"],
+        "writes": ["logs/rebalance_log.json", "data/rebalance_plan.json", "logs/prices/price_cache.json"],
+    },
+    "manager_agent.py": {
+        "reads": ["logs/strategy_feedback.json", "intel/forecast_signals.json", "intel/market_status.json",
+                  "intel/performance_metrics.json"],
+        "writes": ["wallets/portfolio.json", "logs/execution_log.json"],
+    },
+    "execution_agent.py": {
+        "reads": ["wallets/portfolio.json"],
+        "writes": ["data/execution_log.json"],
+    },
+    "report_builder.py": {
+        "reads": ["data/forecast_log.json", "data/forecast_accuracy.json"],
+        "writes": [],
+    },
+    "dashboard_agent.py": {
+        "reads": ["intel/llm_model_performance.json", "data/prompt_scores.json", "data/forecast_accuracy.json",
+                  "intel/forecast_signals.json", "intel/performance_metrics.json", "wallets/portfolio.json",
+                  "intel/market_status.json", "logs/strategy_feedback.json",
+                  "logs/prices/forecast_price_tracker.json", "logs/heatmaps/"],
+        "writes": [],
+    },
+    "email_reporter.py": {
+        "reads": ["intel/llm_model_performance.json", "data/prompt_scores.json", "data/forecast_accuracy.json",
+                  "intel/forecast_signals.json", "intel/performance_metrics.json", "wallets/portfolio.json",
+                  "intel/market_status.json", "logs/strategy_feedback.json",
+                  "logs/prices/forecast_price_tracker.json", "logs/heatmaps/"],
+        "writes": [],
+    },
+    "model_rank_updater.py": {
+        # ForecastAggregates.refresh() folds new history and saves the aggregates back
+        "reads": ["intel/forecast_aggregates.json", "logs/forecast_history/"],
+        "writes": ["logs/forecast_model_rank.json", "intel/forecast_aggregates.json"],
+    },
+    "local_model_trainer.py": {
+        "reads": ["logs/forecast_history/"],
+        "writes": ["logs/local_forecaster.json"],
+    },
+    "self_trainer.py": {
+        "reads": ["intel/forecast_aggregates.json", "logs/forecast_history/", "logs/strategy_feedback.json",
+                  "intel/performance_metrics.json"],
+        "writes": ["data/prompt_scores.json", "intel/llm_model_performance.json", "strategies/",
+                   "intel/forecast_aggregates.json"],
+    },
+    "agent_auto_regen.py": {
+        "reads": ["logs/regen_log.json"],
+        "writes": ["agents/", "logs/regen_log.json"],
+    },
+    "uniswap_router.py": {
+        "reads": [],
+        "writes": [],
+    },
+    "source_manager.py": {
+        "reads": [],
+        "writes": ["logs/prices/price_cache.json", "logs/price_source_scores.json"],
+    },
+}
+
+
+# --------- Dependency graph ---------
+
+def overlaps(a, b):
+    return a == b or (a.endswith("/") and b.startswith(a)) or (b.endswith("/") and a.startswith(b))
+
+
+def touches(paths, others):
+    return any(overlaps(a, b) for a in paths for b in others)
+
+
+def stage_io(agent):
+    io = STAGES.get(agent, {})
+    return list(io.get("reads", [])) + [f"agents/{agent}"], list(io.get("writes", []))
+
+
+def build_graph(agents=AGENTS):
+    """{agent: [earlier agents it must wait for]} from read-after-write, write-after-write and write-after-read hazards."""
+    deps = {}
+    for j, agent in enumerate(agents):
+        reads, writes = stage_io(agent)
+        deps[agent] = []
+        for earlier in agents[:j]:
+            e_reads, e_writes = stage_io(earlier)
+            if touches(e_writes, reads) or touches(e_writes, writes) or touches(e_reads, writes):
+                deps[agent].append(earlier)
+    return deps
+
+
+def critical_path(agents, deps, durations):
+    """Longest chain of measured durations through the graph → (seconds, [agents])."""
+    finish, via = {}, {}
+    for agent in agents:  # AGENTS order is a topological order
+        parent = max(deps[agent], key=lambda d: finish[d], default=None)
+        finish[agent] = (finish[parent] if parent else 0.0) + durations.get(agent, 0.0)
+        via[agent] = parent
+    if not finish:
+        return 0.0, []
+    node = max(agents, key=lambda a: finish[a])
+    total, path = finish[node], []
+    while node:
+        path.append(node)
+        node = via[node]
+    return total, path[::-1]
+
+
+# --------- Execution ---------
+
+def launch_subprocess(agent):
+    """Default launcher: a fresh interpreter per stage → (exit code, captured output)."""
+    result = subprocess.run(["python3", f"agents/{agent}"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return result.returncode, result.stdout
+
+
+class PipelineRunner:
+    def __init__(self, agents=AGENTS, mode=PIPELINE_MODE, max_parallel=MAX_PARALLEL, launcher=launch_subprocess):
+        self.agents = list(agents)
+        self.mode = mode
+        self.launcher = launcher  # fn(agent) -> (exit code, output or None if already streamed)
+        self.max_parallel = 1 if mode == "serial" else max_parallel
+        self.deps = build_graph(self.agents) if mode != "serial" else {
+            a: self.agents[i - 1:i] for i, a in enumerate(self.agents)
+        }
+        self.timings = {}
+        self.print_lock = threading.Lock()
+
+    def run_stage(self, agent, origin):
+        start = time.monotonic()
+        returncode, output = self.launcher(agent)
+        end = time.monotonic()
+        status = "ok" if returncode == 0 else "failed"
+        # Parallel stages buffer their output so each agent's log stays in one block
+        with self.print_lock:
+            print(f"▶️ {agent} ({end - start:.2f}s)")
+            if output:
+                print(output.rstrip())
+            if status == "failed":
+                print(f"❌ {agent} failed with exit code {returncode}")
+            print()
+        self.timings[agent] = {
+            "start": round(start - origin, 3),
+            "end": round(end - origin, 3),
+            "duration": round(end - start, 3),
+            "status": status,
+        }
+
+    def run(self):
+        origin = time.monotonic()
+        waiting = {agent: set(self.deps[agent]) for agent in self.agents}
+        dependents = {agent: [] for agent in self.agents}
+        for agent, deps in self.deps.items():
+            for dep in deps:
+                dependents[dep].append(agent)
+
+        # A failed stage still releases its dependents, as the serial runner carried on after errors
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            running = {}
+
+            def launch():
+                for agent in [a for a in self.agents if not waiting[a] and a not in self.timings]:
+                    if agent not in running.values():
+                        running[executor.submit(self.run_stage, agent, origin)] = agent
+
+            launch()
+            while running:
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    agent = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"❌ {agent} could not be started: {e}\n")
+                        self.timings[agent] = {"start": None, "end": None, "duration": 0.0, "status": "error"}
+                    for child in dependents[agent]:
+                        waiting[child].discard(agent)
+                launch()
+
+        return self.report(time.monotonic() - origin)
+
+    def report(self, wall):
+        durations = {agent: t["duration"] for agent, t in self.timings.items()}
+        path_seconds, path = critical_path(self.agents, self.deps, durations)
+        summary = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "mode": self.mode,
+            "workers": self.max_parallel,
+            "wall_seconds": round(wall, 3),
+            "serial_seconds": round(sum(durations.values()), 3),
+            "critical_path_seconds": round(path_seconds, 3),
+            "critical_path": path,
+            "failed": [a for a in self.agents if self.timings.get(a, {}).get("status") != "ok"],
+            "stages": {a: dict(self.timings.get(a, {}), depends_on=self.deps[a]) for a in self.agents},
+        }
+
+        print("📊 Stage timing:")
+        for agent in sorted(self.agents, key=lambda a: -durations.get(a, 0.0)):
+            marker = "⭐" if agent in path else "  "
+            print(f"  {marker} {agent:<32} {durations.get(agent, 0.0):7.2f}s  {self.timings[agent]['status']}")
+        print(f"🧭 Critical path ({path_seconds:.2f}s): {' → '.join(path)}")
+        print(f"⏱️ Wall {wall:.2f}s vs {summary['serial_seconds']:.2f}s of stage time ({self.max_parallel} workers)")
+        self.save_timing(summary)
+        return summary
+
+    def save_timing(self, summary, path=TIMING_LOG):
+        history = []
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    history = json.load(f)
+            except (OSError, ValueError):
+                history = []
+        history = (history if isinstance(history, list) else [])[-(TIMING_HISTORY - 1):] + [summary]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(history, f, indent=2)
+        os.replace(tmp, path)
+
+
+def run_agents(mode=PIPELINE_MODE):
+    print(f"▶️ Initiating full ultra elite sequence pipeline ({mode})...\n")
+    return PipelineRunner(mode=mode).run()
 
 if __name__ == "__main__":
-    run_agents()
+    run_agents("serial" if "--serial" in sys.argv else PIPELINE_MODE)
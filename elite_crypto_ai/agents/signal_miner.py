@@ -3,6 +3,7 @@
 import os
 import json
 from collections import defaultdict
+from utils.artifacts import read_artifact, write_artifact
 
 STRATEGY_META_PATH = "intel/strategy_metadata.json"
 PERFORMANCE_PATH = "intel/performance_metrics.json"
@@ -15,12 +16,8 @@ class SignalMiner:
         self.signal_scores = defaultdict(list)
 
     def load_data(self):
-        if os.path.exists(STRATEGY_META_PATH):
-            with open(STRATEGY_META_PATH, "r") as f:
-                self.metadata = json.load(f)
-        if os.path.exists(PERFORMANCE_PATH):
-            with open(PERFORMANCE_PATH, "r") as f:
-                self.performance = json.load(f)
+        self.metadata = read_artifact(STRATEGY_META_PATH)
+        self.performance = read_artifact(PERFORMANCE_PATH)
 
     def analyze_signals(self):
         for token, meta in self.metadata.items():
@@ -42,8 +39,7 @@ class SignalMiner:
         sorted_signals = sorted(avg_scores.items(), key=lambda x: -x[1])
         best = [s for s, _ in sorted_signals]
 
-        with open(OUTPUT_PATH, "w") as f:
-            json.dump({"best_signals": best, "scores": avg_scores}, f, indent=2)
+        write_artifact(OUTPUT_PATH, {"best_signals": best, "scores": avg_scores})
         print(f"✅ Saved best signals to {OUTPUT_PATH}")
 
     def run(self):
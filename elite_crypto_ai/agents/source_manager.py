@@ -5,13 +5,13 @@ import time
 import random
 
 # Simulated APIs — in real build, use requests or aiohttp
-from utils.sources.coingecko import get_price_from_coingecko
-from utils.sources.binance import get_price_from_binance
-from utils.sources.uniswap import get_price_from_uniswap
-from utils.sources.chainlink import get_price_from_chainlink
+from utils.sources.coingecko import get_price_from_coingecko, get_prices_from_coingecko
+from utils.sources.binance import get_price_from_binance, get_prices_from_binance
+from utils.sources.uniswap import get_price_from_uniswap, get_prices_from_uniswap
+from utils.sources.chainlink import get_price_from_chainlink, get_prices_from_chainlink
+from utils.price_cache import get_price_cache
+from utils.price_quorum import HedgedQuorum
 
-SCORE_LOG = "logs/price_source_scores.json"
-CACHE_FILE = "logs/prices/price_cache.json"
 
 class SourceManager:
     def __init__(self):
@@ -21,40 +21,49 @@ class SourceManager:
             ("uniswap", get_price_from_uniswap),
             ("chainlink", get_price_from_chainlink),
         ]
-        self.scores = {src[0]: 1.0 for src in self.sources}
-        self.cache = {}
-        self.load_cache()
+        self.bulk = {
+            "coingecko": get_prices_from_coingecko,
+            "binance": get_prices_from_binance,
+            "uniswap": get_prices_from_uniswap,
+            "chainlink": get_prices_from_chainlink,
+        }
+        self.quorum = HedgedQuorum(self.sources, bulk=self.bulk)
+        self.scores = self.quorum.stats  # latency percentiles + failure rate + disagreement per source
+        self.cache = get_price_cache()  # Shared across every manager in the process
 
     def load_cache(self):
-        if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, "r") as f:
-                self.cache = json.load(f)
+        self.cache.load()
 
     def save_cache(self):
-        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-        with open(CACHE_FILE, "w") as f:
-            json.dump(self.cache, f, indent=2)
+        self.cache.flush()
 
     def get_best_source(self):
-        return sorted(self.sources, key=lambda s: -self.scores[s[0]])
+        fns = dict(self.sources)
+        return [(name, fns[name]) for name in self.quorum.ranked()]
 
     def get_price(self, token):
-        if token in self.cache and time.time() - self.cache[token]["timestamp"] < 60:
-            return self.cache[token]["price"]
+        cached = self.cache.get(token)
+        if cached is not None:
+            return cached
 
-        for name, fn in self.get_best_source():
-            try:
-                price = fn(token)
-                if price:
-                    self.cache[token] = {"price": price, "timestamp": time.time()}
-                    self.scores[name] += 0.05  # reward
-                    self.save_cache()
-                    return price
-            except:
-                self.scores[name] -= 0.1  # penalty
-                continue
+        price, _ = self.quorum.query(token)  # raises ValueError if every source fails
+        self.cache.put(token, price)  # Write-behind: flushed on batch size / timer / exit
+        return price
 
-        raise ValueError(f"❌ All sources failed for {token}")
+    def get_prices(self, tokens):
+        """{token: price} for every token any source could price; misses cost one bulk call per source."""
+        prices, missing = {}, []
+        for token in dict.fromkeys(tokens):
+            cached = self.cache.get(token)
+            if cached is not None:
+                prices[token] = cached
+            else:
+                missing.append(token)
+        if missing:
+            fetched, _ = self.quorum.query_many(missing)
+            self.cache.put_many(fetched)
+            prices.update(fetched)
+        return prices
 
     def run_test(self):
         print("📡 Testing SourceManager...")
@@ -65,9 +74,17 @@ class SourceManager:
         except Exception as e:
             print(str(e))
 
+_manager = None
+
+def get_source_manager():
+    global _manager
+    if _manager is None:
+        _manager = SourceManager()
+    return _manager
+
+def get_live_price(token):
+    return get_source_manager().get_price(token)
+
 if __name__ == "__main__":
     manager = SourceManager()
     manager.run_test()
-
-def get_live_price(token):
-    return SourceManager().get_price(token)
@@ -4,13 +4,36 @@ import os
 import json
 import pandas as pd
 from utils.data_loader import load_ohlcv
+from utils.backtest import backtest_matrix, signal_matrix, metrics_row
 from utils.strategy_tracker import save_strategy_feedback, get_strategy_performance
 from utils.intel_loader import get_forecast_labels
+from utils.strategy_registry import get_strategy_registry
+from utils.artifacts import write_artifact
 
 STRATEGIES_FOLDER = "strategies"
 STRATEGY_FEEDBACK_FILE = "logs/strategy_feedback.json"
 PERFORMANCE_FILE = "intel/performance_metrics.json"
 
+def strategy_files(token):
+    return get_strategy_registry(STRATEGIES_FOLDER).files(token)
+
+def load_strategy_namespace(path):
+    return get_strategy_registry(STRATEGIES_FOLDER).namespace(path)
+
+def forecast_alignment(forecast_label, pnl):
+    if forecast_label == "BULLISH" and pnl > 0:
+        return 1
+    if forecast_label == "BEARISH" and pnl < 0:
+        return 1
+    return 0
+
+def rank_strategies(token_strats):
+    ranked = sorted(token_strats.items(), key=lambda x: -x[1]['sharpe'])
+    return {
+        "top_strategy": ranked[0][0],
+        "all": token_strats
+    }
+
 class StrategyAgent:
     def __init__(self):
         self.tokens = []
@@ -28,42 +51,35 @@ class StrategyAgent:
     def load_forecasts(self):
         self.forecast_labels = get_forecast_labels()
 
-    def test_strategy(self, token, strategy_module):
+    def evaluate_token(self, token, strategy_modules, df=None):
+        """Backtest every strategy for a token in one vectorized pass. strategy_modules: {name: namespace}"""
         try:
-            df = load_ohlcv(token)
-            strat = strategy_module.Strategy()
-            signals = strat.generate_signals(df)
-
-            if len(signals) != len(df):
-                raise ValueError("Signal length mismatch")
-
-            df["signal"] = signals
-            df["return"] = df["close"].pct_change().fillna(0)
-            df["strategy_return"] = df["signal"] * df["return"]
-
-            cumulative = (1 + df["strategy_return"]).cumprod()
-            pnl = cumulative.iloc[-1] - 1
-            sharpe = (df["strategy_return"].mean() / df["strategy_return"].std()) * (252**0.5)
-            drawdown = (cumulative.cummax() - cumulative).max()
-            hit_rate = (df["strategy_return"] > 0).sum() / len(df)
-
-            forecast_alignment = 0
-            forecast_label = self.forecast_labels.get(token)
-            if forecast_label == "BULLISH" and pnl > 0:
-                forecast_alignment = 1
-            elif forecast_label == "BEARISH" and pnl < 0:
-                forecast_alignment = 1
-
-            return {
-                "pnl": round(pnl, 4),
-                "sharpe": round(sharpe, 3),
-                "drawdown": round(drawdown, 4),
-                "hit_rate": round(hit_rate, 3),
-                "alignment": forecast_alignment
-            }
+            df = load_ohlcv(token) if df is None else df
         except Exception as e:
-            print(f"❌ Strategy test failed for {token}: {e}")
-            return None
+            print(f"❌ Price data unavailable for {token}: {e}")
+            return {}
+
+        names, rows = [], []
+        for name, module in strategy_modules.items():
+            try:
+                signals = module["Strategy"]().generate_signals(df.copy())
+                rows.append(signal_matrix([signals], len(df))[0])
+                names.append(name)
+            except Exception as e:
+                print(f"❌ Strategy test failed for {token} ({name}): {e}")
+
+        if not names:
+            return {}
+        result = backtest_matrix(signal_matrix(rows, len(df)), df["close"].to_numpy())
+        out = {}
+        for i, name in enumerate(names):
+            metrics = metrics_row(result, i)
+            metrics["alignment"] = forecast_alignment(self.forecast_labels.get(token), metrics["pnl"])
+            out[name] = metrics
+        return out
+
+    def test_strategy(self, token, strategy_module):
+        return self.evaluate_token(token, {"strategy": strategy_module}).get("strategy")
 
     def run(self):
         print("📊 Running Strategy Agent (Ultra Elite)...")
@@ -76,35 +92,22 @@ class StrategyAgent:
         feedback = {}
 
         for token in self.tokens:
-            token_strats = {}
             try:
-                for file in os.listdir(STRATEGIES_FOLDER):
-                    if file.endswith(".py") and file.startswith(token):
-                        path = os.path.join(STRATEGIES_FOLDER, file)
-                        namespace = {}
-                        with open(path) as f:
-                            exec(f.read(), namespace)
-                        result = self.test_strategy(token, namespace)
-                        if result:
-                            token_strats[file] = result
+                modules = {file: load_strategy_namespace(path) for file, path in strategy_files(token).items()}
             except Exception as e:
                 print(f"❌ Failed loading strategies for {token}: {e}")
                 continue
 
+            token_strats = self.evaluate_token(token, modules) if modules else {}
             if token_strats:
-                ranked = sorted(token_strats.items(), key=lambda x: -x[1]['sharpe'])
-                feedback[token] = {
-                    "top_strategy": ranked[0][0],
-                    "all": token_strats
-                }
-                performance[token] = ranked[0][1]
+                feedback[token] = rank_strategies(token_strats)
+                performance[token] = token_strats[feedback[token]["top_strategy"]]
 
         self.feedback = feedback
         self.performance = performance
 
         save_strategy_feedback(self.feedback)
-        with open(PERFORMANCE_FILE, "w") as f:
-            json.dump(self.performance, f, indent=2)
+        write_artifact(PERFORMANCE_FILE, self.performance)
 
         print(f"✅ Strategy feedback + performance saved for {len(self.feedback)} tokens.")
 
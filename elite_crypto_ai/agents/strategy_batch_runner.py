@@ -2,55 +2,149 @@
 
 import os
 import json
+import time
 import concurrent.futures
-from agents.strategy_agent import StrategyAgent
+from agents.strategy_agent import (
+    StrategyAgent, strategy_files, load_strategy_namespace, rank_strategies, forecast_alignment,
+)
+from utils.backtest import backtest_matrix, signal_matrix, metrics_row
+from utils.data_loader import load_ohlcv
+from utils.intel_loader import get_forecast_labels
+from utils.shared_ohlcv import publish_frame, attach_frame, release
+from utils.strategy_tracker import save_strategy_feedback
+from utils.artifacts import read_artifact
 
 STRATEGY_INPUT_FILE = "intel/forecast_signals.json"
 STRATEGY_RESULTS_FILE = "logs/strategy_feedback.json"
 MAX_THREADS = 8
 
+# Process mode: one (token, strategy) unit per task, OHLCV shared across workers without copies
+EXECUTION_MODE = "process"  # "process" | "thread"
+MAX_PROCESSES = os.cpu_count() or 4
+FLUSH_EVERY = 25  # Rewrite the feedback file after this many finished units
+
+# --------- Worker side (module-level so it pickles) ---------
+
+_worker_specs = {}
+_worker_labels = {}
+_worker_frames = {}
+
+
+def init_worker(specs, labels):
+    global _worker_specs, _worker_labels
+    _worker_specs = specs
+    _worker_labels = labels
+
+
+def worker_frame(token):
+    # Attach once per process; the views stay valid for the worker's lifetime
+    if token not in _worker_frames:
+        _worker_frames[token] = attach_frame(_worker_specs[token])
+    return _worker_frames[token][1]
+
+
+def evaluate_unit(token, name, path):
+    try:
+        df = worker_frame(token)
+        strategy = load_strategy_namespace(path)["Strategy"]()
+        signals = strategy.generate_signals(df.copy())
+        result = backtest_matrix(signal_matrix([signals], len(df)), df["close"].to_numpy())
+        metrics = metrics_row(result, 0)
+        metrics["alignment"] = forecast_alignment(_worker_labels.get(token), metrics["pnl"])
+        return token, name, metrics
+    except Exception as e:
+        return token, name, {"error": str(e)}
+
+
 class StrategyBatchRunner:
-    def __init__(self):
+    def __init__(self, mode=EXECUTION_MODE):
+        self.mode = mode
         self.tokens = []
+        self.labels = {}
         self.results = {}
+        self.token_strats = {}
 
     def load_tokens(self):
         if not os.path.exists(STRATEGY_INPUT_FILE):
             print("❌ No forecast input file found.")
             return
-        with open(STRATEGY_INPUT_FILE, "r") as f:
-            self.tokens = list(json.load(f).keys())
+        self.tokens = list(read_artifact(STRATEGY_INPUT_FILE).keys())
+        self.labels = get_forecast_labels(STRATEGY_INPUT_FILE)
+
+    def record(self, token, name, metrics):
+        if "error" in metrics:
+            print(f"❌ Strategy test failed for {token} ({name}): {metrics['error']}")
+            return
+        strats = self.token_strats.setdefault(token, {})
+        strats[name] = metrics
+        self.results[token] = rank_strategies(strats)
+
+    # --------- Thread mode ---------
 
     def run_for_token(self, token):
         try:
-            agent = StrategyAgent(token=token)
-            agent.run()
-            return token, agent.result
+            agent = StrategyAgent()
+            agent.forecast_labels = self.labels
+            modules = {name: load_strategy_namespace(path) for name, path in strategy_files(token).items()}
+            return token, agent.evaluate_token(token, modules) if modules else {}
         except Exception as e:
             print(f"❌ Strategy run failed for {token}: {e}")
-            return token, {"error": str(e)}
+            return token, {}
 
     def run_parallel(self):
         with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
             futures = [executor.submit(self.run_for_token, token) for token in self.tokens]
             for future in concurrent.futures.as_completed(futures):
-                token, result = future.result()
-                self.results[token] = result
+                token, strats = future.result()
+                for name, metrics in strats.items():
+                    self.record(token, name, metrics)
+
+    # --------- Process mode ---------
+
+    def publish_data(self):
+        blocks, specs = [], {}
+        for token in self.tokens:
+            try:
+                shm, specs[token] = publish_frame(load_ohlcv(token))
+                blocks.append(shm)
+            except Exception as e:
+                print(f"⚠️ Skipping {token}: {e}")
+        return blocks, specs
+
+    def run_processes(self):
+        blocks, specs = self.publish_data()
+        try:
+            units = [(token, name, path) for token in specs for name, path in strategy_files(token).items()]
+            print(f"🧮 {len(units)} strategy units across {len(specs)} tokens on {MAX_PROCESSES} processes")
+            done = 0
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=MAX_PROCESSES, initializer=init_worker, initargs=(specs, self.labels)
+            ) as executor:
+                futures = [executor.submit(evaluate_unit, *unit) for unit in units]
+                for future in concurrent.futures.as_completed(futures):
+                    self.record(*future.result())
+                    done += 1
+                    if done % FLUSH_EVERY == 0:
+                        self.save_results()
+        finally:
+            release(blocks)
 
     def save_results(self):
-        os.makedirs("logs", exist_ok=True)
-        with open(STRATEGY_RESULTS_FILE, "w") as f:
-            json.dump(self.results, f, indent=2)
+        save_strategy_feedback(self.results, STRATEGY_RESULTS_FILE)
 
     def run(self):
-        print("🚀 Running Strategy Batch Runner (Parallel Mode)...")
+        print(f"🚀 Running Strategy Batch Runner ({self.mode.title()} Mode)...")
         self.load_tokens()
         if not self.tokens:
             print("⚠️ No tokens to run strategies for.")
             return
-        self.run_parallel()
+        start = time.time()
+        if self.mode == "process":
+            self.run_processes()
+        else:
+            self.run_parallel()
         self.save_results()
-        print(f"✅ Completed strategy runs for {len(self.tokens)} tokens.")
+        print(f"✅ Completed strategy runs for {len(self.results)}/{len(self.tokens)} tokens in {time.time() - start:.1f}s.")
 
 if __name__ == "__main__":
     StrategyBatchRunner().run()
@@ -4,9 +4,10 @@
 import os
 import json
 from datetime import datetime
-from agents.utils.llm import query_llm_with_fallback
+from utils.llm import query_llm_with_fallback
 from utils.strategy_tracker import get_strategy_performance
 from utils.intel_loader import load_forecast_data, load_market_conditions
+from utils.signal_contract import STRATEGY_CONTRACT_PROMPT, report_lint
 
 STRATEGY_FOLDER = "strategies"
 PERFORMANCE_FILE = "intel/performance_metrics.json"
@@ -53,11 +54,12 @@ Instructions:
 - Ensure the output begins with:
 ```python
 import pandas as pd
+import numpy as np
 class Strategy:
 
 - Must use lowercase OHLCV (open, high, low, close, volume)
 - Return only code. No explanations.
-'''
+{STRATEGY_CONTRACT_PROMPT}'''
 
     def clean_code(self, raw):
         if "class Strategy" not in raw:
@@ -70,6 +72,7 @@ class Strategy:
         path = os.path.join(STRATEGY_FOLDER, f"{token}_auto.py")
         with open(path, "w") as f:
             f.write(code)
+        report_lint(code, path)
         print(f"✅ Strategy updated: {token} → {path}")
 
     def generate_all(self):
@@ -79,7 +82,7 @@ class Strategy:
                     continue
                 stats = self.performance.get(token, {})
                 prompt = self.build_prompt(token, forecast, stats, self.market)
-                raw_code = query_llm_with_fallback(prompt)
+                raw_code = query_llm_with_fallback(prompt, site="strategy_builder")
                 code = self.clean_code(raw_code)
                 self.save_strategy(token, code)
             except Exception as e:
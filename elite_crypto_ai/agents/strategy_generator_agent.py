@@ -3,8 +3,10 @@
 import os
 import json
 from datetime import datetime
-from agents.utils.llm import query_llm_with_fallback
+from utils.llm import query_llm_with_fallback
 from utils.strategy_tracker import get_strategy_performance
+from utils.artifacts import read_artifact, write_artifact
+from utils.signal_contract import STRATEGY_CONTRACT_PROMPT, report_lint
 
 PERFORMANCE_FILE = "intel/performance_metrics.json"
 SIGNAL_INTEL_FILE = "intel/best_signals.json"
@@ -20,12 +22,8 @@ class StrategyGenerator:
         self.metadata = {}
 
     def load_data(self):
-        if os.path.exists(PERFORMANCE_FILE):
-            with open(PERFORMANCE_FILE, "r") as f:
-                self.performance = json.load(f)
-        if os.path.exists(SIGNAL_INTEL_FILE):
-            with open(SIGNAL_INTEL_FILE, "r") as f:
-                self.signal_intel = json.load(f)
+        self.performance = read_artifact(PERFORMANCE_FILE)
+        self.signal_intel = read_artifact(SIGNAL_INTEL_FILE)
 
     def generate_prompt(self, token, signals, stats):
         signal_summary = ", ".join(signals)
@@ -43,12 +41,13 @@ Requirements:
 - Design for high Sharpe, low drawdown, high hit rate
 - Use lowercase OHLCV columns (open, high, low, close, volume)
 - Return ONLY raw Python code (Strategy class)
-"""
+{STRATEGY_CONTRACT_PROMPT}"""
 
     def save_strategy(self, token, code):
         filename = os.path.join(STRATEGY_FOLDER, f"{token}_auto.py")
         with open(filename, "w") as f:
             f.write(code)
+        report_lint(code, filename)
 
     def update_metadata(self, token, signals, stats):
         self.metadata[token] = {
@@ -61,8 +60,7 @@ Requirements:
         }
 
     def save_metadata(self):
-        with open(STRATEGY_METADATA_FILE, "w") as f:
-            json.dump(self.metadata, f, indent=2)
+        write_artifact(STRATEGY_METADATA_FILE, self.metadata)
 
     def run(self):
         print("🧠 Running Strategy Generator (Signal-Aware)...")
@@ -74,7 +72,7 @@ Requirements:
                 stats = self.performance.get(token, {})
                 print(f"✨ Generating strategy for {token} using: {signals}...")
                 prompt = self.generate_prompt(token, signals, stats)
-                raw = query_llm_with_fallback(prompt)
+                raw = query_llm_with_fallback(prompt, site="strategy_generator")
                 code = "import pandas as pd\n" + raw.split("import pandas")[-1].strip()
                 self.save_strategy(token, code)
                 self.update_metadata(token, signals, stats)
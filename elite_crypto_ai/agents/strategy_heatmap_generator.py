@@ -3,9 +3,8 @@
 import os
 import json
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 from datetime import datetime
+from utils.plotting import pyplot, seaborn
 
 PERFORMANCE_LOG = "logs/strategy_feedback.json"
 OUTPUT_DIR = "logs/heatmaps"
@@ -33,6 +32,7 @@ class HeatmapGenerator:
         return pd.DataFrame(rows).set_index("token")
 
     def generate_heatmap(self, df):
+        plt, sns = pyplot(), seaborn()
         plt.figure(figsize=(12, max(6, len(df) * 0.4)))
         sns.heatmap(df, cmap="RdYlGn", annot=True, fmt=".2f", linewidths=0.5)
         plt.title("Strategy Evolution Heatmap")
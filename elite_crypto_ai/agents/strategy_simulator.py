@@ -1,11 +1,13 @@
 # ----------- FULL FILE: strategy_simulator.py (ULTRA ELITE STRATEGY TEST ENGINE + FEEDBACK + EVOLUTION FLAGS) -----------
 import os
 import json
-import pandas as pd
-import matplotlib.pyplot as plt
+from utils.backtest import backtest_matrix, signal_matrix
+from utils.plotting import pyplot
+from utils.ohlcv_store import get_ohlcv_store
+from utils.strategy_registry import get_strategy_registry
+from utils.artifacts import write_artifact
 
 STRATEGY_FOLDER = "strategies"
-DATA_FOLDER = "data"
 CHART_FOLDER = "results/charts"
 SIM_RESULTS_FILE = "intel/simulation_results.json"
 TRADE_LOG_FILE = "logs/simulation_trade_log.json"
@@ -16,47 +18,40 @@ class StrategySimulator:
         self.results = {}
         self.trade_log = []
         self.evolution_queue = []
+        self.store = get_ohlcv_store()
+        self.registry = get_strategy_registry(STRATEGY_FOLDER)
 
     def load_strategy(self, strategy_path):
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("Strategy", strategy_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return module.Strategy()
+        return self.registry.namespace(strategy_path, "Strategy")["Strategy"]()
 
     def run_backtest(self, strategy, df):
         signals = strategy.generate_signals(df.copy())
+        result = backtest_matrix(signal_matrix([signals], len(df)), df["close"].to_numpy())
         df = df.copy()
-        df["signals"] = signals
-        df["returns"] = df["close"].pct_change().fillna(0)
-        df["strategy_returns"] = df["returns"] * df["signals"]
-        df["cumulative"] = (df["strategy_returns"] + 1).cumprod()
+        df["signals"] = result["positions"][0]
+        df["returns"] = result["returns"]
+        df["strategy_returns"] = result["strategy_returns"][0]
+        df["cumulative"] = result["equity"][0]
 
         trades = df[df["signals"] != 0].copy()
+        trades["timestamp"] = trades["timestamp"].map(lambda t: t.isoformat())  # JSON-serializable trade log
         trades = trades[["timestamp", "close", "signals", "returns", "strategy_returns"]].to_dict(orient="records")
 
-        total_return = df["cumulative"].iloc[-1] - 1
-        win_rate = (df["strategy_returns"] > 0).sum() / len(df)
+        total_return = float(result["pnl"][0])
+        win_rate = float(result["hit_rate"][0])
         return df, total_return, win_rate, trades
 
     def simulate_all(self):
         os.makedirs(CHART_FOLDER, exist_ok=True)
-        for file in os.listdir(STRATEGY_FOLDER):
-            if not file.endswith(".py"):
-                continue
-
+        for file, strategy_path in self.registry.files().items():
             token = file.replace("_auto.py", "").replace(".py", "")
-            strategy_path = os.path.join(STRATEGY_FOLDER, file)
-            data_path = os.path.join(DATA_FOLDER, f"{token}.csv")
-
-            if not os.path.exists(data_path):
+            self.store.sync(token)  # same source CSV the data loader uses
+            if not self.store.has(token):
                 print(f"⚠️ Missing price data for {token}")
                 continue
 
             try:
-                df = pd.read_csv(data_path)
-                df.columns = [c.lower() for c in df.columns]
-                df = df.sort_values("timestamp")
+                df = self.store.frame(token)
                 strategy = self.load_strategy(strategy_path)
                 df_bt, ret, win, trades = self.run_backtest(strategy, df)
                 self.results[token] = {"return_pct": round(ret * 100, 2), "win_rate": round(win, 2)}
@@ -68,14 +63,12 @@ class StrategySimulator:
             except Exception as e:
                 print(f"❌ Failed to simulate {token}: {e}")
 
-        with open(SIM_RESULTS_FILE, "w") as f:
-            json.dump(self.results, f, indent=2)
-        with open(TRADE_LOG_FILE, "w") as f:
-            json.dump(self.trade_log, f, indent=2)
-        with open(EVOLUTION_QUEUE, "w") as f:
-            json.dump(self.evolution_queue, f, indent=2)
+        write_artifact(SIM_RESULTS_FILE, self.results)
+        write_artifact(TRADE_LOG_FILE, self.trade_log)  # high-volume: msgpack / compact (utils.serializers)
+        write_artifact(EVOLUTION_QUEUE, self.evolution_queue)
 
     def plot(self, df, token):
+        plt = pyplot()
         plt.figure(figsize=(10, 5))
         plt.plot(df["timestamp"], df["cumulative"], label="Equity Curve")
         plt.title(f"{token.upper()} Strategy Backtest")
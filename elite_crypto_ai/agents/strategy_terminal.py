@@ -6,6 +6,8 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 import numpy as np
+from utils.forecast_store import get_history_store
+from utils.artifacts import read_artifact
 
 # Paths
 FORECAST_FILE = "intel/forecast_signals.json"
@@ -15,7 +17,7 @@ MARKET_FILE = "intel/market_status.json"
 TRACKER_FILE = "logs/prices/forecast_price_tracker.json"
 LLM_PERFORMANCE = "intel/llm_model_performance.json"
 HEALTH_FILE = "logs/agent_health_scores.json"
-HISTORY_FILE = "logs/forecast_history.json"
+HISTORY_LIMIT = 300
 STRATEGY_META = "intel/strategy_metadata.json"
 
 # Config
@@ -25,10 +27,7 @@ st.title("🧠 Elite Strategy Intelligence Terminal")
 # Utility
 
 def safe(path):
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            return json.load(f)
-    return {}
+    return read_artifact(path)
 
 # Load all data
 data = {
@@ -39,7 +38,7 @@ data = {
     "tracker": safe(TRACKER_FILE),
     "llm": safe(LLM_PERFORMANCE),
     "health": safe(HEALTH_FILE),
-    "history": safe(HISTORY_FILE),
+    "history": get_history_store().tail(HISTORY_LIMIT),
     "metadata": safe(STRATEGY_META)
 }
 
@@ -6,6 +6,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 from utils.data_loader import load_strategy_results
+from utils.backtest import backtest_matrix, signal_matrix
 
 TRACKER_FILE = "logs/strategy_feedback.json"
 
@@ -24,31 +25,14 @@ class StrategyTracker:
         if df is None or len(df) < 5:
             return None
 
-        df = df.copy()
-        df['returns'] = df['close'].pct_change().fillna(0) * df['signal'].shift(1).fillna(0)
-        df['equity'] = (1 + df['returns']).cumprod()
-        equity_curve = df['equity']
-
-        # Sharpe Ratio
-        sharpe = np.mean(df['returns']) / (np.std(df['returns']) + 1e-8) * np.sqrt(252)
-
-        # Max Drawdown
-        peak = equity_curve.cummax()
-        drawdown = (equity_curve - peak) / peak
-        max_dd = drawdown.min()
-
-        # Hit Rate & Win/Loss
-        wins = df[df['returns'] > 0].shape[0]
-        losses = df[df['returns'] < 0].shape[0]
-        total = wins + losses
-        hit_rate = wins / total if total > 0 else 0
+        result = backtest_matrix(signal_matrix([df['signal']], len(df)), df['close'].to_numpy(dtype=float))
 
         return {
-            "sharpe": round(sharpe, 3),
-            "max_drawdown": round(max_dd, 3),
-            "hit_rate": round(hit_rate, 3),
-            "trades": int(total),
-            "gain": round(equity_curve.iloc[-1] - 1.0, 3)
+            "sharpe": round(float(result["sharpe"][0]), 3),
+            "max_drawdown": round(float(result["max_drawdown"][0]), 3),
+            "hit_rate": round(float(result["hit_rate"][0]), 3),
+            "trades": int(result["trades"][0]),
+            "gain": round(float(result["pnl"][0]), 3)
         }
 
     def scan_results(self):
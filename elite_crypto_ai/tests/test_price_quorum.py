@@ -0,0 +1,25 @@
+# tests/test_price_quorum.py — SourceStats persistence and ranking
+
+from utils.price_quorum import SourceStats, DEADLINE_SECONDS
+
+
+def test_reload_skips_null_percentiles(tmp_path):
+    path = str(tmp_path / "scores.json")
+    stats = SourceStats(path)
+    stats.record("coingecko", 0.0, False)
+    stats.record("binance", 0.2, True)
+    stats.save()
+
+    reloaded = SourceStats(path)
+    assert list(reloaded.latency["coingecko"]) == []
+    assert reloaded.rank(["coingecko", "binance"]) == ["binance", "coingecko"]
+
+
+def test_failing_source_ranks_behind_answering_ones(tmp_path):
+    stats = SourceStats(str(tmp_path / "scores.json"))
+    for _ in range(3):
+        stats.record("uniswap", 0.0, False)
+        stats.record("chainlink", 0.5, True)
+    assert stats.cost("uniswap") == DEADLINE_SECONDS * 5
+    assert stats.cost("fresh") == 0.0
+    assert stats.rank(["uniswap", "chainlink", "fresh"]) == ["fresh", "chainlink", "uniswap"]
@@ -0,0 +1,132 @@
+# utils/artifacts.py — Shared JSON Artifact Store (stat-validated in-process cache, atomic writes, change callbacks)
+
+import os
+import threading
+from utils.serializers import loads, dump_file
+
+# Returned objects are shared between every reader in the process: treat them as read-only
+# (use read_artifact(..., copy=True) to get a private copy you can mutate).
+
+
+class ArtifactStore:
+    def __init__(self):
+        self.entries = {}  # path -> {"stamp", "data", "raw" (bytes as read/written)}
+        self.versions = {}  # path -> bumps on every observed change (survives eviction of the data)
+        self.subscribers = {}  # path -> [callback(path, data)]
+        self.lock = threading.RLock()
+        self.stats = {"hits": 0, "loads": 0, "writes": 0}
+
+    def stamp(self, path):
+        # Inode is part of the stamp: an atomic rename always changes it, even within one mtime tick
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def version(self, path):
+        """Counter that changes whenever this process sees new content for `path` (0 = never seen)."""
+        self.read(path)
+        return self.versions.get(path, 0)
+
+    # --------- Reads ---------
+
+    def read(self, path, default=None, copy=False):
+        stamp = self.stamp(path)
+        if stamp is None:
+            return {} if default is None else default
+
+        changed = False
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry and entry["stamp"] == stamp:
+                self.stats["hits"] += 1
+                data = entry["data"]
+            else:
+                try:
+                    with open(path, "rb") as f:
+                        raw = f.read()
+                    data = loads(raw)  # pretty / compact JSON, msgpack, compressed: detected from the bytes
+                except (OSError, ValueError, RuntimeError) as e:
+                    # A legacy non-atomic writer mid-write: keep serving the last good copy
+                    if entry:
+                        return loads(entry["raw"]) if copy else entry["data"]
+                    print(f"⚠️ Could not read artifact {path}: {e}")
+                    return {} if default is None else default
+                self.stats["loads"] += 1
+                changed = entry is not None
+                self.remember(path, stamp, data, raw)
+
+        if changed:
+            self.notify(path, data)
+        return loads(self.entries[path]["raw"]) if copy else data
+
+    def remember(self, path, stamp, data, raw):
+        self.entries[path] = {"stamp": stamp, "data": data, "raw": raw}
+        self.versions[path] = self.versions.get(path, 0) + 1
+
+    # --------- Writes ---------
+
+    def write(self, path, data, fmt=None):
+        """Atomic replace: readers see the old file or the new one, never a partial write.
+        fmt defaults to the artifact's registered format (utils.serializers.ARTIFACT_FORMATS)."""
+        raw = dump_file(path, data, fmt)
+        # The decoded bytes are what other processes will read; cache that, not the caller's object
+        data = loads(raw)
+        with self.lock:
+            self.remember(path, self.stamp(path), data, raw)
+            self.stats["writes"] += 1
+        self.notify(path, data)
+        return path
+
+    # --------- Change notification ---------
+
+    def subscribe(self, path, callback):
+        """callback(path, data) on every change this process writes or observes on disk (see poll)."""
+        with self.lock:
+            self.subscribers.setdefault(path, []).append(callback)
+
+    def unsubscribe(self, path, callback):
+        with self.lock:
+            callbacks = self.subscribers.get(path, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def notify(self, path, data):
+        for callback in list(self.subscribers.get(path, ())):
+            try:
+                callback(path, data)
+            except Exception as e:
+                print(f"⚠️ Artifact subscriber failed for {path}: {e}")
+
+    def poll(self):
+        """Re-stat every subscribed artifact; changed ones are re-read and their subscribers called."""
+        for path in list(self.subscribers):
+            self.read(path)
+
+    def forget(self, path=None):
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(path, None)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore()
+        return _store
+
+
+def read_artifact(path, default=None, copy=False):
+    return get_artifact_store().read(path, default, copy)
+
+
+def write_artifact(path, data, fmt=None):
+    return get_artifact_store().write(path, data, fmt)
@@ -0,0 +1,77 @@
+# utils/backtest.py — Vectorized Backtest Core (strategies × bars in one NumPy pass)
+
+import numpy as np
+from utils.signal_contract import to_positions
+
+TRADING_PERIODS = 252
+SIGNAL_LAG = 1  # A signal formed on bar t is held over bar t+1's return (no look-ahead)
+
+
+def bar_returns(close):
+    close = np.asarray(close, dtype=float)
+    returns = np.zeros_like(close)
+    if len(close) > 1:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns[1:] = close[1:] / close[:-1] - 1
+    return np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def signal_matrix(signal_rows, length):
+    """Stack per-strategy outputs (contract int8 or legacy labels) into an (S, T) int8 position matrix."""
+    rows = [to_positions(row, length) for row in signal_rows]
+    return np.vstack(rows) if rows else np.zeros((0, length), dtype=np.int8)
+
+
+def backtest_matrix(signals, close, lag=SIGNAL_LAG, periods=TRADING_PERIODS):
+    """
+    Backtest S strategies over one price series at once.
+    signals: (S, T) positions (+1 long, -1 short, 0 flat; fractional sizes allowed)
+    close:   (T,) prices
+    Returns per-strategy metric arrays of shape (S,) plus the (S, T) return/equity paths.
+    """
+    signals = np.atleast_2d(np.nan_to_num(np.asarray(signals, dtype=float)))
+    returns = bar_returns(close)
+
+    positions = np.zeros_like(signals)
+    if lag:
+        positions[:, lag:] = signals[:, :-lag]
+    else:
+        positions[:] = signals
+
+    strategy_returns = positions * returns
+    equity = np.cumprod(1 + strategy_returns, axis=1)
+    peak = np.maximum.accumulate(equity, axis=1)
+
+    mean = strategy_returns.mean(axis=1)
+    std = strategy_returns.std(axis=1)
+    wins = (strategy_returns > 0).sum(axis=1)
+    losses = (strategy_returns < 0).sum(axis=1)
+    traded = wins + losses
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 1e-12, mean / std * np.sqrt(periods), 0.0)
+        drawdown = np.where(peak > 0, (peak - equity) / peak, 0.0).max(axis=1)
+        hit_rate = np.where(traded > 0, wins / traded, 0.0)
+
+    return {
+        "pnl": equity[:, -1] - 1 if equity.shape[1] else np.zeros(len(signals)),
+        "sharpe": sharpe,
+        "max_drawdown": drawdown,
+        "hit_rate": hit_rate,
+        "trades": traded,
+        "returns": returns,
+        "positions": positions,
+        "strategy_returns": strategy_returns,
+        "equity": equity,
+    }
+
+
+def metrics_row(result, i):
+    """Plain-float metrics for strategy row i, rounded the way the agents report them."""
+    return {
+        "pnl": round(float(result["pnl"][i]), 4),
+        "sharpe": round(float(result["sharpe"][i]), 3),
+        "drawdown": round(float(result["max_drawdown"][i]), 4),
+        "hit_rate": round(float(result["hit_rate"][i]), 3),
+        "trades": int(result["trades"][i]),
+    }
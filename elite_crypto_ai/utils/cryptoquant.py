@@ -2,29 +2,124 @@
 
 import os
 import json
-import requests
+import time
+import hashlib
+import threading
+import concurrent.futures
 from datetime import datetime
 
 CRYPTOQUANT_API_URL = "https://api.cryptoquant.com/v1"
 SECRETS_PATH = "secrets/cryptoquant.json"
+CACHE_DIR = "cache/cryptoquant"
+CACHE_TTL_SECONDS = 3600  # forecasting + intel runs inside the same hour share responses
+MAX_WORKERS = 8
 
-# Load API key
-with open(SECRETS_PATH, "r") as f:
-    CRYPTOQUANT_API_KEY = json.load(f).get("cryptoquant_api_key")
-
-HEADERS = {
-    "Authorization": f"Bearer {CRYPTOQUANT_API_KEY}"
+# metric name -> (endpoint, takes a symbol param)
+ENDPOINTS = {
+    "exchange_flows": ("onchain/exchange-flows/netflow", True),
+    "whale_tx": ("onchain/whales/transactions", True),
+    "miner_reserve": ("onchain/miners/reserve", True),
+    "stablecoin_ratio": ("onchain/stablecoins/exchange-reserve-ratio", False),
 }
 
+
+class CryptoQuantClient:
+    def __init__(self, secrets_path=SECRETS_PATH, cache_dir=CACHE_DIR, ttl=CACHE_TTL_SECONDS):
+        self.secrets_path = secrets_path
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.api_key = None
+        self.lock = threading.Lock()
+
+    # --------- Credentials (read on first request, not at import) ---------
+
+    def load_key(self):
+        with self.lock:
+            if self.api_key is None:
+                key = os.getenv("CRYPTOQUANT_API_KEY")
+                if not key:
+                    with open(self.secrets_path, "r") as f:
+                        key = json.load(f).get("cryptoquant_api_key")
+                self.api_key = key
+            return self.api_key
+
+    def headers(self):
+        return {"Authorization": f"Bearer {self.load_key()}"}
+
+    # --------- Disk TTL cache ---------
+
+    def cache_path(self, endpoint, params):
+        key = json.dumps([endpoint, params or {}], sort_keys=True)
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def cache_get(self, endpoint, params):
+        path = self.cache_path(endpoint, params)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, "r") as f:
+                return json.load(f)["data"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def cache_put(self, endpoint, params, data):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.cache_path(endpoint, params)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"endpoint": endpoint, "params": params, "fetched_at": time.time(), "data": data}, f)
+        os.replace(tmp, path)
+
+    # --------- Requests ---------
+
+    def fetch(self, endpoint, params=None):
+        cached = self.cache_get(endpoint, params)
+        if cached is not None:
+            return cached
+        try:
+            from utils.http import get_json  # requests loads on the first uncached fetch
+            data = get_json("cryptoquant", f"{CRYPTOQUANT_API_URL}/{endpoint}", params=params, headers=self.headers())
+        except Exception as e:
+            print(f"❌ CryptoQuant fetch error ({endpoint}): {e}")
+            return None
+        self.cache_put(endpoint, params, data)
+        return data
+
+    def metrics_matrix(self, assets):
+        """{asset: metrics} for every asset; each distinct (endpoint, params) is requested once, concurrently."""
+        jobs = {}
+        for asset in assets:
+            for metric, (endpoint, per_asset) in ENDPOINTS.items():
+                params = {"symbol": asset} if per_asset else {}
+                jobs.setdefault((endpoint, json.dumps(params, sort_keys=True)), params)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {key: executor.submit(self.fetch, key[0], params) for key, params in jobs.items()}
+            results = {key: future.result() for key, future in futures.items()}
+
+        timestamp = datetime.utcnow().isoformat()
+        out = {}
+        for asset in assets:
+            metrics = {"timestamp": timestamp, "asset": asset}
+            for metric, (endpoint, per_asset) in ENDPOINTS.items():
+                params = {"symbol": asset} if per_asset else {}
+                metrics[metric] = results[(endpoint, json.dumps(params, sort_keys=True))]
+            out[asset] = metrics
+        return out
+
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = CryptoQuantClient()
+    return _client
+
+
 def fetch(endpoint, params=None):
-    url = f"{CRYPTOQUANT_API_URL}/{endpoint}"
-    try:
-        res = requests.get(url, headers=HEADERS, params=params, timeout=10)
-        res.raise_for_status()
-        return res.json()
-    except Exception as e:
-        print(f"❌ CryptoQuant fetch error ({endpoint}): {e}")
-        return None
+    return get_client().fetch(endpoint, params)
 
 # --------- METRIC WRAPPERS ---------
 
@@ -43,20 +138,32 @@ def get_stablecoin_ratio():
 # --------- BATCH WRAPPER ---------
 
 def get_all_metrics(asset="btc"):
+    return get_client().metrics_matrix([asset])[asset]
+
+def get_all_metrics_batch(assets):
+    return get_client().metrics_matrix(list(assets))
+
+def result_rows(payload):
+    return (payload or {}).get("result", []) or []
+
+def get_cryptoquant_metrics(token):
+    # Prompt-ready summary of the raw endpoint payloads
+    data = get_all_metrics(token.lower())
+    flows = result_rows(data["exchange_flows"])
+    miners = result_rows(data["miner_reserve"])
+    stable = result_rows(data["stablecoin_ratio"])
     return {
-        "timestamp": datetime.utcnow().isoformat(),
-        "asset": asset,
-        "exchange_flows": get_exchange_flow(asset),
-        "whale_tx": get_whale_tx(asset),
-        "miner_reserve": get_miner_reserve(asset),
-        "stablecoin_ratio": get_stablecoin_ratio()
+        "exchange_flows": flows[-1].get("value") if flows else None,
+        "miner_outflows": miners[-1]["value"] - miners[-2]["value"] if len(miners) >= 2 else None,
+        "stablecoin_inflows": stable[-1].get("value") if stable else None,
+        "whale_activity": len(result_rows(data["whale_tx"])),
     }
 
 # --------- Save Daily Cache ---------
 
-def save_metrics(asset="btc", output_folder="intel/metrics"):
+def save_metrics(asset="btc", output_folder="intel/metrics", metrics=None):
     os.makedirs(output_folder, exist_ok=True)
-    metrics = get_all_metrics(asset)
+    metrics = metrics or get_all_metrics(asset)
     filename = f"{output_folder}/{asset}_metrics.json"
     with open(filename, "w") as f:
         json.dump(metrics, f, indent=2)
@@ -64,5 +171,5 @@ def save_metrics(asset="btc", output_folder="intel/metrics"):
 
 # ✅ Test
 if __name__ == "__main__":
-    for coin in ["btc", "eth", "sol", "matic", "link"]:
-        save_metrics(coin)
+    for coin, metrics in get_all_metrics_batch(["btc", "eth", "sol", "matic", "link"]).items():
+        save_metrics(coin, metrics=metrics)
@@ -1,16 +1,29 @@
 # utils/data_loader.py
 
-import os
 import pandas as pd
+from utils.ohlcv_store import get_ohlcv_store
 
-def load_price_data(symbol):
-    path = f"data/ohlcv/{symbol.lower()}.csv"
-    if not os.path.exists(path):
+# CSVs under data/ohlcv are imported once into the columnar store; later loads are memory-mapped
+
+def load_price_data(symbol, start=None, end=None):
+    store = get_ohlcv_store()
+    store.sync(symbol)
+    if not store.has(symbol):
         return pd.DataFrame()
-    df = pd.read_csv(path)
-    df.columns = [c.lower() for c in df.columns]
-    return df
+    return store.frame(symbol, start, end)
+
+def load_price_arrays(symbol, start=None, end=None, columns=None):
+    store = get_ohlcv_store()
+    store.sync(symbol)
+    return store.arrays(symbol, start, end, columns)
 
 def load_all_price_data():
-    folder = "data/ohlcv"
-    return {f[:-4]: load_price_data(f[:-4]) for f in os.listdir(folder) if f.endswith(".csv")}  
+    store = get_ohlcv_store()
+    store.import_folder()
+    return {symbol: store.frame(symbol) for symbol in store.symbols()}
+
+def load_ohlcv(symbol, start=None, end=None):
+    df = load_price_data(symbol, start, end)
+    if df.empty:
+        raise FileNotFoundError(f"No OHLCV data for {symbol}")
+    return df
@@ -0,0 +1,153 @@
+# utils/forecast_aggregates.py — Incremental Model/Token Accuracy Aggregates with High-Water Marks
+
+import os
+import json
+from datetime import datetime, timedelta
+from utils.forecast_store import get_history_store
+from utils.forecast_resolution import forecasts_frame, resolve_forecasts
+from utils.serializers import load_file, dump_file, artifact_format
+
+AGGREGATE_FILE = "intel/forecast_aggregates.json"
+BUCKET_RETENTION_DAYS = 30  # Daily buckets kept for rolling windows (longest window served)
+
+# Accumulator layout: running sums + per-day buckets [count, score_sum, hit_sum, roi_sum]
+FIELDS = ("count", "score_sum", "hit_sum", "conf_sum", "roi_sum")
+
+
+def empty_acc():
+    acc = {field: 0 for field in FIELDS}
+    acc["buckets"] = {}
+    return acc
+
+
+class ForecastAggregates:
+    """
+    Persisted running sums per model, per token and per token×model. Each refresh folds in only
+    forecasts resolved after the token's high-water mark, so cost tracks new data, not history.
+    """
+
+    def __init__(self, path=AGGREGATE_FILE):
+        self.path = path
+        self.state = {
+            "token_watermarks": {},
+            "model_watermarks": {},
+            "consumer_watermarks": {},
+            "models": {},
+            "tokens": {},
+            "token_models": {},
+        }
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.path):
+            self.state.update(load_file(self.path))
+
+    def save(self):
+        dump_file(self.path, self.state, artifact_format(AGGREGATE_FILE))
+
+    # --------- Folding ---------
+
+    def pending_frame(self, store):
+        # Each token is read from its watermark on; the watermark row itself only anchors resolution
+        entries = []
+        for token in store.tokens():
+            chunk = store.query(token=token, since=self.state["token_watermarks"].get(token))
+            if len(chunk) > 1:
+                entries.extend(chunk)
+        return resolve_forecasts(forecasts_frame(entries))
+
+    def fold(self, resolved, now=None):
+        """Fold resolved rows (token, model, timestamp, score, hit, confidence, roi) past the watermarks."""
+        if resolved.empty:
+            return 0
+        marks = self.state["token_watermarks"]
+        rows = resolved[resolved.resolved] if "resolved" in resolved else resolved
+        iso = rows.timestamp.map(lambda t: t.isoformat())
+        fresh = rows[[ts > marks.get(tok, "") for tok, ts in zip(rows.token, iso)]].copy()
+        if fresh.empty:
+            return 0
+        fresh["iso"] = iso[fresh.index]
+        fresh["day"] = fresh.timestamp.dt.strftime("%Y-%m-%d")
+
+        targets = [
+            (self.state["models"], ["model"]),
+            (self.state["tokens"], ["token"]),
+            (self.state["token_models"], ["token", "model"]),
+        ]
+        for target, keys in targets:
+            for key, group in fresh.groupby(keys + ["day"]):
+                *path, day = key
+                acc = target
+                for part in path[:-1]:
+                    acc = acc.setdefault(part, {})
+                acc = acc.setdefault(path[-1], empty_acc())
+                acc["count"] += len(group)
+                acc["score_sum"] += float(group.score.sum())
+                acc["hit_sum"] += int(group.hit.sum())
+                acc["conf_sum"] += float(group.confidence.sum())
+                acc["roi_sum"] += float(group.roi.sum())
+                bucket = acc["buckets"].setdefault(day, [0, 0.0, 0, 0.0])
+                bucket[0] += len(group)
+                bucket[1] += float(group.score.sum())
+                bucket[2] += int(group.hit.sum())
+                bucket[3] += float(group.roi.sum())
+
+        for token, ts in fresh.groupby("token").iso.max().items():
+            marks[token] = max(marks.get(token, ""), ts)
+        model_marks = self.state["model_watermarks"]
+        for model, ts in fresh.groupby("model").iso.max().items():
+            model_marks[model] = max(model_marks.get(model, ""), ts)
+
+        self.prune(now)
+        return len(fresh)
+
+    def prune(self, now=None):
+        cutoff = ((now or datetime.utcnow()) - timedelta(days=BUCKET_RETENTION_DAYS)).strftime("%Y-%m-%d")
+        for acc in self.iter_accs():
+            acc["buckets"] = {day: b for day, b in acc["buckets"].items() if day >= cutoff}
+
+    def iter_accs(self):
+        yield from self.state["models"].values()
+        yield from self.state["tokens"].values()
+        for models in self.state["token_models"].values():
+            yield from models.values()
+
+    def refresh(self, store=None):
+        folded = self.fold(self.pending_frame(store or get_history_store()))
+        if folded:
+            self.save()
+        return folded
+
+    # --------- Reads ---------
+
+    def window(self, acc, days, now=None):
+        cutoff = ((now or datetime.utcnow()) - timedelta(days=days)).strftime("%Y-%m-%d")
+        count = score = hits = roi = 0
+        for day, (c, s, h, r) in acc["buckets"].items():
+            if day >= cutoff:
+                count, score, hits, roi = count + c, score + s, hits + h, roi + r
+        return {"count": count, "score_sum": score, "hit_sum": hits, "roi_sum": roi}
+
+    def summary(self, acc):
+        n = acc["count"] or 1
+        accuracy = acc["score_sum"] / n
+        avg_conf = acc["conf_sum"] / n
+        return {
+            "count": acc["count"],
+            "accuracy": accuracy,
+            "hit_rate": acc["hit_sum"] / n,
+            "avg_confidence": avg_conf,
+            "confidence_drift": avg_conf - accuracy,
+            "avg_roi": acc["roi_sum"] / n,
+        }
+
+    def model_summary(self, model):
+        return self.summary(self.state["models"].get(model, empty_acc()))
+
+    # --------- Downstream consumers ---------
+
+    def consumer_watermark(self, consumer, key):
+        return self.state["consumer_watermarks"].get(consumer, {}).get(key, "")
+
+    def set_consumer_watermark(self, consumer, key, value):
+        self.state["consumer_watermarks"].setdefault(consumer, {})[key] = value
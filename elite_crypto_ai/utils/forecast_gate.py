@@ -0,0 +1,123 @@
+# utils/forecast_gate.py — Forecast Delta-Gating (input fingerprints, epsilon change threshold, reuse with age stamp)
+
+import copy
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from utils.artifacts import read_artifact, write_artifact
+
+FINGERPRINT_FILE = "logs/forecast_fingerprints.json"
+GATE_ENABLED = True
+GATE_EPSILON = 0.1  # max relative move per feature before a token is re-forecast
+GATE_MAX_AGE_SECONDS = 4 * 3600  # reuse is never older than this, however flat the inputs
+
+# Absolute floor for the relative test, so small values near zero don't count as big moves
+FEATURE_FLOORS = {
+    "price_change": 0.01,
+    "trends": 0.1,
+    "sentiment": 0.1,
+    "exchange_flows": 1.0,
+    "miner_outflows": 1.0,
+    "stablecoin_inflows": 0.01,
+    "whale_activity": 2.0,
+}
+DEFAULT_FLOOR = 0.05
+
+
+def numeric(value):
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+def feature_vector(signals):
+    """Flatten (price_signal, trend, sentiment, cryptoquant) into {feature: float | None}."""
+    price_signal, trend_score, sentiment_score, cq = signals
+    features = {}
+    if isinstance(price_signal, dict):
+        for key, value in price_signal.items():
+            if key != "price":  # the level drifts every tick; momentum is what the forecaster reads
+                features[f"price_{key}"] = numeric(value)
+    else:
+        features["price_change"] = numeric(price_signal)
+    features["trends"] = numeric(trend_score)
+    features["sentiment"] = numeric(sentiment_score)
+    for key, value in (cq or {}).items():
+        features[key] = numeric(value)
+    return features
+
+
+def fingerprint(features, model, meta=None):
+    payload = json.dumps({"f": features, "m": model, "meta": meta or {}}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def feature_moved(name, old, new, epsilon=GATE_EPSILON):
+    if old is None or new is None:
+        return old is not new
+    floor = FEATURE_FLOORS.get(name, DEFAULT_FLOOR)
+    return abs(new - old) > epsilon * max(abs(old), floor)
+
+
+class ForecastGate:
+    def __init__(self, path=FINGERPRINT_FILE, epsilon=GATE_EPSILON, max_age=GATE_MAX_AGE_SECONDS, enabled=GATE_ENABLED):
+        self.path = path
+        self.epsilon = epsilon
+        self.max_age = max_age
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.records = read_artifact(path, copy=True)  # token -> last fresh forecast + its inputs
+        self.stats = {"reused": 0, "moved": 0}
+
+    def moved(self, record, features, model, meta):
+        if record.get("model") != model or record.get("meta") != (meta or {}):
+            return "routing changed"
+        if time.time() - record.get("created", 0) > self.max_age:
+            return "stale"
+        old = record.get("features", {})
+        if set(old) != set(features):
+            return "inputs changed shape"
+        for name, value in features.items():
+            if feature_moved(name, old[name], value, self.epsilon):
+                return name
+        return None
+
+    def check(self, token, features, model, meta=None):
+        """Copy of the token's last forecast, age-stamped, if its inputs haven't materially moved; else None."""
+        if not self.enabled:
+            return None
+        with self.lock:
+            record = self.records.get(token)
+            reason = "new token" if record is None else self.moved(record, features, model, meta)
+            if reason:
+                self.stats["moved"] += 1
+                return None
+            self.stats["reused"] += 1
+            forecast = copy.deepcopy(record["forecast"])
+        forecast["reused"] = True
+        forecast["forecasted_at"] = record["timestamp"]
+        forecast["forecast_age_seconds"] = int(time.time() - record["created"])
+        return forecast
+
+    def remember(self, token, features, model, meta, forecast):
+        if features is None:
+            return
+        now = time.time()
+        with self.lock:
+            self.records[token] = {
+                "fingerprint": fingerprint(features, model, meta),
+                "features": features,
+                "model": model,
+                "meta": meta or {},
+                "forecast": forecast,
+                "timestamp": datetime.utcfromtimestamp(now).isoformat(),
+                "created": now,
+            }
+
+    def save(self):
+        with self.lock:
+            write_artifact(self.path, self.records)
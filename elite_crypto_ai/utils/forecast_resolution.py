@@ -0,0 +1,77 @@
+# utils/forecast_resolution.py — Vectorized Forecast Resolution (next price, pct change, hit score)
+
+import numpy as np
+import pandas as pd
+
+# Scoring weights
+FULL_HIT = 1.0
+PARTIAL_HIT = 0.5
+MISS = 0.0
+MOVE_THRESHOLD = 0.01  # |pct change| below this counts as a flat market
+
+
+def parse_times(values):
+    """ISO timestamps of any precision (isoformat() drops zero microseconds) -> naive UTC; unparseable -> NaT."""
+    times = pd.to_datetime(pd.Series(values, dtype=object), format="ISO8601", utc=True, errors="coerce")
+    return times.dt.tz_localize(None)
+
+
+def forecasts_frame(history):
+    """Flatten forecast history entries into one row per forecast."""
+    if not history:
+        return pd.DataFrame(columns=["token", "timestamp", "model", "label", "confidence", "rationale", "price"])
+    forecasts = [e.get("forecast") or {} for e in history]
+    df = pd.DataFrame({
+        "token": [e.get("token") for e in history],
+        "timestamp": parse_times([e.get("timestamp") for e in history]),
+        "model": [(f.get("model_used") or "unknown").lower() for f in forecasts],
+        "label": [(f.get("forecast_label") or "neutral").lower() for f in forecasts],
+        "confidence": [f.get("confidence_score", 0) for f in forecasts],
+        "rationale": [f.get("rationale", "") for f in forecasts],
+        "price": [e.get("entry_price", e.get("price", 0)) for e in history],
+    })
+    df = df.dropna(subset=["timestamp"]).reset_index(drop=True)
+    df["confidence"] = pd.to_numeric(df["confidence"], errors="coerce").fillna(0.0)
+    df["price"] = pd.to_numeric(df["price"], errors="coerce").fillna(0.0)
+    return df
+
+
+def resolve_forecasts(df, threshold=MOVE_THRESHOLD):
+    """
+    Attach the first strictly-later price for the same token to every forecast,
+    plus pct_change, roi, graded score (FULL/PARTIAL/MISS) and boolean hit, in one pass.
+    Forecasts with no later observation keep resolved=False.
+    """
+    df = df.sort_values(["token", "timestamp"], kind="mergesort").reset_index(drop=True)
+    if df.empty:
+        for col in ("future_price", "pct_change", "roi", "score"):
+            df[col] = pd.Series(dtype=float)
+        df["hit"] = pd.Series(dtype=bool)
+        df["resolved"] = pd.Series(dtype=bool)
+        return df
+
+    # Collapse same-timestamp rows so a forecast never resolves against its own tick
+    ticks = df.groupby(["token", "timestamp"], sort=True)["price"].first().reset_index()
+    ticks["future_price"] = ticks.groupby("token")["price"].shift(-1)
+    df = df.merge(ticks[["token", "timestamp", "future_price"]], on=["token", "timestamp"], how="left")
+
+    price = df["price"].to_numpy(dtype=float)
+    future = df["future_price"].to_numpy(dtype=float)
+    resolved = ~np.isnan(future)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(resolved & (price != 0), (future - price) / price, 0.0)
+
+    label = df["label"].to_numpy()
+    bullish, bearish, neutral = label == "bullish", label == "bearish", label == "neutral"
+    up, down, flat = pct > threshold, pct < -threshold, np.abs(pct) < threshold
+
+    df["pct_change"] = pct
+    df["roi"] = pct * 100
+    df["score"] = np.select(
+        [flat, up, down],
+        [np.where(neutral, PARTIAL_HIT, MISS), np.where(bullish, FULL_HIT, MISS), np.where(bearish, FULL_HIT, MISS)],
+        default=MISS,
+    )
+    df["hit"] = (bullish & up) | (bearish & down) | (neutral & (np.abs(pct) <= threshold))
+    df["resolved"] = resolved
+    return df
@@ -0,0 +1,320 @@
+# utils/forecast_store.py — Append-Only, Segmented + Indexed Forecast History
+
+import os
+import json
+import bisect
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from utils.serializers import compress, decompress, COLD_CODEC
+
+STORE_DIR = "logs/forecast_history"
+LEGACY_HISTORY_FILE = "logs/forecast_history.json"
+MANIFEST_FILE = "manifest.json"
+SEGMENT_MAX_ENTRIES = 5000
+COMPRESS_SEALED = True  # sealed segments are cold: keep them as one zstd (or gzip) blob
+COLD_CACHE_SEGMENTS = 4  # decompressed sealed segments kept in memory
+
+# Layout (one pair per segment, only the newest segment is ever appended to):
+#   seg_000001.jsonl  one forecast entry per line
+#   seg_000001.idx    one [token, model, timestamp, offset, length] row per entry
+#   seg_000001.jsonl.z  a sealed segment once compressed (offsets still index the decompressed bytes)
+#   manifest.json     sealed segment ranges + token sets, rewritten only on roll-over
+
+
+def entry_model(entry):
+    return (entry.get("forecast", {}).get("model_used") or "unknown").lower()
+
+
+def to_iso(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+class ForecastHistoryStore:
+    def __init__(self, root=STORE_DIR, segment_size=SEGMENT_MAX_ENTRIES):
+        self.root = root
+        self.segment_size = segment_size
+        self.lock = threading.RLock()
+        self.manifest = None
+        self.manifest_mtime = None
+        self.index = {}  # segment id -> list of idx rows
+        self.index_bytes = {}  # segment id -> bytes of .idx already loaded
+        self.by_token = None  # token -> [(timestamp, segment id, offset, length, model)], built on first token query
+        self.cold = OrderedDict()  # segment id -> decompressed bytes of a compressed sealed segment
+
+    # --------- Layout ---------
+
+    def segment_path(self, seg_id, ext):
+        return os.path.join(self.root, f"seg_{seg_id:06d}.{ext}")
+
+    def load_manifest(self):
+        # Re-read only when another process has rolled a segment over
+        path = os.path.join(self.root, MANIFEST_FILE)
+        mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        if self.manifest is not None and mtime == self.manifest_mtime:
+            return self.manifest
+        if mtime is not None:
+            with open(path, "r") as f:
+                self.manifest = json.load(f)
+        elif self.manifest is None:
+            self.manifest = {"active": 1, "segments": []}
+        self.manifest_mtime = mtime
+        return self.manifest
+
+    def save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, MANIFEST_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, path)
+        self.manifest_mtime = os.stat(path).st_mtime_ns
+
+    def load_index(self, seg_id):
+        # Sealed segments are immutable; the active one is tailed from where we last stopped
+        path = self.segment_path(seg_id, "idx")
+        rows = self.index.setdefault(seg_id, [])
+        if not os.path.exists(path):
+            return rows
+        size = os.path.getsize(path)
+        loaded = self.index_bytes.get(seg_id, 0)
+        if size > loaded:
+            with open(path, "rb") as f:
+                f.seek(loaded)
+                chunk = f.read()
+            complete = chunk[:chunk.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                if line.strip():
+                    self.index_row(seg_id, json.loads(line))
+            self.index_bytes[seg_id] = loaded + len(complete)
+        return rows
+
+    def index_row(self, seg_id, row):
+        self.index.setdefault(seg_id, []).append(row)
+        if self.by_token is None:
+            return
+        rows = self.by_token.setdefault(row[0], [])
+        key = (row[2], seg_id, row[3], row[4], row[1])
+        if rows and rows[-1] > key:
+            bisect.insort(rows, key)
+        else:
+            rows.append(key)
+
+    def segment_ids(self):
+        manifest = self.load_manifest()
+        return [seg["id"] for seg in manifest["segments"]] + [manifest["active"]]
+
+    def ensure_token_index(self):
+        if self.by_token is not None:
+            # Pick up rows other processes appended since the last query
+            for seg_id in self.segment_ids():
+                self.load_index(seg_id)
+            return
+        by_token = {}
+        for seg_id in self.segment_ids():
+            for row in self.load_index(seg_id):
+                by_token.setdefault(row[0], []).append((row[2], seg_id, row[3], row[4], row[1]))
+        for rows in by_token.values():
+            rows.sort()
+        self.by_token = by_token
+
+    def seal_active(self):
+        manifest = self.load_manifest()
+        seg_id = manifest["active"]
+        rows = self.load_index(seg_id)
+        if rows:
+            manifest["segments"].append({
+                "id": seg_id,
+                "count": len(rows),
+                "start": min(r[2] for r in rows),
+                "end": max(r[2] for r in rows),
+                "tokens": sorted({r[0] for r in rows}),
+            })
+        manifest["active"] = seg_id + 1
+        self.save_manifest()
+        if COMPRESS_SEALED:
+            self.compress_sealed()
+
+    def compress_sealed(self):
+        """Compress every sealed segment still stored as plain JSONL. Returns the number compressed."""
+        done = 0
+        with self.lock:
+            manifest = self.load_manifest()
+            for seg in manifest["segments"]:
+                plain = self.segment_path(seg["id"], "jsonl")
+                if seg.get("codec") or not os.path.exists(plain):
+                    continue
+                with open(plain, "rb") as f:
+                    raw = f.read()
+                cold = self.segment_path(seg["id"], "jsonl.z")
+                with open(cold + ".tmp", "wb") as f:
+                    f.write(compress(raw, COLD_CODEC))
+                os.replace(cold + ".tmp", cold)
+                seg["codec"] = COLD_CODEC
+                seg["bytes"] = len(raw)
+                done += 1
+            if done:
+                self.save_manifest()
+                # Plain files go only after the manifest points readers at the compressed copies
+                for seg in manifest["segments"]:
+                    plain = self.segment_path(seg["id"], "jsonl")
+                    if seg.get("codec") and os.path.exists(plain):
+                        os.remove(plain)
+        return done
+
+    # --------- Writes ---------
+
+    def append(self, entry):
+        with self.lock:
+            manifest = self.load_manifest()
+            if len(self.load_index(manifest["active"])) >= self.segment_size:
+                self.seal_active()
+            seg_id = manifest["active"]
+            os.makedirs(self.root, exist_ok=True)
+
+            line = (json.dumps(entry, separators=(",", ":")) + "\n").encode()
+            with open(self.segment_path(seg_id, "jsonl"), "ab") as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                f.write(line)
+
+            row = [entry["token"], entry_model(entry), to_iso(entry["timestamp"]), offset, len(line)]
+            row_line = (json.dumps(row) + "\n").encode()
+            with open(self.segment_path(seg_id, "idx"), "ab") as f:
+                f.write(row_line)
+            self.index_row(seg_id, row)
+            self.index_bytes[seg_id] = self.index_bytes.get(seg_id, 0) + len(row_line)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    # --------- Reads ---------
+
+    def candidate_segments(self, token=None, since=None, until=None):
+        manifest = self.load_manifest()
+        for seg in manifest["segments"]:
+            if token is not None and token not in seg["tokens"]:
+                continue
+            if since is not None and seg["end"] < since:
+                continue
+            if until is not None and seg["start"] > until:
+                continue
+            yield seg["id"]
+        yield manifest["active"]
+
+    def lookup(self, token=None, model=None, since=None, until=None):
+        since, until = to_iso(since), to_iso(until)
+        model = model.lower() if model else None
+        hits = []
+        with self.lock:
+            if token is not None:
+                return self.lookup_token(token, model, since, until)
+            for seg_id in self.candidate_segments(token, since, until):
+                for row in self.load_index(seg_id):
+                    if token is not None and row[0] != token:
+                        continue
+                    if model is not None and row[1] != model:
+                        continue
+                    if since is not None and row[2] < since:
+                        continue
+                    if until is not None and row[2] > until:
+                        continue
+                    hits.append((row[2], seg_id, row[3], row[4]))
+        hits.sort()
+        return hits
+
+    def lookup_token(self, token, model, since, until):
+        # (token, timestamp) index: bisect to the range, then filter the model in place
+        self.ensure_token_index()
+        rows = self.by_token.get(token, [])
+        lo = bisect.bisect_left(rows, since, key=lambda r: r[0]) if since is not None else 0
+        hi = bisect.bisect_right(rows, until, key=lambda r: r[0]) if until is not None else len(rows)
+        return [(r[0], r[1], r[2], r[3]) for r in rows[lo:hi] if model is None or r[4] == model]
+
+    def cold_bytes(self, seg_id):
+        # Decompressed sealed segment (None while the segment is still plain JSONL)
+        with self.lock:
+            if seg_id in self.cold:
+                self.cold.move_to_end(seg_id)
+                return self.cold[seg_id]
+            path = self.segment_path(seg_id, "jsonl.z")
+            if not os.path.exists(path):
+                return None
+            with open(path, "rb") as f:
+                raw = decompress(f.read())
+            self.cold[seg_id] = raw
+            while len(self.cold) > COLD_CACHE_SEGMENTS:
+                self.cold.popitem(last=False)
+            return raw
+
+    def read_rows(self, hits):
+        by_segment = {}
+        for i, (_, seg_id, offset, length) in enumerate(hits):
+            by_segment.setdefault(seg_id, []).append((i, offset, length))
+        out = [None] * len(hits)
+        for seg_id, rows in by_segment.items():
+            raw = self.cold_bytes(seg_id)
+            if raw is not None:
+                for i, offset, length in rows:
+                    out[i] = json.loads(raw[offset:offset + length])
+                continue
+            with open(self.segment_path(seg_id, "jsonl"), "rb") as f:
+                for i, offset, length in sorted(rows, key=lambda r: r[1]):
+                    f.seek(offset)
+                    out[i] = json.loads(f.read(length))
+        return out
+
+    def query(self, token=None, model=None, since=None, until=None, limit=None):
+        """Entries matching the filters, oldest first. `limit` keeps the most recent N."""
+        hits = self.lookup(token, model, since, until)
+        if limit is not None:
+            hits = hits[-limit:] if limit > 0 else []
+        return self.read_rows(hits)
+
+    def tail(self, n, token=None, model=None):
+        return self.query(token=token, model=model, limit=n)
+
+    def tokens(self):
+        with self.lock:
+            found = set()
+            for seg in self.load_manifest()["segments"]:
+                found.update(seg["tokens"])
+            found.update(r[0] for r in self.load_index(self.load_manifest()["active"]))
+            return sorted(found)
+
+    def count(self):
+        with self.lock:
+            manifest = self.load_manifest()
+            return sum(s["count"] for s in manifest["segments"]) + len(self.load_index(manifest["active"]))
+
+    # --------- Legacy import ---------
+
+    def migrate_legacy(self, path=LEGACY_HISTORY_FILE):
+        with self.lock:
+            manifest = self.load_manifest()
+            if manifest.get("migrated_from") or not os.path.exists(path) or self.count():
+                return 0
+            with open(path, "r") as f:
+                legacy = json.load(f)
+            legacy.sort(key=lambda e: e.get("timestamp", ""))
+            self.extend(legacy)
+            manifest["migrated_from"] = path
+            self.save_manifest()
+            print(f"✅ Imported {len(legacy)} legacy forecasts from {path}")
+            return len(legacy)
+
+
+_store = None
+
+
+def get_history_store():
+    global _store
+    if _store is None:
+        _store = ForecastHistoryStore()
+        _store.migrate_legacy()
+    return _store
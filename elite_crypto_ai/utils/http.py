@@ -0,0 +1,48 @@
+# utils/http.py — Pooled Keep-Alive HTTP Sessions (one per upstream, shared by every caller)
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32  # >= worker threads that may hit one upstream at once
+DEFAULT_TIMEOUT = 10
+RETRY_TOTAL = 2
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_sessions = {}
+_lock = threading.Lock()
+
+
+def build_session():
+    retry = Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF, status_forcelist=RETRY_STATUSES,
+                  allowed_methods=("GET", "POST"), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept": "application/json", "User-Agent": "elite-crypto-ai"})
+    return session
+
+
+def get_session(name):
+    """Shared session for an upstream (e.g. "coingecko"); connections stay open between calls."""
+    with _lock:
+        if name not in _sessions:
+            _sessions[name] = build_session()
+        return _sessions[name]
+
+
+def get_json(name, url, params=None, headers=None, timeout=DEFAULT_TIMEOUT):
+    response = get_session(name).get(url, params=params, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def close_sessions():
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,155 @@
+# utils/import_profiler.py — Cold-Import Cost per Agent Module (python -X importtime) + Startup Benchmark
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+IMPORT_LOG = "logs/import_times.json"
+AGENT_DIR = "agents"
+BENCH_REPEATS = 5  # fresh interpreters per module; the fastest run is reported
+REGRESSION_TOLERANCE = 0.25  # slower than baseline by more than this → flagged
+REGRESSION_FLOOR_MS = 20  # ignore noise on modules that import in a few ms
+TOP_PACKAGES = 5
+# Streamlit apps execute their whole page at import; profile them with `streamlit run` instead
+SKIP_MODULES = {"dashboard_agent", "strategy_terminal", "agent_runtime", "sequence_agent"}
+
+
+def agent_modules(folder=AGENT_DIR):
+    names = sorted(os.path.splitext(f)[0] for f in os.listdir(folder) if f.endswith(".py") and " " not in f)
+    return [f"agents.{name}" for name in names if name not in SKIP_MODULES]
+
+
+def parse_importtime(stderr):
+    """[(depth, name, self_us, cumulative_us)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        raw = parts[2][1:]
+        depth = (len(raw) - len(raw.lstrip(" "))) // 2
+        try:
+            rows.append((depth, raw.strip(), int(parts[0]), int(parts[1])))
+        except ValueError:
+            continue
+    return rows
+
+
+def interpreter_modules():
+    # Modules the bare interpreter already loads (site, encodings, ...) are not charged to agents
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True)
+    return {name for _, name, _, _ in parse_importtime(result.stderr)}
+
+
+def profile_module(module, baseline=()):
+    """Cold import of one module in a fresh interpreter → {"ms", "packages": {top-level package: ms}} or {"error"}."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True)
+    rows = [r for r in parse_importtime(result.stderr) if r[1] not in baseline]
+    if result.returncode != 0:
+        lines = [l for l in result.stderr.splitlines() if l and not l.startswith("import time:")]
+        return {"error": lines[-1] if lines else f"exit code {result.returncode}"}
+
+    top_depth = min((r[0] for r in rows), default=0)
+    total_us = sum(cumulative for depth, _, _, cumulative in rows if depth == top_depth)
+    packages = {}
+    for depth, name, _, cumulative in rows:
+        root = name.split(".")[0]
+        if root == module.split(".")[0]:
+            continue
+        packages[root] = max(packages.get(root, 0), cumulative)
+    heavy = sorted(packages.items(), key=lambda kv: -kv[1])[:TOP_PACKAGES]
+    return {"ms": round(total_us / 1000, 1), "packages": {name: round(us / 1000, 1) for name, us in heavy}}
+
+
+def benchmark_module(module, repeats=BENCH_REPEATS):
+    """Wall-clock startup (interpreter + import), best of `repeats` fresh processes, in ms."""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", f"import {module}"], capture_output=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            return None
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 1)
+
+
+def load_log(path=IMPORT_LOG):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_log(log, path=IMPORT_LOG):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(log, f, indent=2)
+    os.replace(tmp, path)
+
+
+def regressions(current, baseline):
+    flagged = {}
+    for module, entry in current.items():
+        before = baseline.get(module, {})
+        for key in ("ms", "startup_ms"):
+            now, then = entry.get(key), before.get(key)
+            if now is None or then is None:
+                continue
+            if now - then > REGRESSION_FLOOR_MS and now > then * (1 + REGRESSION_TOLERANCE):
+                flagged.setdefault(module, {})[key] = {"baseline": then, "now": now}
+    return flagged
+
+
+def run(modules=None, bench=False, save_baseline=False, path=IMPORT_LOG):
+    modules = modules or agent_modules()
+    baseline_modules = interpreter_modules()
+    log = load_log(path)
+    current = {}
+
+    print(f"⏱️ Profiling cold imports for {len(modules)} modules...")
+    for module in modules:
+        entry = profile_module(module, baseline_modules)
+        if bench and "error" not in entry:
+            entry["startup_ms"] = benchmark_module(module)
+        current[module] = entry
+
+    for module, entry in sorted(current.items(), key=lambda kv: -kv[1].get("ms", -1)):
+        if "error" in entry:
+            print(f"  ❌ {module:<40} {entry['error']}")
+            continue
+        startup = f" | startup {entry['startup_ms']:.0f}ms" if entry.get("startup_ms") is not None else ""
+        heavy = ", ".join(f"{name} {ms:.0f}" for name, ms in entry["packages"].items())
+        print(f"  {module:<42} {entry['ms']:8.1f}ms{startup}  [{heavy}]")
+
+    flagged = regressions(current, log.get("baseline", {}))
+    for module, keys in flagged.items():
+        for key, values in keys.items():
+            print(f"⚠️ Import regression {module} {key}: {values['baseline']} → {values['now']}ms")
+
+    log["latest"] = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "modules": current, "regressions": flagged}
+    if save_baseline or "baseline" not in log:
+        log["baseline"] = current
+        print("📌 Saved as import-time baseline")
+    save_log(log, path)
+    return current, flagged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report cold-import cost per agent module")
+    parser.add_argument("modules", nargs="*", help="dotted module names (default: every agent)")
+    parser.add_argument("--bench", action="store_true", help=f"also time full interpreter startup (best of {BENCH_REPEATS})")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+    _, flagged = run(args.modules, bench=args.bench, save_baseline=args.save_baseline)
+    sys.exit(1 if flagged else 0)
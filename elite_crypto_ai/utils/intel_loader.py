@@ -1,12 +1,41 @@
 # utils/intel_loder.py
 import json
 import os
+from utils.artifacts import read_artifact
 
 INTEL_FILE = "data/intel_report.json"
+FORECAST_FILE = "intel/forecast_signals.json"
+MARKET_FILE = "intel/market_status.json"
 
 
 def load_latest_intel():
-    if not os.path.exists(INTEL_FILE):
-        return {}
-    with open(INTEL_FILE, "r") as f:
-        return json.load(f)
+    return read_artifact(INTEL_FILE)
+
+
+def load_forecast_data(path=FORECAST_FILE):
+    return read_artifact(path)
+
+
+def load_market_conditions(path=MARKET_FILE):
+    return read_artifact(path)
+
+
+def get_forecast_accuracy_stats():
+    # Per-model accuracy from the incremental forecast aggregates (no history re-scan)
+    from utils.forecast_aggregates import ForecastAggregates
+    aggregates = ForecastAggregates()
+    stats = {}
+    for model in aggregates.state["models"]:
+        summary = aggregates.model_summary(model)
+        stats[model] = {
+            "accuracy": round(summary["accuracy"], 4),
+            "hit_rate": round(summary["hit_rate"], 4),
+            "total": summary["count"],
+        }
+    return stats
+
+
+def get_forecast_labels(path=FORECAST_FILE):
+    # token -> latest forecast label (BULLISH / BEARISH / NEUTRAL)
+    signals = read_artifact(path)
+    return {token: (f.get("forecast_label") or "").upper() for token, f in signals.items() if isinstance(f, dict)}
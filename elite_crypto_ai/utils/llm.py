@@ -1,22 +1,58 @@
 # utils/llm.py
 
-import openai
 import os
 import random
-
-openai.api_key = os.getenv("OPENAI_API_KEY")
+from utils.llm_cache import get_llm_cache
+from utils.llm_client import get_llm_client
 
 MODELS = ["gpt-4", "gpt-3.5-turbo"]
+DEFAULT_TEMPERATURE = None  # None = provider default
+
+_openai = None
+
+
+def get_openai():
+    """openai is imported and keyed on the first LLM call, not when an agent imports this module."""
+    global _openai
+    if _openai is None:
+        import openai
+        openai.api_key = os.getenv("OPENAI_API_KEY")
+        _openai = openai
+    return _openai
+
+
+def call_model(model, prompt, temperature=DEFAULT_TEMPERATURE, site=None, items=1, timeout=None):
+    # Every agent's calls go through the one shared client: pooled connections, per-model limits and timeouts
+    return get_llm_client().call_sync(model, prompt, temperature, site=site, items=items, timeout=timeout)
+
+
+def query_llm(prompt, model_name=None, temperature=DEFAULT_TEMPERATURE, site="default", cache=True, items=1, timeout=None):
+    """One model, memoized on (model, normalized prompt, temperature) for the call site's TTL.
+    items = work items the prompt carries (tokens in a forecast batch), for per-item call stats.
+    timeout caps the model call below its configured timeout (e.g. a caller's remaining deadline)."""
+    model = model_name or MODELS[0]
+    store = get_llm_cache()
+    if cache:
+        cached = store.get(model, prompt, temperature, site)
+        if cached is not None:
+            return cached
+    response = call_model(model, prompt, temperature, site=site, items=items, timeout=timeout)
+    if cache:
+        store.put(model, prompt, response, temperature, site)
+    return response
 
 
-def query_llm_with_fallback(prompt):
-    for model in MODELS:
-        try:
-            response = openai.ChatCompletion.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            return response["choices"][0]["message"]["content"]
-        except Exception:
-            continue
-    raise Exception("All LLM model calls failed.")
+def query_llm_with_fallback(prompt, model_name=None, temperature=DEFAULT_TEMPERATURE, site="default", cache=True):
+    """model_name (or MODELS[0]) first; the fallback order, hedging and timeouts come from the shared client."""
+    models = [model_name] + [m for m in MODELS if m != model_name] if model_name else list(MODELS)
+    store = get_llm_cache()
+    # Only the requested model's answer is reused: a fallback's answer, cached when the primary failed,
+    # would otherwise stand in for the primary for the site's whole TTL
+    if cache:
+        cached = store.get(models[0], prompt, temperature, site)
+        if cached is not None:
+            return cached
+    response, model = get_llm_client().complete_sync(prompt, models, temperature, preferred=models[0], site=site)
+    if cache:
+        store.put(model, prompt, response, temperature, site)
+    return response
@@ -0,0 +1,183 @@
+# utils/llm_cache.py — Persistent Content-Addressed LLM Response Cache (sqlite, per-site TTL, LRU bound, hit stats)
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+
+CACHE_DB = "cache/llm_cache.sqlite"
+CACHE_ENABLED = os.getenv("ELITE_LLM_CACHE", "1") != "0"
+MAX_ENTRIES = 20000
+EVICT_EVERY = 200  # inserts between LRU trims
+DEFAULT_TTL = 24 * 3600
+
+# Seconds a cached answer stays valid, per call site
+SITE_TTLS = {
+    "forecast": 15 * 60,  # inputs embed live prices; identical prompts only recur within a cycle or a re-run
+    "manager": 3600,
+    "email_report": 6 * 3600,
+    "strategy_builder": 7 * 24 * 3600,
+    "strategy_generator": 7 * 24 * 3600,
+    "self_trainer": 7 * 24 * 3600,
+    "repair": 30 * 24 * 3600,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    model TEXT NOT NULL,
+    temperature TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+CREATE TABLE IF NOT EXISTS site_stats (
+    site TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def normalize_prompt(prompt):
+    # Whitespace-only differences (indentation of f-string templates, trailing spaces) share an entry
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in str(prompt).strip().splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+def cache_key(model, prompt, temperature=None):
+    temp = "default" if temperature is None else f"{float(temperature):.3f}"
+    digest = hashlib.sha256(f"{model.lower()}\0{temp}\0{normalize_prompt(prompt)}".encode()).hexdigest()
+    return digest, temp
+
+
+class LLMCache:
+    def __init__(self, path=CACHE_DB, max_entries=MAX_ENTRIES, enabled=CACHE_ENABLED):
+        self.path = path
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.inserts = 0
+        self.stats = {}  # site -> {"hits", "misses"} for this process
+
+    def connection(self):
+        # One connection per thread, reopened in forked children (sqlite handles must not cross a fork)
+        conn = getattr(self.local, "conn", None)
+        if conn is None or self.local.pid != os.getpid():
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")  # agents in other processes read while one writes
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def count(self, site, field):
+        if not self.enabled:
+            return  # ELITE_LLM_CACHE=0 must not create the database just to count
+        with self.lock:
+            self.stats.setdefault(site, {"hits": 0, "misses": 0})[field] += 1
+        self.connection().execute(
+            f"INSERT INTO site_stats (site, {field}) VALUES (?, 1) "
+            f"ON CONFLICT(site) DO UPDATE SET {field} = {field} + 1", (site,)
+        )
+
+    # --------- Lookups ---------
+
+    def lookup(self, model, prompt, temperature=None, site="default"):
+        """Cached response or None, without touching the hit/miss counters."""
+        if not self.enabled:
+            return None
+        key, _ = cache_key(model, prompt, temperature)
+        now = time.time()
+        conn = self.connection()
+        row = conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or now - row[1] > SITE_TTLS.get(site, DEFAULT_TTL):
+            return None
+        conn.execute("UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        return row[0]
+
+    def get(self, model, prompt, temperature=None, site="default"):
+        response = self.lookup(model, prompt, temperature, site)
+        self.count(site, "misses" if response is None else "hits")
+        return response
+
+    def put(self, model, prompt, response, temperature=None, site="default"):
+        if not self.enabled or not isinstance(response, str) or not response.strip():
+            return
+        key, temp = cache_key(model, prompt, temperature)
+        now = time.time()
+        self.connection().execute(
+            "INSERT OR REPLACE INTO responses (key, site, model, temperature, response, created, last_used, hits) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, 0)", (key, site, model.lower(), temp, response, now, now)
+        )
+        with self.lock:
+            self.inserts += 1
+            due = self.inserts % EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    # --------- Maintenance ---------
+
+    def evict(self):
+        """Drop expired rows, then least-recently-used rows beyond max_entries."""
+        conn = self.connection()
+        now = time.time()
+        for site, ttl in SITE_TTLS.items():
+            conn.execute("DELETE FROM responses WHERE site = ? AND created < ?", (site, now - ttl))
+        conn.execute(
+            "DELETE FROM responses WHERE site NOT IN (%s) AND created < ?" % ",".join("?" * len(SITE_TTLS)),
+            (*SITE_TTLS, now - DEFAULT_TTL),
+        )
+        conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def summary(self):
+        conn = self.connection()
+        entries = dict(conn.execute("SELECT site, COUNT(*) FROM responses GROUP BY site").fetchall())
+        totals = {site: (hits, misses) for site, hits, misses in conn.execute("SELECT site, hits, misses FROM site_stats")}
+        out = {}
+        for site in sorted(set(entries) | set(totals)):
+            hits, misses = totals.get(site, (0, 0))
+            out[site] = {
+                "entries": entries.get(site, 0),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            }
+        return out
+
+    def clear(self, site=None):
+        conn = self.connection()
+        if site is None:
+            conn.execute("DELETE FROM responses")
+        else:
+            conn.execute("DELETE FROM responses WHERE site = ?", (site,))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
+
+
+if __name__ == "__main__":
+    for site, s in get_llm_cache().summary().items():
+        print(f"🧠 {site:<20} {s['entries']:6d} cached | {s['hits']} hits / {s['misses']} misses ({s['hit_rate'] * 100:.1f}%)")
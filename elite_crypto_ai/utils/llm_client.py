@@ -0,0 +1,397 @@
+# utils/llm_client.py — Shared Async LLM Client (pooled connections, per-model limits, hedged requests, live fallback order)
+
+import os
+import time
+import atexit
+import asyncio
+import hashlib
+import threading
+from collections import deque
+from utils.artifacts import read_artifact, write_artifact
+
+LATENCY_FILE = "logs/llm_latency.json"
+BACKEND = os.getenv("ELITE_LLM_BACKEND", "openai")  # "openai" | "fake" (tests, dry runs)
+
+MODEL_CONCURRENCY = {"gpt-4": 6, "gpt-3.5-turbo": 12}
+DEFAULT_CONCURRENCY = 6
+MODEL_TIMEOUTS = {"gpt-4": 60, "gpt-3.5-turbo": 30}  # seconds per attempt
+DEFAULT_TIMEOUT = 45
+POOL_SIZE = 32  # keep-alive connections shared by every model
+
+HEDGE = True
+MIN_HEDGE_SAMPLES = 20  # no hedging until the primary's p95 is known
+LATENCY_WINDOW = 200  # recent successful calls per model used for p50/p95
+ERROR_DECAY = 0.9  # EWMA weight of the previous error rate
+ERROR_HALF_LIFE = 300  # seconds: a demoted model that isn't called still earns its way back
+UNHEALTHY_ERROR_RATE = 0.5  # a primary failing this often is demoted behind healthier models
+SAVE_EVERY = 25  # calls between stat snapshots
+
+
+class LLMError(Exception):
+    pass
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+# --------- Backends ---------
+
+class OpenAIBackend:
+    """Async chat completions over one keep-alive aiohttp session."""
+
+    name = "openai"
+
+    def __init__(self):
+        self.session = None
+
+    async def complete(self, model, prompt, temperature=None):
+        from utils.llm import get_openai
+        openai = get_openai()
+        if self.session is None:
+            import aiohttp
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=POOL_SIZE))
+        openai.aiosession.set(self.session)  # context-local in openai: set per task
+        kwargs = {"temperature": temperature} if temperature is not None else {}
+        response = await openai.ChatCompletion.acreate(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs
+        )
+        usage = response.get("usage") or {}
+        return response["choices"][0]["message"]["content"], {
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+        }
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class FakeBackend:
+    """Offline backend: per-model latency and failure rate, deterministic replies (respond(model, prompt) overrides)."""
+
+    name = "fake"
+
+    def __init__(self, latency=None, fail_rate=None, respond=None):
+        self.latency = latency or {}
+        self.fail_rate = fail_rate or {}
+        self.respond = respond
+        self.calls = []
+
+    async def complete(self, model, prompt, temperature=None):
+        self.calls.append(model)
+        digest = hashlib.sha256(f"{model}\0{prompt}".encode()).digest()
+        await asyncio.sleep(self.latency.get(model, 0.01))
+        if digest[0] / 255 < self.fail_rate.get(model, 0):
+            raise LLMError(f"fake {model} failure")
+        text = self.respond(model, prompt) if self.respond else f"[{model}] {digest.hex()[:12]}"
+        return text, {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(text)}
+
+    async def close(self):
+        pass
+
+
+BACKENDS = {"openai": OpenAIBackend, "fake": FakeBackend}
+
+
+# --------- Live model stats ---------
+
+class ModelStats:
+    # Updated on the loop thread, read by summary()/save_stats from caller threads: every access holds self.lock
+    def __init__(self, snapshot=None):
+        # Seeded from the last snapshot so every agent process starts with the fleet's latency picture
+        snapshot = snapshot or {}
+        self.lock = threading.RLock()
+        self.latencies = deque(snapshot.get("samples", []), maxlen=LATENCY_WINDOW)
+        self.calls = snapshot.get("calls", 0)
+        self.failures = snapshot.get("failures", 0)
+        self.errors = snapshot.get("error_rate", 0.0)
+        self.updated = snapshot.get("updated", time.time())
+        self.prompt_tokens = snapshot.get("prompt_tokens", 0)
+        self.completion_tokens = snapshot.get("completion_tokens", 0)
+
+    def success(self, seconds, usage, items=1):
+        # items > 1: one request answered several work items (a forecast batch); record the per-item share
+        with self.lock:
+            self.calls += 1
+            self.latencies.append(seconds / items)
+            self.errors = self.error_rate() * ERROR_DECAY
+            self.updated = time.time()
+            self.prompt_tokens += usage.get("prompt_tokens", 0) / items
+            self.completion_tokens += usage.get("completion_tokens", 0) / items
+
+    def failure(self):
+        with self.lock:
+            self.calls += 1
+            self.failures += 1
+            self.errors = self.error_rate() * ERROR_DECAY + (1 - ERROR_DECAY)
+            self.updated = time.time()
+
+    def error_rate(self):
+        with self.lock:
+            return self.errors * 0.5 ** ((time.time() - self.updated) / ERROR_HALF_LIFE)
+
+    def sample_count(self):
+        with self.lock:
+            return len(self.latencies)
+
+    def percentile(self, q):
+        with self.lock:
+            ordered = sorted(self.latencies)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def expected_seconds(self):
+        # Time to a good answer: typical latency inflated by how often the model has to be retried
+        with self.lock:
+            p95 = self.percentile(0.95)
+            return None if p95 is None else p95 / max(0.05, 1 - self.error_rate())
+
+    def summary(self):
+        with self.lock:
+            p50, p95 = self.percentile(0.5), self.percentile(0.95)
+            answered = max(1, self.calls - self.failures)
+            return {
+                "p50": None if p50 is None else round(p50, 3),
+                "p95": None if p95 is None else round(p95, 3),
+                "calls": self.calls,
+                "failures": self.failures,
+                "error_rate": round(self.error_rate(), 4),
+                "updated": round(self.updated, 3),
+                "prompt_tokens": round(self.prompt_tokens, 1),
+                "completion_tokens": round(self.completion_tokens, 1),
+                "avg_tokens": round((self.prompt_tokens + self.completion_tokens) / answered, 1),
+                "samples": [round(x, 3) for x in self.latencies],
+            }
+
+
+# --------- Client ---------
+
+class LLMClient:
+    """One event loop thread per process; sync callers block on complete_sync, async callers await complete."""
+
+    def __init__(self, backend=None, hedge=HEDGE):
+        self.backend = backend or BACKENDS.get(BACKEND, OpenAIBackend)()
+        self.hedge = hedge
+        snapshot = read_artifact(LATENCY_FILE, copy=True)
+        self.snapshot = snapshot.get("models", {})
+        self.site_snapshot = snapshot.get("sites", {})
+        self.stats = {}
+        self.site_stats = {}  # (site, model) -> ModelStats per work item, e.g. per forecast token
+        self.semaphores = {}
+        self.lock = threading.Lock()
+        self.pending_saves = 0
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="llm-client", daemon=True)
+        self.thread.start()
+
+    def model_stats(self, model):
+        with self.lock:
+            if model not in self.stats:
+                self.stats[model] = ModelStats(self.snapshot.get(model))
+            return self.stats[model]
+
+    def call_site_stats(self, site, model):
+        with self.lock:
+            key = (site, model)
+            if key not in self.site_stats:
+                self.site_stats[key] = ModelStats(self.site_snapshot.get(site, {}).get(model))
+            return self.site_stats[key]
+
+    def semaphore(self, model):
+        # Only touched from the loop thread
+        if model not in self.semaphores:
+            self.semaphores[model] = asyncio.Semaphore(MODEL_CONCURRENCY.get(model, DEFAULT_CONCURRENCY))
+        return self.semaphores[model]
+
+    def order(self, models, preferred=None):
+        """preferred (or the first configured model) leads unless it is failing; the rest by expected latency."""
+        models = list(dict.fromkeys(models))
+        primary = preferred if preferred in models else models[0]
+        rest = [m for m in models if m != primary]
+        position = {m: i for i, m in enumerate(models)}
+
+        def rank(model):
+            expected = self.model_stats(model).expected_seconds()
+            return (expected is None, expected or 0, position[model])
+
+        rest.sort(key=rank)
+        stats = self.model_stats(primary)
+        if stats.calls >= MIN_HEDGE_SAMPLES and stats.error_rate() > UNHEALTHY_ERROR_RATE:
+            healthy = [m for m in rest if self.model_stats(m).error_rate() <= UNHEALTHY_ERROR_RATE]
+            if healthy:
+                rest.insert(rest.index(healthy[0]) + 1, primary)
+                return rest
+        return [primary] + rest
+
+    def hedge_delay(self, model):
+        stats = self.model_stats(model)
+        if not self.hedge or stats.sample_count() < MIN_HEDGE_SAMPLES:
+            return None
+        return stats.percentile(0.95)
+
+    # --------- Single attempt ---------
+
+    async def attempt(self, model, prompt, temperature=None, validate=None, site=None, items=1, timeout=None):
+        # timeout: caller's remaining budget; the model's own timeout still applies when it is shorter
+        timeout = min(MODEL_TIMEOUTS.get(model, DEFAULT_TIMEOUT), timeout if timeout is not None else float("inf"))
+        stats = self.model_stats(model)
+        site_stats = self.call_site_stats(site, model) if site else None
+        async with self.semaphore(model):
+            started = time.monotonic()
+            try:
+                text, usage = await asyncio.wait_for(self.backend.complete(model, prompt, temperature), timeout)
+                if not isinstance(text, str) or not text.strip() or (validate and not validate(text)):
+                    raise LLMError(f"{model} returned an invalid answer")
+            except asyncio.CancelledError:
+                raise  # lost a hedge race: neither a success nor a failure
+            except Exception:
+                stats.failure()
+                if site_stats:
+                    site_stats.failure()
+                self.mark_dirty()
+                raise
+        elapsed = time.monotonic() - started
+        stats.success(elapsed, usage)
+        if site_stats:
+            site_stats.success(elapsed, usage, items)
+        self.mark_dirty()
+        return text, model
+
+    # --------- Hedged fallback chain ---------
+
+    async def complete(self, prompt, models, temperature=None, preferred=None, validate=None, hedge=None, site=None, items=1):
+        """First valid (text, model) across `models`. A failure starts the next model at once; a primary slower
+        than its own p95 gets the next model raced against it."""
+        chain = self.order(models, preferred)
+        hedge = self.hedge if hedge is None else hedge
+        running = {}
+        errors = []
+        next_index = 0
+
+        def launch():
+            nonlocal next_index
+            model = chain[next_index]
+            next_index += 1
+            running[asyncio.ensure_future(self.attempt(model, prompt, temperature, validate, site, items))] = model
+
+        launch()
+        try:
+            while running:
+                delay = None
+                if hedge and next_index < len(chain) and len(running) == 1:
+                    delay = self.hedge_delay(next(iter(running.values())))
+                done, _ = await asyncio.wait(list(running), timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    launch()  # hedge: primary is past its p95
+                    continue
+                for task in done:
+                    model = running.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(f"{model}: {task.exception() or type(task.exception()).__name__}")
+                if not running and next_index < len(chain):
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+        raise LLMError("All LLM model calls failed. " + "; ".join(errors))
+
+    async def call(self, model, prompt, temperature=None, site=None, items=1, timeout=None):
+        """One model, no fallback or hedging."""
+        text, _ = await self.attempt(model, prompt, temperature, site=site, items=items, timeout=timeout)
+        return text
+
+    # --------- Sync bridge ---------
+
+    def run(self, coro, timeout=None):
+        if threading.current_thread() is self.thread:
+            raise RuntimeError("use `await` inside the LLM client loop, not the sync bridge")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def complete_sync(self, prompt, models, temperature=None, preferred=None, validate=None, hedge=None, site=None, items=1):
+        return self.run(self.complete(prompt, models, temperature, preferred, validate, hedge, site, items))
+
+    def call_sync(self, model, prompt, temperature=None, site=None, items=1, timeout=None):
+        return self.run(self.call(model, prompt, temperature, site, items, timeout))
+
+    # --------- Stats snapshot ---------
+
+    def mark_dirty(self):
+        with self.lock:
+            self.pending_saves += 1
+            due = self.pending_saves >= SAVE_EVERY
+        if due:
+            self.save_stats()
+
+    def summary(self):
+        with self.lock:
+            return {model: stats.summary() for model, stats in self.stats.items()}
+
+    def site_summary(self):
+        """site -> model -> per-item stats (latency and tokens divided by the items each call carried)."""
+        with self.lock:
+            sites = {}
+            for (site, model), stats in self.site_stats.items():
+                sites.setdefault(site, {})[model] = stats.summary()
+            return sites
+
+    def save_stats(self, path=LATENCY_FILE):
+        with self.lock:
+            self.pending_saves = 0
+        summary = self.summary()
+        if not summary:
+            return
+        try:
+            write_artifact(path, {"updated": time.time(), "backend": self.backend.name, "models": summary,
+                                  "sites": self.site_summary()})
+        except Exception as e:
+            print(f"⚠️ Could not save LLM latency stats: {e}")
+
+    def close(self):
+        self.save_stats()
+        try:
+            self.run(self.backend.close(), timeout=5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client():
+    """Process-wide client shared by every agent (rebuilt in forked children: the loop thread doesn't survive a fork)."""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = LLMClient()
+            _client_pid = os.getpid()
+            atexit.register(_client.save_stats)
+        return _client
+
+
+def set_llm_client(client):
+    """Swap the shared client, e.g. LLMClient(FakeBackend(...)) in tests."""
+    global _client, _client_pid
+    with _client_lock:
+        _client = client
+        _client_pid = os.getpid()
+    return client
+
+
+def save_client_stats():
+    """Snapshot the shared client's stats if this process built one (forked workers skip atexit)."""
+    if _client is not None and _client_pid == os.getpid():
+        _client.save_stats()
+
+
+if __name__ == "__main__":
+    for model, s in read_artifact(LATENCY_FILE).get("models", {}).items():
+        print(f"⏱️ {model:<16} p50 {s['p50']}s | p95 {s['p95']}s | {s['calls']} calls | error rate {s['error_rate']:.1%}")
@@ -0,0 +1,208 @@
+# utils/local_forecaster.py — First-Stage Local Forecaster (softmax logistic regression over forecast features)
+
+import threading
+import numpy as np
+from datetime import datetime, timedelta
+from utils.artifacts import read_artifact, write_artifact
+from utils.forecast_store import get_history_store
+
+MODEL_FILE = "logs/local_forecaster.json"
+LOCAL_MODEL_NAME = "local-logreg"
+LABELS = ["BULLISH", "BEARISH", "NEUTRAL"]
+NEUTRAL_BAND = 0.01  # same ±1% rule the accuracy tracker scores against
+
+TRAIN_WINDOW = 20000  # most recent history entries considered
+OUTCOME_HORIZON_HOURS = 24  # outcome = price move to the first forecast of the token at least this much later
+OUTCOME_MAX_GAP_HOURS = 72  # ...unless the next observation is later than this (no label)
+MIN_SAMPLES = 300
+VALIDATION_SHARE = 0.2  # most recent samples held out, never shuffled into training
+EPOCHS = 600
+LEARNING_RATE = 0.5
+L2 = 1e-3
+
+# The local answer is accepted only above the confidence where held-out precision reaches TARGET_PRECISION;
+# everything below that (the uncertain band) is escalated to the LLM.
+TARGET_PRECISION = 0.6
+MIN_ACCEPT_SUPPORT = 25
+THRESHOLD_GRID = [round(0.4 + 0.025 * i, 3) for i in range(23)]  # 0.40 .. 0.95
+
+
+def outcome_label(change):
+    if change > NEUTRAL_BAND:
+        return "BULLISH"
+    if change < -NEUTRAL_BAND:
+        return "BEARISH"
+    return "NEUTRAL"
+
+
+def softmax(z):
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+# --------- Training ---------
+
+def labelled_samples(entries):
+    """(features, label, timestamp) for every featured entry whose token was observed again within the horizon."""
+    by_token = {}
+    for entry in entries:
+        try:
+            ts = datetime.fromisoformat(entry["timestamp"])
+            price = float(entry.get("entry_price") or 0)
+        except (KeyError, TypeError, ValueError):
+            continue
+        if price > 0:
+            by_token.setdefault(entry["token"], []).append((ts, price, entry.get("features")))
+
+    horizon = timedelta(hours=OUTCOME_HORIZON_HOURS)
+    max_gap = timedelta(hours=OUTCOME_MAX_GAP_HOURS)
+    samples = []
+    for rows in by_token.values():
+        rows.sort(key=lambda r: r[0])
+        j = 0
+        for i, (ts, price, features) in enumerate(rows):
+            j = max(j, i + 1)
+            while j < len(rows) and rows[j][0] - ts < horizon:
+                j += 1
+            if not features or j >= len(rows) or rows[j][0] - ts > max_gap:
+                continue
+            samples.append((features, outcome_label((rows[j][1] - price) / price), ts))
+    samples.sort(key=lambda s: s[2])
+    return samples
+
+
+def design_matrix(samples, names, mean=None, std=None):
+    X = np.array([[np.nan if f.get(n) is None else f[n] for n in names] for f in samples], dtype=float)
+    if mean is None:
+        mean = np.nanmean(X, axis=0)
+        std = np.nanstd(X, axis=0)
+        mean = np.where(np.isnan(mean), 0.0, mean)
+        std = np.where(np.isnan(std) | (std < 1e-9), 1.0, std)
+    X = (X - mean) / std
+    X = np.where(np.isnan(X), 0.0, X)  # missing feature = the training mean
+    return np.hstack([X, np.ones((len(X), 1))]), mean, std
+
+
+def fit_softmax(X, y):
+    Y = np.eye(len(LABELS))[y]
+    W = np.zeros((X.shape[1], len(LABELS)))
+    for _ in range(EPOCHS):
+        grad = X.T @ (softmax(X @ W) - Y) / len(X)
+        grad[:-1] += L2 * W[:-1]  # bias row unregularized
+        W -= LEARNING_RATE * grad
+    return W
+
+
+def accept_threshold(probs, y):
+    confidence = probs.max(axis=1)
+    correct = probs.argmax(axis=1) == y
+    for threshold in THRESHOLD_GRID:
+        accepted = confidence >= threshold
+        if accepted.sum() >= MIN_ACCEPT_SUPPORT and correct[accepted].mean() >= TARGET_PRECISION:
+            return threshold, float(accepted.mean()), float(correct[accepted].mean())
+    return None, 0.0, None
+
+
+def train(store=None, path=MODEL_FILE):
+    """Fit on forecast history outcomes and write the model; returns it (None when there isn't enough data)."""
+    store = store or get_history_store()
+    samples = labelled_samples(store.tail(TRAIN_WINDOW))
+    if len(samples) < MIN_SAMPLES:
+        print(f"⚠️ Local forecaster: {len(samples)} labelled samples, need {MIN_SAMPLES}.")
+        return None
+
+    names = sorted({name for features, _, _ in samples for name, value in features.items() if value is not None})
+    split = int(len(samples) * (1 - VALIDATION_SHARE))
+    train_rows, val_rows = samples[:split], samples[split:]
+    X, mean, std = design_matrix([s[0] for s in train_rows], names)
+    y = np.array([LABELS.index(s[1]) for s in train_rows])
+    W = fit_softmax(X, y)
+
+    Xv, _, _ = design_matrix([s[0] for s in val_rows], names, mean, std)
+    yv = np.array([LABELS.index(s[1]) for s in val_rows])
+    probs = softmax(Xv @ W)
+    threshold, coverage, precision = accept_threshold(probs, yv)
+
+    model = {
+        "trained_at": datetime.utcnow().isoformat(),
+        "features": names,
+        "mean": mean.round(6).tolist(),
+        "std": std.round(6).tolist(),
+        "weights": W.round(6).tolist(),
+        "accept_confidence": threshold,
+        "samples": len(train_rows),
+        "validation": {
+            "samples": len(val_rows),
+            "accuracy": round(float((probs.argmax(axis=1) == yv).mean()), 4),
+            "coverage": round(coverage, 4),
+            "precision": None if precision is None else round(precision, 4),
+        },
+    }
+    write_artifact(path, model)
+    get_local_forecaster().reset()
+    return model
+
+
+# --------- Inference ---------
+
+class LocalForecaster:
+    def __init__(self, path=MODEL_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.model = None
+        self.params = None
+
+    def reset(self):
+        with self.lock:
+            self.model = None
+            self.params = None
+
+    def load(self):
+        model = read_artifact(self.path)  # stat-validated: a retrain is picked up on the next call
+        with self.lock:
+            if model is not self.model:
+                self.model = model
+                self.params = None
+                if model.get("weights"):
+                    self.params = (model["features"], np.array(model["mean"]), np.array(model["std"]), np.array(model["weights"]))
+            return self.model, self.params
+
+    def predict(self, features):
+        """(label, confidence, {label: p}) or None when no model has been trained."""
+        model, params = self.load()
+        if params is None:
+            return None
+        names, mean, std, W = params
+        X, _, _ = design_matrix([features], names, mean, std)
+        probs = softmax(X @ W)[0]
+        best = int(probs.argmax())
+        return LABELS[best], float(probs[best]), dict(zip(LABELS, probs.round(4).tolist()))
+
+    def confident(self, features):
+        """Prediction when it clears the model's acceptance threshold; None means escalate."""
+        prediction = self.predict(features)
+        threshold = self.model.get("accept_confidence") if self.model else None
+        if prediction is None or threshold is None or prediction[1] < threshold:
+            return None
+        return prediction
+
+
+_forecaster = None
+_forecaster_lock = threading.Lock()
+
+
+def get_local_forecaster():
+    global _forecaster
+    with _forecaster_lock:
+        if _forecaster is None:
+            _forecaster = LocalForecaster()
+        return _forecaster
+
+
+if __name__ == "__main__":
+    trained = train()
+    if trained:
+        v = trained["validation"]
+        print(f"✅ Local forecaster trained on {trained['samples']} samples — "
+              f"held-out accuracy {v['accuracy']:.1%}, accepts {v['coverage']:.1%} above {trained['accept_confidence']}")
@@ -0,0 +1,198 @@
+# utils/ohlcv_store.py — Columnar OHLCV Store (per-symbol memory-mapped .npy columns + manifest)
+
+import os
+import json
+import threading
+import numpy as np
+import pandas as pd
+
+STORE_DIR = "data/ohlcv_store"
+CSV_FOLDER = "data/ohlcv"
+LEGACY_CSV_FOLDERS = ["data"]  # older agents dropped <symbol>.csv here; read only when CSV_FOLDER has no file
+MANIFEST_FILE = "manifest.json"
+
+# Layout:
+#   data/ohlcv_store/manifest.json          {symbol: {rows, start, end, columns, source, source_mtime, source_size}}
+#   data/ohlcv_store/<symbol>/timestamp.npy int64 epoch-ns, sorted ascending
+#   data/ohlcv_store/<symbol>/<column>.npy  float64, one file per numeric column
+# Loads map the files read-only, so a symbol/time-range read is a slice, not a parse.
+
+
+def parse_timestamps(values):
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        unit = "s" if values.abs().max() < 1e11 else "ms"
+        return pd.to_datetime(values, unit=unit)
+    return pd.to_datetime(values)
+
+
+def to_ns(value):
+    if value is None:
+        return None
+    return pd.Timestamp(value).value
+
+
+class OHLCVStore:
+    def __init__(self, root=STORE_DIR, csv_folder=CSV_FOLDER, legacy_folders=LEGACY_CSV_FOLDERS):
+        self.root = root
+        self.csv_folder = csv_folder
+        self.legacy_folders = legacy_folders
+        self.lock = threading.RLock()
+        self.manifest = None
+        self.manifest_mtime = None
+        self.mapped = {}  # symbol -> (manifest entry, {column: memmap})
+
+    # --------- Manifest ---------
+
+    def load_manifest(self):
+        path = os.path.join(self.root, MANIFEST_FILE)
+        mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        if self.manifest is None or mtime != self.manifest_mtime:
+            self.manifest = {}
+            if mtime is not None:
+                with open(path, "r") as f:
+                    self.manifest = json.load(f)
+            self.manifest_mtime = mtime
+        return self.manifest
+
+    def save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, MANIFEST_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, path)
+        self.manifest_mtime = os.stat(path).st_mtime_ns
+
+    def symbols(self):
+        return sorted(self.load_manifest().keys())
+
+    # --------- Import ---------
+
+    def import_frame(self, symbol, df, source=None):
+        symbol = symbol.lower()
+        df = df.copy()
+        df.columns = [c.lower() for c in df.columns]
+        if "timestamp" not in df.columns:
+            raise ValueError(f"{symbol}: OHLCV data needs a timestamp column")
+        df["timestamp"] = parse_timestamps(df["timestamp"])
+        df = df.dropna(subset=["timestamp"]).sort_values("timestamp", kind="mergesort")
+        numeric = [c for c in df.columns if c != "timestamp" and pd.api.types.is_numeric_dtype(df[c])]
+
+        folder = os.path.join(self.root, symbol)
+        os.makedirs(folder, exist_ok=True)
+        arrays = {"timestamp": df["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)}
+        arrays.update({col: df[col].to_numpy(dtype=np.float64) for col in numeric})
+        for col, values in arrays.items():
+            # Replace file-by-file; readers still holding the old mapping keep a valid inode
+            path = os.path.join(folder, f"{col}.npy")
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, np.ascontiguousarray(values))
+            os.replace(path + ".tmp", path)
+
+        stamp = os.stat(source) if source and os.path.exists(source) else None
+        with self.lock:
+            manifest = self.load_manifest()
+            manifest[symbol] = {
+                "rows": len(df),
+                "start": int(arrays["timestamp"][0]) if len(df) else None,
+                "end": int(arrays["timestamp"][-1]) if len(df) else None,
+                "columns": numeric,
+                "source": source,
+                "source_mtime": stamp.st_mtime_ns if stamp else None,
+                "source_size": stamp.st_size if stamp else None,
+            }
+            self.save_manifest()
+            self.mapped.pop(symbol, None)
+        return len(df)
+
+    def import_csv(self, symbol, path):
+        return self.import_frame(symbol, pd.read_csv(path), source=path)
+
+    def import_folder(self, folder=None):
+        """One-time (and incremental) CSV import: only new or modified files are parsed."""
+        folder = folder or self.csv_folder
+        if not os.path.isdir(folder):
+            return 0
+        imported = 0
+        for file in sorted(os.listdir(folder)):
+            if file.endswith(".csv") and self.sync(file[:-4], os.path.join(folder, file), report=True):
+                imported += 1
+        return imported
+
+    def is_stale(self, symbol, path):
+        entry = self.load_manifest().get(symbol)
+        if entry is None:
+            return True
+        stamp = os.stat(path)
+        return (entry.get("source"), entry.get("source_mtime"), entry.get("source_size")) != (
+            path, stamp.st_mtime_ns, stamp.st_size)
+
+    def source_path(self, symbol):
+        """The one CSV a symbol is imported from, so callers never alternate between two copies of it."""
+        for folder in [self.csv_folder] + self.legacy_folders:
+            path = os.path.join(folder, f"{symbol}.csv")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def sync(self, symbol, path=None, report=False):
+        """Import `path` (default: source_path) if it changed. Returns True if imported."""
+        symbol = symbol.lower()
+        path = path or self.source_path(symbol)
+        if not path or not os.path.exists(path) or not self.is_stale(symbol, path):
+            return False
+        rows = self.import_csv(symbol, path)
+        if report:
+            print(f"📦 Imported {symbol} ({rows} bars) from {path}")
+        return True
+
+    # --------- Reads ---------
+
+    def has(self, symbol):
+        return symbol.lower() in self.load_manifest()
+
+    def mapping(self, symbol):
+        with self.lock:
+            entry = self.load_manifest().get(symbol)
+            if entry is None:
+                return None, {}
+            cached = self.mapped.get(symbol)
+            if cached and cached[0] == entry:
+                return cached
+            folder = os.path.join(self.root, symbol)
+            columns = {
+                col: np.load(os.path.join(folder, f"{col}.npy"), mmap_mode="r")
+                for col in ["timestamp"] + entry["columns"]
+            }
+            self.mapped[symbol] = (entry, columns)
+            return entry, columns
+
+    def arrays(self, symbol, start=None, end=None, columns=None):
+        """{column: read-only array view} for bars with start <= timestamp <= end (epoch-ns timestamps)."""
+        entry, mapped = self.mapping(symbol.lower())
+        if entry is None:
+            return {}
+        ts = mapped["timestamp"]
+        lo = int(np.searchsorted(ts, to_ns(start), side="left")) if start is not None else 0
+        hi = int(np.searchsorted(ts, to_ns(end), side="right")) if end is not None else len(ts)
+        wanted = ["timestamp"] + [c for c in (columns or entry["columns"]) if c in mapped and c != "timestamp"]
+        return {col: mapped[col][lo:hi] for col in wanted}
+
+    def frame(self, symbol, start=None, end=None, columns=None):
+        arrays = self.arrays(symbol, start, end, columns)
+        if not arrays:
+            return pd.DataFrame()
+        data = {"timestamp": np.asarray(arrays.pop("timestamp")).view("datetime64[ns]")}
+        data.update(arrays)
+        return pd.DataFrame(data, copy=False)
+
+
+_store = None
+
+
+def get_ohlcv_store():
+    global _store
+    if _store is None:
+        _store = OHLCVStore()
+    return _store
@@ -0,0 +1,27 @@
+# utils/plotting.py — Lazy Plotting Backends (matplotlib / seaborn load on the first chart, headless)
+
+import os
+import importlib
+
+PLOT_BACKEND = os.getenv("MPLBACKEND", "Agg")  # pipeline agents only ever save PNGs
+
+_modules = {}
+
+
+def lazy_import(name):
+    module = _modules.get(name)
+    if module is None:
+        module = _modules[name] = importlib.import_module(name)
+    return module
+
+
+def pyplot():
+    """matplotlib.pyplot, imported (and switched to the headless backend) on first use."""
+    if "matplotlib.pyplot" not in _modules:
+        lazy_import("matplotlib").use(PLOT_BACKEND)
+    return lazy_import("matplotlib.pyplot")
+
+
+def seaborn():
+    pyplot()
+    return lazy_import("seaborn")
@@ -0,0 +1,133 @@
+# utils/price_cache.py — Process-Wide Price Cache (in-memory LRU + TTL, write-behind persistence)
+
+import os
+import json
+import time
+import atexit
+import threading
+from collections import OrderedDict
+from utils.serializers import load_file, dump_file
+
+PRICE_CACHE_FILE = "logs/prices/price_cache.json"
+DEFAULT_TTL = 60  # seconds
+SYMBOL_TTLS = {"usdc": 600, "usdt": 600, "dai": 600}  # pegged assets can be served stale for longer
+MAX_ENTRIES = 5000
+FLUSH_BATCH = 1000  # dirty entries that force an immediate write
+FLUSH_INTERVAL = 5.0  # seconds a dirty cache may sit in memory before the background write
+
+
+class PriceCache:
+    def __init__(self, path=PRICE_CACHE_FILE, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES,
+                 flush_batch=FLUSH_BATCH, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.ttl = ttl
+        self.ttls = dict(SYMBOL_TTLS)
+        self.max_entries = max_entries
+        self.flush_batch = flush_batch
+        self.flush_interval = flush_interval
+        self.entries = OrderedDict()  # symbol -> {"price", "timestamp"}, least recently used first
+        self.dirty = 0
+        self.timer = None
+        self.lock = threading.RLock()
+        self.write_lock = threading.Lock()  # held through dump_file, so writes land in snapshot order
+        self.stats = {"hits": 0, "misses": 0, "writes": 0}
+        self.load()
+
+    def key(self, symbol):
+        return str(symbol).lower()
+
+    def ttl_for(self, symbol):
+        return self.ttls.get(self.key(symbol), self.ttl)
+
+    def set_ttl(self, symbol, seconds):
+        self.ttls[self.key(symbol)] = seconds
+
+    # --------- Reads / writes ---------
+
+    def get(self, symbol, now=None):
+        key = self.key(symbol)
+        now = now or time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or now - entry["timestamp"] >= self.ttl_for(key):
+                self.stats["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry["price"]
+
+    def store(self, symbol, price, timestamp):
+        key = self.key(symbol)
+        self.entries[key] = {"price": price, "timestamp": timestamp}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.dirty += 1
+
+    def put(self, symbol, price, timestamp=None):
+        with self.lock:
+            self.store(symbol, price, timestamp or time.time())
+        self.after_write()
+
+    def put_many(self, prices, timestamp=None):
+        timestamp = timestamp or time.time()
+        with self.lock:
+            for symbol, price in prices.items():
+                self.store(symbol, price, timestamp)
+        self.after_write()
+
+    def after_write(self):
+        # Called without self.lock held: flush takes write_lock first, then self.lock
+        with self.lock:
+            if self.dirty < self.flush_batch:
+                if self.dirty:
+                    self.schedule_flush()
+                return
+        self.flush()
+
+    # --------- Persistence ---------
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            raw = load_file(self.path)
+        except (OSError, ValueError, RuntimeError):
+            return
+        now = time.time()
+        with self.lock:
+            for symbol, entry in sorted(raw.items(), key=lambda kv: kv[1].get("timestamp", 0)):
+                if now - entry.get("timestamp", 0) < self.ttl_for(symbol):
+                    self.entries[self.key(symbol)] = entry
+
+    def schedule_flush(self):
+        if self.timer is None:
+            self.timer = threading.Timer(self.flush_interval, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        with self.write_lock:
+            with self.lock:
+                if self.timer is not None:
+                    self.timer.cancel()
+                    self.timer = None
+                if not self.dirty:
+                    return
+                snapshot = dict(self.entries)
+                self.dirty = 0
+            dump_file(self.path, snapshot)
+            self.stats["writes"] += 1
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_price_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PriceCache()
+            atexit.register(_cache.flush)
+        return _cache
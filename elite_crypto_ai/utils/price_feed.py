@@ -13,4 +13,8 @@ FAKE_PRICES = {
 }
 
 def get_price(symbol):
-    return FAKE_PRICES.get(symbol.lower())
\ No newline at end of file
+    return FAKE_PRICES.get(symbol.lower())
+
+def get_prices(symbols):
+    prices = {symbol: get_price(symbol) for symbol in symbols}
+    return {symbol: price for symbol, price in prices.items() if price is not None}
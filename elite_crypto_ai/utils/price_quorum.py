@@ -0,0 +1,287 @@
+# utils/price_quorum.py — Hedged Multi-Source Price Queries + Latency/Disagreement Source Ranking
+
+import os
+import json
+import math
+import time
+import atexit
+import threading
+import statistics
+import concurrent.futures
+from collections import deque
+
+SCORE_LOG = "logs/price_source_scores.json"
+QUORUM_MODE = "first"  # "first" = first valid answer wins, "median" = median of QUORUM_SIZE answers
+TOP_K = 3  # sources raced per lookup
+QUORUM_SIZE = 3
+DEADLINE_SECONDS = 2.0
+LATENCY_WINDOW = 200  # samples kept per source for percentiles
+DISAGREEMENT_ALPHA = 0.1  # EWMA weight for |price - consensus| / consensus
+DISAGREEMENT_LIMIT = 0.05  # above this a source is only raced once healthier ones are exhausted
+CONSENSUS_TTL = 60.0  # seconds a 3+-source median stays the reference for smaller answer sets
+SAVE_INTERVAL = 30.0
+MAX_WORKERS = 32
+
+_executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="price-src")
+
+
+def valid_latency(seconds):
+    return isinstance(seconds, (int, float)) and not isinstance(seconds, bool) and math.isfinite(seconds) and seconds >= 0
+
+
+def valid_price(price):
+    return isinstance(price, (int, float)) and not isinstance(price, bool) and math.isfinite(price) and price > 0
+
+
+class SourceStats:
+    """Rolling latency percentiles, failure rate and disagreement-with-consensus per source."""
+
+    def __init__(self, path=SCORE_LOG):
+        self.path = path
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.calls = {}
+        self.failures = {}
+        self.disagreement = {}
+        self.saved_at = time.time()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return
+        for name, s in raw.items():
+            if not isinstance(s, dict):
+                continue  # legacy flat score file
+            # Seed the window with the persisted percentiles so a restart keeps the ranking;
+            # a source that never answered saved null percentiles and starts with an empty window
+            seed = [v for v in (s.get("p50", 0.5), s.get("p95", 1.0)) if valid_latency(v)]
+            self.latency[name] = deque(seed, maxlen=LATENCY_WINDOW)
+            self.calls[name] = s.get("calls", 0)
+            self.failures[name] = s.get("failures", 0)
+            self.disagreement[name] = s.get("disagreement", 0.0)
+
+    def record(self, name, latency, ok):
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if ok:
+                self.latency.setdefault(name, deque(maxlen=LATENCY_WINDOW)).append(latency)
+            else:
+                self.failures[name] = self.failures.get(name, 0) + 1
+            due = time.time() - self.saved_at > SAVE_INTERVAL
+            if due:
+                self.saved_at = time.time()
+        if due:
+            self.save()
+
+    def record_disagreement(self, name, deviation):
+        with self.lock:
+            prev = self.disagreement.get(name, deviation)
+            self.disagreement[name] = (1 - DISAGREEMENT_ALPHA) * prev + DISAGREEMENT_ALPHA * deviation
+
+    def percentile(self, name, q):
+        samples = sorted(self.latency.get(name, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def failure_rate(self, name):
+        calls = self.calls.get(name, 0)
+        return self.failures.get(name, 0) / calls if calls else 0.0
+
+    def cost(self, name):
+        # Lower is better. Never-called sources rank first so they get sampled; a source that has been
+        # called but never answered costs a full deadline, inflated by how often it fails.
+        p95 = self.percentile(name, 0.95)
+        if p95 is None:
+            if not self.calls.get(name, 0):
+                return 0.0
+            return DEADLINE_SECONDS * (1 + 4 * self.failure_rate(name))
+        return p95 * (1 + 4 * self.failure_rate(name)) * (1 + 20 * self.disagreement.get(name, 0.0))
+
+    def rank(self, names):
+        # Sources that keep disagreeing with consensus go behind every healthy one
+        with self.lock:
+            return sorted(names, key=lambda n: (self.disagreement.get(n, 0.0) > DISAGREEMENT_LIMIT, self.cost(n)))
+
+    def summary(self):
+        with self.lock:
+            return {
+                name: {
+                    "p50": self.percentile(name, 0.5),
+                    "p95": self.percentile(name, 0.95),
+                    "calls": self.calls.get(name, 0),
+                    "failures": self.failures.get(name, 0),
+                    "failure_rate": round(self.failure_rate(name), 4),
+                    "disagreement": round(self.disagreement.get(name, 0.0), 6),
+                    "cost": round(self.cost(name), 6),
+                }
+                for name in sorted(set(self.calls) | set(self.latency))
+            }
+
+    def save(self):
+        summary = self.summary()
+        self.saved_at = time.time()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(summary, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+class HedgedQuorum:
+    """Race the best-ranked sources; answer with the first valid price or the median of a quorum."""
+
+    def __init__(self, sources, stats=None, mode=QUORUM_MODE, top_k=TOP_K, quorum=QUORUM_SIZE,
+                 deadline=DEADLINE_SECONDS, bulk=None):
+        self.sources = dict(sources)  # name -> fn(symbol)
+        self.bulk = dict(bulk or {})  # name -> fn(symbols) -> {symbol: price}; falls back to per-symbol calls
+        self.stats = stats or get_source_stats()
+        self.mode = mode
+        self.top_k = top_k
+        self.quorum = quorum
+        self.deadline = deadline
+        self.consensus = {}  # symbol -> (median price, time) from the last 3+-source answer set
+
+    def ranked(self):
+        return self.stats.rank(list(self.sources))
+
+    def call(self, name, symbol, answers, expected):
+        start = time.monotonic()
+        try:
+            price = self.sources[name](symbol)
+            ok = valid_price(price)
+        except Exception:
+            price, ok = None, False
+        self.stats.record(name, time.monotonic() - start, ok)
+        with answers["lock"]:
+            answers["done"] += 1
+            if ok:
+                answers["prices"][name] = price
+            finished = answers["done"] == expected
+        if finished:
+            self.score_disagreement(symbol, answers["prices"])
+        return name, price if ok else None
+
+    def score_disagreement(self, symbol, prices):
+        # Runs once every raced source has answered, including the ones that lost the race.
+        # Two answers can't say who is off, so they are scored against the last 3+-source consensus.
+        if len(prices) >= 3:
+            consensus = statistics.median(prices.values())
+            self.consensus[symbol] = (consensus, time.time())
+        else:
+            consensus, seen = self.consensus.get(symbol, (None, 0))
+            if consensus is None or time.time() - seen > CONSENSUS_TTL:
+                return
+        for name, price in prices.items():
+            self.stats.record_disagreement(name, abs(price - consensus) / consensus)
+
+    def query(self, symbol):
+        """Returns (price, detail). detail: {"sources": {...}, "mode", "latency"}. Raises ValueError if none valid."""
+        start = time.monotonic()
+        remaining = self.ranked()
+        need = 1 if self.mode == "first" else min(self.quorum, len(remaining))
+        got = {}
+
+        while remaining and len(got) < need:
+            width = max(self.top_k, need - len(got))
+            wave, remaining = remaining[:width], remaining[width:]
+            timeout = self.deadline - (time.monotonic() - start)
+            if timeout <= 0:
+                break
+            answers = {"lock": threading.Lock(), "done": 0, "prices": {}}
+            futures = [_executor.submit(self.call, name, symbol, answers, len(wave)) for name in wave]
+            try:
+                for future in concurrent.futures.as_completed(futures, timeout=timeout):
+                    name, price = future.result()
+                    if price is not None:
+                        got[name] = price
+                        if len(got) >= need:
+                            break
+            except concurrent.futures.TimeoutError:
+                break  # Stragglers still finish in the background and update the stats
+
+        if not got:
+            raise ValueError(f"❌ All sources failed for {symbol}")
+        price = next(iter(got.values())) if self.mode == "first" else statistics.median(got.values())
+        return price, {"sources": got, "mode": self.mode, "latency": time.monotonic() - start}
+
+    # --------- Bulk ---------
+
+    def call_many(self, name, symbols, answers, expected):
+        start = time.monotonic()
+        try:
+            fn = self.bulk.get(name)
+            raw = fn(symbols) if fn else {symbol: self.sources[name](symbol) for symbol in symbols}
+            prices = {symbol: price for symbol, price in (raw or {}).items() if valid_price(price)}
+        except Exception:
+            prices = {}
+        self.stats.record(name, time.monotonic() - start, bool(prices))
+        with answers["lock"]:
+            answers["done"] += 1
+            answers["prices"][name] = prices
+            finished = answers["done"] == expected
+        if finished:
+            by_symbol = {}
+            for source, quotes in answers["prices"].items():
+                for symbol, price in quotes.items():
+                    by_symbol.setdefault(symbol, {})[source] = price
+            for symbol, quotes in by_symbol.items():
+                self.score_disagreement(symbol, quotes)
+        return name, prices
+
+    def query_many(self, symbols):
+        """One bulk request per raced source. Returns ({symbol: price}, detail); unpriced symbols are left out."""
+        start = time.monotonic()
+        symbols = list(dict.fromkeys(symbols))
+        remaining = self.ranked()
+        need = 1 if self.mode == "first" else min(self.quorum, len(remaining))
+        got = {symbol: {} for symbol in symbols}
+
+        def pending():
+            return [symbol for symbol in symbols if len(got[symbol]) < need]
+
+        while remaining and pending():
+            timeout = self.deadline - (time.monotonic() - start)
+            if timeout <= 0:
+                break
+            wave, remaining = remaining[:self.top_k], remaining[self.top_k:]
+            answers = {"lock": threading.Lock(), "done": 0, "prices": {}}
+            todo = pending()
+            futures = [_executor.submit(self.call_many, name, todo, answers, len(wave)) for name in wave]
+            try:
+                for future in concurrent.futures.as_completed(futures, timeout=timeout):
+                    name, prices = future.result()
+                    for symbol, price in prices.items():
+                        if symbol in got and len(got[symbol]) < need:
+                            got[symbol][name] = price
+                    if not pending():
+                        break
+            except concurrent.futures.TimeoutError:
+                break
+
+        pick = (lambda q: next(iter(q.values()))) if self.mode == "first" else (lambda q: statistics.median(q.values()))
+        prices = {symbol: pick(quotes) for symbol, quotes in got.items() if quotes}
+        detail = {
+            "missing": [symbol for symbol in symbols if symbol not in prices],
+            "mode": self.mode,
+            "latency": time.monotonic() - start,
+        }
+        return prices, detail
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_source_stats():
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = SourceStats()
+            atexit.register(_stats.save)
+        return _stats
@@ -0,0 +1,124 @@
+# utils/serializers.py — Pluggable Artifact Serialization (pretty JSON / compact JSON / msgpack, zstd for cold data)
+
+import os
+import gzip
+import json
+import threading
+
+try:
+    import msgpack
+except ImportError:  # optional: compact JSON is the fast format without it
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # optional: cold data falls back to gzip
+    zstandard = None
+
+PRETTY, COMPACT, MSGPACK = "pretty", "compact", "msgpack"
+FAST_FORMAT = MSGPACK if msgpack else COMPACT
+COLD_CODEC = "zstd" if zstandard else "gzip"
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 6
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# High-volume, machine-read artifacts; everything else stays pretty JSON for humans
+ARTIFACT_FORMATS = {
+    "logs/prices/price_cache.json": FAST_FORMAT,
+    "logs/prices/forecast_price_tracker.json": FAST_FORMAT,
+    "logs/simulation_trade_log.json": FAST_FORMAT,
+    "intel/forecast_aggregates.json": FAST_FORMAT,
+}
+
+
+def artifact_format(path):
+    return ARTIFACT_FORMATS.get(os.path.normpath(path).replace(os.sep, "/"), PRETTY)
+
+
+def to_plain(value):
+    # Timestamps / numpy scalars that show up in trade logs and frames
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+# --------- Encoding ---------
+
+def dumps(data, fmt=PRETTY, codec=None):
+    if fmt == MSGPACK and msgpack is None:
+        fmt = COMPACT
+    if fmt == MSGPACK:
+        raw = msgpack.packb(data, default=to_plain, use_bin_type=True)
+    elif fmt == COMPACT:
+        raw = json.dumps(data, separators=(",", ":"), default=to_plain).encode()
+    else:
+        raw = json.dumps(data, indent=2, default=to_plain).encode()
+    return compress(raw, codec) if codec else raw
+
+
+def compress(raw, codec=COLD_CODEC):
+    if codec == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return gzip.compress(raw, compresslevel=GZIP_LEVEL)
+
+
+def decompress(raw):
+    """Undo compress() whatever codec wrote it; uncompressed bytes pass through."""
+    if raw[:4] == ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed data but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(raw, max_output_size=1 << 31)
+    if raw[:2] == GZIP_MAGIC:
+        return gzip.decompress(raw)
+    return raw
+
+
+# --------- Decoding ---------
+
+def detect_format(raw):
+    head = raw[:64].lstrip()
+    if not head:
+        return COMPACT
+    # JSON documents start with a printable token; msgpack maps/arrays start with 0x80-0x9f / 0xdc-0xdf
+    if head[:1] in b'{["-0123456789tfn':
+        return COMPACT
+    return MSGPACK
+
+
+def loads(raw):
+    raw = decompress(raw)
+    if detect_format(raw) == MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("msgpack artifact but the msgpack package is not installed")
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+    return json.loads(raw)
+
+
+# --------- Files ---------
+
+def dump_file(path, data, fmt=None, codec=None):
+    """Atomic write in `fmt` (default: the artifact's registered format). Returns the bytes written."""
+    raw = dumps(data, fmt or artifact_format(path), codec)
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(raw)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return raw
+
+
+def load_file(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,60 @@
+# utils/shared_ohlcv.py — Publish OHLCV Frames to Shared Memory for Zero-Copy Worker Access
+
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+
+# Block layout per token: [timestamps int64 (T)] [numeric columns float64 (C × T), one contiguous run per column]
+# The spec dict is small and picklable; workers rebuild read-only views from it.
+
+
+def publish_frame(df):
+    """Copy a frame into one shared block once. Returns (SharedMemory, spec); caller owns unlink()."""
+    numeric = [c for c in df.columns if c != "timestamp" and pd.api.types.is_numeric_dtype(df[c])]
+    rows = len(df)
+    has_ts = "timestamp" in df.columns
+    ts_bytes = rows * 8 if has_ts else 0
+    size = max(1, ts_bytes + rows * len(numeric) * 8)
+
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    if has_ts:
+        ts = pd.to_datetime(df["timestamp"]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        np.ndarray((rows,), dtype=np.int64, buffer=shm.buf)[:] = ts
+    block = np.ndarray((len(numeric), rows), dtype=np.float64, buffer=shm.buf, offset=ts_bytes)
+    block[:] = df[numeric].to_numpy(dtype=np.float64).T
+
+    spec = {"name": shm.name, "rows": rows, "columns": numeric, "timestamp": has_ts}
+    return shm, spec
+
+
+def open_block(name):
+    # Publisher owns unlink(); on Python < 3.13 (no track=) forked workers share its resource tracker anyway
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def attach_frame(spec):
+    """Attach to a published block. Returns (SharedMemory, DataFrame over read-only views)."""
+    shm = open_block(spec["name"])
+    rows, columns = spec["rows"], spec["columns"]
+    ts_bytes = rows * 8 if spec["timestamp"] else 0
+    block = np.ndarray((len(columns), rows), dtype=np.float64, buffer=shm.buf, offset=ts_bytes)
+    block.flags.writeable = False
+
+    data = {col: block[i] for i, col in enumerate(columns)}
+    if spec["timestamp"]:
+        ts = np.ndarray((rows,), dtype=np.int64, buffer=shm.buf)
+        ts.flags.writeable = False
+        data = {"timestamp": ts.view("datetime64[ns]"), **data}
+    return shm, pd.DataFrame(data, copy=False)
+
+
+def release(blocks):
+    for shm in blocks:
+        try:
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
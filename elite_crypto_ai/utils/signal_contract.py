@@ -0,0 +1,91 @@
+# utils/signal_contract.py — Strategy Signal Contract (int8 positions), Legacy Adapter + Loop Lint
+
+import ast
+import numpy as np
+import pandas as pd
+
+# Contract: Strategy().generate_signals(df) -> np.ndarray[int8] of len(df), 1 long / -1 short / 0 flat.
+# Positions take effect on the next bar (utils.backtest applies the one-bar lag).
+LONG, FLAT, SHORT = 1, 0, -1
+
+LEGACY_LABELS = {
+    "buy": LONG, "long": LONG, "bullish": LONG,
+    "sell": SHORT, "short": SHORT, "bearish": SHORT,
+    "hold": FLAT, "flat": FLAT, "neutral": FLAT, "": FLAT,
+}
+
+ROW_ACCESSORS = {"iloc", "loc", "at", "iat"}
+ROW_ITERATORS = {"iterrows", "itertuples"}
+
+# Shared by every LLM prompt that writes strategies/*.py
+STRATEGY_CONTRACT_PROMPT = '''
+Strategy interface (required):
+```python
+import pandas as pd
+import numpy as np
+
+class Strategy:
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        ...
+        return positions  # np.int8 array with len(data) values: 1 = long, -1 = short, 0 = flat
+```
+- Compute indicators with vectorized pandas/NumPy column ops (rolling, ewm, shift, np.where, np.select)
+- Do NOT loop over rows: no for/while loops with .iloc/.loc/.at/.iat, no iterrows/itertuples
+- Positions are applied from the next bar; do not shift them yourself
+- Treat indicator warm-up NaNs as 0 (flat)
+'''
+
+
+def to_positions(signals, length=None):
+    """Coerce any strategy output to the int8 contract. Fast path for numeric arrays; maps legacy labels."""
+    if isinstance(signals, (pd.Series, pd.DataFrame)):
+        signals = signals.to_numpy()
+    arr = np.asarray(signals)
+    if arr.ndim != 1:
+        arr = arr.ravel()
+    if length is not None and len(arr) != length:
+        raise ValueError(f"Signal length mismatch ({len(arr)} != {length})")
+
+    if arr.dtype == np.int8:
+        return arr
+    if arr.dtype.kind in "biuf":
+        return np.sign(np.nan_to_num(arr.astype(float))).astype(np.int8)
+
+    # Legacy 'buy'/'sell'/'hold' (or mixed) output
+    labels = pd.Series(arr, dtype=object)
+    numeric = pd.to_numeric(labels, errors="coerce")
+    mapped = labels.where(numeric.isna()).astype(str).str.strip().str.lower().map(LEGACY_LABELS)
+    out = numeric.fillna(mapped)
+    unknown = out.isna() & labels.notna()
+    if unknown.any():
+        raise ValueError(f"Unknown signal label: {labels[unknown].iloc[0]!r}")
+    return np.sign(out.fillna(0).to_numpy(dtype=float)).astype(np.int8)
+
+
+def lint_strategy(source, filename="<strategy>"):
+    """Performance lint: ['line N: message', ...] for per-row access patterns. Empty list = clean."""
+    try:
+        tree = ast.parse(source, filename)
+    except SyntaxError as e:
+        return [f"line {e.lineno}: syntax error: {e.msg}"]
+
+    warnings = []
+    for loop in ast.walk(tree):
+        if not isinstance(loop, (ast.For, ast.While)):
+            continue
+        for node in ast.walk(loop):
+            if (isinstance(node, ast.Subscript) and isinstance(node.value, ast.Attribute)
+                    and node.value.attr in ROW_ACCESSORS):
+                warnings.append(f"line {node.lineno}: per-row .{node.value.attr}[] inside a loop; use column ops")
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr in ROW_ITERATORS):
+            warnings.append(f"line {node.lineno}: .{node.func.attr}() walks rows in Python; use column ops")
+    return sorted(set(warnings), key=lambda w: int(w.split(":")[0].split()[1]))
+
+
+def report_lint(source, name):
+    warnings = lint_strategy(source, name)
+    for warning in warnings:
+        print(f"⚠️ {name} {warning}")
+    return warnings
@@ -2,10 +2,11 @@
 
 import time
 import random
-from utils.sources.coingecko import get_price_from_coingecko
-from utils.sources.binance import get_price_from_binance
-from utils.sources.uniswap import get_price_from_uniswap
-from utils.sources.chainlink import get_price_from_chainlink
+from utils.sources.coingecko import get_price_from_coingecko, get_prices_from_coingecko
+from utils.sources.binance import get_price_from_binance, get_prices_from_binance
+from utils.sources.uniswap import get_price_from_uniswap, get_prices_from_uniswap
+from utils.sources.chainlink import get_price_from_chainlink, get_prices_from_chainlink
+from utils.price_quorum import HedgedQuorum
 
 ETH_TOKENS = ["eth", "wbtc", "usdc", "link", "arb", "op", "matic"]
 
@@ -32,23 +33,44 @@ def get_price_change_signal(token):
     return round(random.uniform(-0.05, 0.05), 4)  # mock % change 24h
 
 
+SOURCES = [
+    ("binance", get_price_from_binance),
+    ("uniswap", get_price_from_uniswap),
+    ("chainlink", get_price_from_chainlink),
+    ("coingecko", get_price_from_coingecko),
+]
+
+BULK_SOURCES = {
+    "binance": get_prices_from_binance,
+    "uniswap": get_prices_from_uniswap,
+    "chainlink": get_prices_from_chainlink,
+    "coingecko": get_prices_from_coingecko,
+}
+
+_quorum = None
+
+
+def get_quorum():
+    global _quorum
+    if _quorum is None:
+        _quorum = HedgedQuorum(SOURCES, bulk=BULK_SOURCES)
+    return _quorum
+
+
 def get_price(symbol):
-    sources = [
-        ("binance", get_price_from_binance),
-        ("uniswap", get_price_from_uniswap),
-        ("chainlink", get_price_from_chainlink),
-        ("coingecko", get_price_from_coingecko),
-    ]
-
-    for name, fn in sources:
-        try:
-            price = fn(symbol)
-            if price and price > 0:
-                print(f"[source_manager] ✅ {name} returned price for {symbol.upper()}: {price}")
-                return price
-        except Exception as e:
-            print(f"[source_manager] ❌ {name} failed for {symbol}: {e}")
-            continue
-
-    print(f"[source_manager] ❗ All sources failed for {symbol}")
-    return None
+    try:
+        price, detail = get_quorum().query(symbol)
+    except ValueError:
+        print(f"[source_manager] ❗ All sources failed for {symbol}")
+        return None
+    names = ", ".join(detail["sources"])
+    print(f"[source_manager] ✅ {names} returned price for {symbol.upper()}: {price} ({detail['latency'] * 1000:.0f}ms)")
+    return price
+
+
+def get_prices(symbols):
+    prices, detail = get_quorum().query_many(symbols)
+    if detail["missing"]:
+        print(f"[source_manager] ❗ No price for {', '.join(s.upper() for s in detail['missing'])}")
+    print(f"[source_manager] ✅ Priced {len(prices)}/{len(prices) + len(detail['missing'])} symbols in {detail['latency'] * 1000:.0f}ms")
+    return prices
@@ -1,7 +1,56 @@
 # utils/sources/binance.py
 
+import os
+import json
 import random
 
+LIVE = os.getenv("ELITE_LIVE_PRICES") == "1"
+TICKER_URL = "https://api.binance.com/api/v3/ticker/price"
+MAX_BATCH = 100  # symbols per ticker request (keeps the query string short)
+QUOTE = "USDT"
+
+UNLISTED = set()  # pairs Binance rejected; left out of later bulk requests
+
 def get_price_from_binance(symbol):
+    if LIVE:
+        return get_prices_from_binance([symbol]).get(symbol)
     # Fake mock price from Binance
-    return round(random.uniform(1, 5000), 2)
\ No newline at end of file
+    return round(random.uniform(1, 5000), 2)
+
+def is_unlisted_error(error):
+    # Binance answers 400 (invalid symbol) for a pair it doesn't list
+    return getattr(getattr(error, "response", None), "status_code", None) == 400
+
+def fetch_tickers(pairs):
+    from utils.http import get_json
+    if len(pairs) > 1:
+        try:
+            return get_json("binance", TICKER_URL, params={"symbols": json.dumps(pairs, separators=(",", ":"))})
+        except Exception as e:
+            if not is_unlisted_error(e):
+                raise
+    # One unlisted pair fails the whole bulk request: price the rest one by one
+    rows = []
+    for pair in pairs:
+        try:
+            rows.append(get_json("binance", TICKER_URL, params={"symbol": pair}))
+        except Exception as e:
+            if not is_unlisted_error(e):
+                raise
+            UNLISTED.add(pair)
+    return rows
+
+def get_prices_from_binance(symbols):
+    # Bulk hook: /ticker/price?symbols=[...] returns every pair in one round trip
+    if not LIVE:
+        return {symbol: get_price_from_binance(symbol) for symbol in symbols}
+    prices = {}
+    for i in range(0, len(symbols), MAX_BATCH):
+        pairs = {f"{s.upper()}{QUOTE}": s for s in symbols[i:i + MAX_BATCH] if s.upper() != QUOTE}
+        pairs = {pair: s for pair, s in pairs.items() if pair not in UNLISTED}
+        if not pairs:
+            continue
+        for row in fetch_tickers(list(pairs)):
+            if row.get("symbol") in pairs:
+                prices[pairs[row["symbol"]]] = float(row["price"])
+    return prices
@@ -4,4 +4,8 @@ import random
 
 def get_price_from_chainlink(symbol):
     # Fake mock price from Chainlink
-    return round(random.uniform(1, 5000), 2)
\ No newline at end of file
+    return round(random.uniform(1, 5000), 2)
+
+def get_prices_from_chainlink(symbols):
+    # Bulk hook — live build should batch latestRoundData() for every feed in one multicall
+    return {symbol: get_price_from_chainlink(symbol) for symbol in symbols}
@@ -1,7 +1,35 @@
 # utils/sources/coingecko.py
 
+import os
 import random
 
+LIVE = os.getenv("ELITE_LIVE_PRICES") == "1"
+SIMPLE_PRICE_URL = "https://api.coingecko.com/api/v3/simple/price"
+MAX_BATCH = 250  # ids per /simple/price request
+
+SYMBOL_IDS = {
+    "btc": "bitcoin", "wbtc": "wrapped-bitcoin", "eth": "ethereum", "usdc": "usd-coin",
+    "usdt": "tether", "link": "chainlink", "arb": "arbitrum", "op": "optimism",
+    "matic": "matic-network", "sol": "solana",
+}
+
 def get_price_from_coingecko(symbol):
+    if LIVE:
+        return get_prices_from_coingecko([symbol]).get(symbol)
     # Fake mock price from CoinGecko
     return round(random.uniform(1, 5000), 2)
+
+def get_prices_from_coingecko(symbols):
+    # Bulk hook: one /simple/price call per MAX_BATCH symbols over the pooled session
+    if not LIVE:
+        return {symbol: get_price_from_coingecko(symbol) for symbol in symbols}
+    from utils.http import get_json
+    prices = {}
+    for i in range(0, len(symbols), MAX_BATCH):
+        ids = {SYMBOL_IDS.get(s.lower(), s.lower()): s for s in symbols[i:i + MAX_BATCH]}
+        data = get_json("coingecko", SIMPLE_PRICE_URL, params={"ids": ",".join(ids), "vs_currencies": "usd"})
+        for coin_id, symbol in ids.items():
+            usd = data.get(coin_id, {}).get("usd")
+            if usd:
+                prices[symbol] = usd
+    return prices
@@ -5,3 +5,7 @@ import random
 def get_price_from_uniswap(symbol):
     # Fake mock price from Uniswap
     return round(random.uniform(1, 5000), 2)
+
+def get_prices_from_uniswap(symbols):
+    # Bulk hook — live build should read all pool slots in one multicall
+    return {symbol: get_price_from_uniswap(symbol) for symbol in symbols}
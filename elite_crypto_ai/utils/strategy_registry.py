@@ -0,0 +1,148 @@
+# utils/strategy_registry.py — Compiled Strategy/Agent Code Cache (content hash + mtime, token-prefix index)
+
+import os
+import sys
+import types
+import bisect
+import marshal
+import hashlib
+import threading
+
+STRATEGY_FOLDER = "strategies"
+CODE_CACHE_DIR = "cache/strategy_code"  # marshaled code objects, shared across processes and runs
+
+
+class CodeRegistry:
+    """
+    Compiles each source file once. A file is re-read only when its (mtime, size) stamp moves,
+    and recompiled only when its content hash changes; compiled code is also kept on disk.
+    """
+
+    def __init__(self, cache_dir=CODE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.lock = threading.RLock()
+        self.entries = {}  # path -> {"stamp", "sha", "code"}
+
+    def cache_path(self, sha):
+        return os.path.join(self.cache_dir, f"{sha}.{sys.implementation.cache_tag}.code")
+
+    def load_cached(self, sha):
+        path = self.cache_path(sha)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                return marshal.load(f)
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def store_cached(self, sha, code):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{self.cache_path(sha)}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                marshal.dump(code, f)
+            os.replace(tmp, self.cache_path(sha))
+        except OSError:
+            pass  # Disk cache is an optimisation only
+
+    def compile_file(self, path):
+        """Code object for `path`; raises SyntaxError/OSError like compile()/open() would."""
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry and entry["stamp"] == stamp:
+                return entry["code"]
+
+            with open(path, "rb") as f:
+                source = f.read()
+            sha = hashlib.sha256(path.encode() + b"\0" + source).hexdigest()
+            if entry and entry["sha"] == sha:
+                entry["stamp"] = stamp
+                return entry["code"]
+
+            code = self.load_cached(sha)
+            if code is None:
+                code = compile(source, path, "exec")
+                self.store_cached(sha, code)
+            self.entries[path] = {"stamp": stamp, "sha": sha, "code": code}
+            return code
+
+    def namespace(self, path, name=None):
+        """Fresh module-level namespace from the cached code (module body still runs each call)."""
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        namespace = {"__name__": name, "__file__": path, "__builtins__": __builtins__}
+        exec(self.compile_file(path), namespace)
+        return namespace
+
+    def module(self, path, name=None):
+        name = name or os.path.splitext(os.path.basename(path))[0]
+        module = types.ModuleType(name)
+        module.__file__ = path
+        exec(self.compile_file(path), module.__dict__)
+        return module
+
+    def forget(self, path):
+        with self.lock:
+            self.entries.pop(path, None)
+
+
+class StrategyRegistry(CodeRegistry):
+    """Strategy folder view: the listing is re-read only when the folder itself changes."""
+
+    def __init__(self, folder=STRATEGY_FOLDER, cache_dir=CODE_CACHE_DIR):
+        super().__init__(cache_dir)
+        self.folder = folder
+        self.folder_mtime = None
+        self.names = []  # sorted .py filenames -> token lookups are a bisect range
+
+    def refresh(self):
+        with self.lock:
+            if not os.path.isdir(self.folder):
+                self.names, self.folder_mtime = [], None
+                return self.names
+            mtime = os.stat(self.folder).st_mtime_ns
+            if mtime != self.folder_mtime:
+                names = sorted(f for f in os.listdir(self.folder) if f.endswith(".py") and not f.startswith("__"))
+                for gone in set(self.names) - set(names):
+                    self.forget(os.path.join(self.folder, gone))
+                self.names, self.folder_mtime = names, mtime
+            return self.names
+
+    def files(self, token=None):
+        """{filename: path} for strategies whose filename starts with `token` (all when None)."""
+        names = self.refresh()
+        if token:
+            lo = bisect.bisect_left(names, token)
+            hi = bisect.bisect_left(names, token + "\U0010ffff")
+            names = names[lo:hi]
+        return {name: os.path.join(self.folder, name) for name in names}
+
+    def strategies(self, token=None):
+        out = {}
+        for name, path in self.files(token).items():
+            try:
+                out[name] = self.namespace(path)
+            except Exception as e:
+                print(f"❌ Failed loading strategy {name}: {e}")
+        return out
+
+
+_registries = {}
+
+
+def get_strategy_registry(folder=STRATEGY_FOLDER):
+    if folder not in _registries:
+        _registries[folder] = StrategyRegistry(folder)
+    return _registries[folder]
+
+
+_code_registry = None
+
+
+def get_code_registry():
+    global _code_registry
+    if _code_registry is None:
+        _code_registry = CodeRegistry()
+    return _code_registry
@@ -1,12 +1,19 @@
 # utils/strategy_tracker.py
 
-import os
-import json
+from utils.artifacts import read_artifact, write_artifact
 
 PERF_FILE = "intel/performance_metrics.json"
+STRATEGY_METADATA_FILE = "intel/strategy_metadata.json"
 
 def get_strategy_performance():
-    if not os.path.exists(PERF_FILE):
-        return {}
-    with open(PERF_FILE, "r") as f:
-        return json.load(f)
+    return read_artifact(PERF_FILE)
+
+def get_strategy_metadata_tags():
+    # token -> strategy metadata written by the strategy generator
+    return read_artifact(STRATEGY_METADATA_FILE)
+
+FEEDBACK_FILE = "logs/strategy_feedback.json"
+
+def save_strategy_feedback(feedback, path=FEEDBACK_FILE):
+    # Atomic so readers never see a half-written file while batch runs stream results in
+    write_artifact(path, feedback)
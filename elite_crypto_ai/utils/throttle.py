@@ -0,0 +1,76 @@
+# utils/throttle.py — Shared Concurrency Limits + Token-Bucket Rate Budgets
+
+import time
+import threading
+import concurrent.futures
+
+
+class RateBudget:
+    """Token bucket: `rate` requests per `per` seconds, bursting up to `burst`."""
+
+    def __init__(self, rate, per=60.0, burst=None):
+        self.rate = float(rate)
+        self.per = float(per)
+        self.capacity = float(burst if burst is not None else max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) * self.per / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class ProviderPools:
+    """One executor per provider, sized to its limit: a backlog at one slow upstream queues only its own calls,
+    never ahead of another provider's."""
+
+    def __init__(self, limits, default=4):
+        self.limits = dict(limits)
+        self.default = default
+        self.pools = {}
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def pool(self, provider):
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("provider pools are shut down")
+            if provider not in self.pools:
+                self.pools[provider] = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.limits.get(provider, self.default), thread_name_prefix=f"{provider}-pool")
+            return self.pools[provider]
+
+    def submit(self, provider, fn, *args, deadline=None, **kwargs):
+        """`deadline` (time.monotonic()): a call still queued when it passes is dropped, not started late."""
+        return self.pool(provider).submit(self.run, provider, fn, args, kwargs, deadline)
+
+    def run(self, provider, fn, args, kwargs, deadline):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"{provider} call queued past its deadline")
+        return fn(*args, **kwargs)
+
+    def shutdown(self):
+        # Queued calls are cancelled; running ones finish in the background, bounded by their own timeouts
+        with self.lock:
+            self.closed = True
+            pools = list(self.pools.values())
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)